@@ -3,21 +3,121 @@ import os
 import threading
 import time
 import cv2
-from typing import Optional, Tuple
+import numpy as np
+from typing import Callable, Optional, Tuple
 from ..core.ports import Camera, Frame
 from ..core.clock import SystemClock
+from ..core.latency import PtsClock, wall_now
+from ..core.frame_ring import FrameRing
+from ..core.frame_pool import FramePool
 
 logger = logging.getLogger(__name__)
 
 
+def _capture_time(cap, pts_clock: PtsClock) -> float:
+    """Wall time of the frame just read, from its stream PTS when the backend has one."""
+    received = wall_now()
+    try:
+        pts_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+    except Exception:
+        pts_ms = None
+    return pts_clock.capture_time(pts_ms, received)
+
+
+def _read_into(cap, pool: Optional[FramePool], shape: Optional[tuple]):
+    """``cap.read()``, decoding into a recycled buffer once the frame shape is known."""
+    if pool is None or shape is None:
+        return cap.read()
+    return cap.read(pool.acquire(shape))
+
+
+FULL = "full"
+KEYFRAME = "keyframe"
+DECODE_MODES = (FULL, KEYFRAME)
+
+
+def _gst_rtsp_pipeline(
+    src: str, latency: int, keyframes_only: bool = False, width: int = 0, i420: bool = False
+) -> str:
+    # identity drops P/B frames (delta units) before the decoder, so only IDR frames are decoded
+    skip = "identity drop-buffer-flags=delta-unit ! " if keyframes_only else ""
+    if i420:
+        # DECODE_DUAL: hand over the decoder's YUV planes; Cv2Camera scales and converts
+        out = "videoconvert ! video/x-raw,format=I420 ! "
+    elif width > 0:
+        # scale while still YUV, so only the small frame is converted to BGR
+        out = f"videoscale ! video/x-raw,width={width},pixel-aspect-ratio=1/1 ! videoconvert ! "
+    else:
+        out = "videoconvert ! "
+    return (
+        f"rtspsrc location={src} protocols=tcp latency={latency} ! "
+        f"rtph264depay ! h264parse ! {skip}avdec_h264 ! {out}"
+        "appsink drop=1 sync=false max-buffers=1"
+    )
+
+
+def _i420_planes(yuv: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Y, U and V views of an I420 buffer shaped ``(h * 3 / 2, w)``."""
+    h, w = yuv.shape[0] * 2 // 3, yuv.shape[1]
+    flat = yuv.reshape(-1)
+    q = (h // 2) * (w // 2)
+    return (
+        flat[: h * w].reshape(h, w),
+        flat[h * w: h * w + q].reshape(h // 2, w // 2),
+        flat[h * w + q: h * w + 2 * q].reshape(h // 2, w // 2),
+    )
+
+
+def _scaled_size(w: int, h: int, width: int) -> Tuple[int, int]:
+    """Even ``(w, h)`` at *width* with the aspect ratio kept (I420 needs even sizes)."""
+    sw = width - width % 2
+    return sw, max(2, int(round(h * sw / w / 2)) * 2)
+
+
+def i420_to_bgr(yuv: np.ndarray, width: int = 0, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """BGR image from I420 planes, scaled to *width* (even, aspect kept) first when smaller.
+
+    Scaling the planes before the color conversion means only the small image
+    is ever converted: 1.5 bytes per source pixel are read instead of 3 written.
+    """
+    h, w = yuv.shape[0] * 2 // 3, yuv.shape[1]
+    if width <= 0 or width >= w:
+        return cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420, dst=out)
+    sw, sh = _scaled_size(w, h, width)
+    small = np.empty((sh * 3 // 2, sw), dtype=np.uint8)
+    for src, dst in zip(_i420_planes(yuv), _i420_planes(small)):
+        cv2.resize(src, (dst.shape[1], dst.shape[0]), dst=dst, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_YUV2BGR_I420, dst=out)
+
+
 class Cv2Camera(Camera):
-    def __init__(self, src: str, clock=None):
+    def __init__(
+        self,
+        src: str,
+        clock=None,
+        preroll: Optional[FrameRing] = None,
+        pool: Optional[FramePool] = None,
+        decode_width: int = 0,
+        dual: bool = False,
+    ):
         # Accept integer-like strings ("0", "1") as device index
         self.src = int(src) if isinstance(src, str) and src.isdigit() else src
         self.cap: Optional[cv2.VideoCapture] = None
         self.clock = clock or SystemClock()
+        self.preroll = preroll  # every decoded frame is offered to the pre-roll ring
+        self.pool = pool  # decode into recycled buffers (frame_pool.py)
+        self._frame_shape: Optional[tuple] = None
         self.idx = 0
+        self.pts_clock = PtsClock()
         self._grab_flush = max(0, int(os.getenv("CAMERA_GRAB_FLUSH", "0")))
+        self.decode_mode = FULL
+        self._gst = False  # opened through the GStreamer RTSP pipeline (decode modes need it)
+        # DECODE_WIDTH: frames arrive scaled to this width (GStreamer RTSP only);
+        # DECODE_DUAL: scaled frame for the pipeline, full resolution on demand (Frame.full_image)
+        self.decode_width = max(0, int(decode_width))
+        self.dual = bool(dual) and self.decode_width > 0
+        self._i420 = False
+        self._small_pool = FramePool(pool.size) if pool is not None and self.dual else None
 
     def open(self) -> None:
         if isinstance(self.src, str) and self.src.startswith("rtsp://"):
@@ -41,12 +141,13 @@ class Cv2Camera(Camera):
                     use_gst = True
 
             if use_gst:
-                pipe = (
-                    f"rtspsrc location={self.src} protocols=tcp latency={latency} ! "
-                    "rtph264depay ! h264parse ! avdec_h264 ! videoconvert ! "
-                    "appsink drop=1 sync=false max-buffers=1"
+                pipe = _gst_rtsp_pipeline(
+                    self.src, latency, keyframes_only=self.decode_mode == KEYFRAME,
+                    width=self.decode_width, i420=self.dual,
                 )
                 self.cap = cv2.VideoCapture(pipe, cv2.CAP_GSTREAMER)
+                self._gst = True
+                self._i420 = self.dual
         else:
             # USB cam / file / numeric index
             self.cap = cv2.VideoCapture(self.src, cv2.CAP_FFMPEG)
@@ -61,6 +162,46 @@ class Cv2Camera(Camera):
 
         if not self.cap or not self.cap.isOpened():
             raise RuntimeError(f"Failed to open camera source: {self.src}")
+        if self.decode_width and not self._gst:
+            logger.warning(
+                "DECODE_WIDTH needs the GStreamer RTSP pipeline (USE_GSTREAMER=1); decoding %s at native size",
+                self.src,
+            )
+
+    def convert(self, img: np.ndarray) -> Tuple[np.ndarray, Optional[Callable[[], np.ndarray]]]:
+        """Pipeline image and full-resolution accessor for a decoded buffer.
+
+        Only DECODE_DUAL buffers need work: the I420 planes are scaled and
+        converted to a small BGR image, and the full-resolution BGR image is
+        only produced if ``Frame.full_image()`` is called (alert snapshots).
+        """
+        if not self._i420:
+            return img, None
+        out = None
+        if self._small_pool is not None:
+            sw, sh = _scaled_size(img.shape[1], img.shape[0] * 2 // 3, self.decode_width)
+            out = self._small_pool.acquire((sh, sw, 3))
+        small = i420_to_bgr(img, self.decode_width, out=out)
+        return small, lambda: cv2.cvtColor(img, cv2.COLOR_YUV2BGR_I420)
+
+    def set_decode_mode(self, mode: str) -> bool:
+        """Switch between decoding every frame and keyframes only; True if the stream was reopened.
+
+        Only the GStreamer RTSP pipeline can drop frames before the decoder. Through
+        OpenCV's FFmpeg backend the codec's skip_frame option is not reachable, so
+        there the mode stays ``full``. Switching reconnects the RTSP session.
+        """
+        if mode not in DECODE_MODES:
+            raise ValueError(f"unknown decode mode {mode!r}")
+        if mode == self.decode_mode or not self._gst:
+            return False
+        self.decode_mode = mode
+        self.close()
+        self.open()
+        self.pts_clock = PtsClock()  # new session, new timeline
+        self._frame_shape = None
+        logger.info("Camera %s: decoding %s", self.src, "keyframes only" if mode == KEYFRAME else "every frame")
+        return True
 
     def grab(self) -> bool:
         """Advance the camera buffer without decoding. Very cheap (~0.1ms)."""
@@ -73,9 +214,12 @@ class Cv2Camera(Camera):
             raise RuntimeError("Camera not opened. Call open() first.")
         for _ in range(self._grab_flush):
             self.cap.grab()
-        ok, img = self.cap.read()
+        ok, img = _read_into(self.cap, self.pool, self._frame_shape)
         if not ok:
             return None
+        self._frame_shape = img.shape
+        capture_t = _capture_time(self.cap, self.pts_clock)
+        img, full = self.convert(img)
 
         # increment sequential index
         self.idx += 1
@@ -88,13 +232,18 @@ class Cv2Camera(Camera):
             w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 0
             h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 0
 
-        return Frame(
+        frame = Frame(
             image=img,
             t=self.clock.now(),
             index=self.idx,
             w=w,
             h=h,
+            capture_t=capture_t,
+            full=full,
         )
+        if self.preroll is not None:
+            self.preroll.push(frame)
+        return frame
 
     def release(self) -> None:
         self.close()
@@ -120,12 +269,21 @@ class ThreadedCamera:
     A background thread continuously reads from the underlying camera so the
     consumer always gets the newest frame — the RTSP/FFmpeg internal buffer
     never builds up regardless of how long the main thread spends on inference.
+
+    Each decoded frame is published with the next sequence number and wakes
+    waiting consumers through a condition variable, so ``read()`` returns as
+    soon as a newer frame exists instead of polling. Frames decoded between
+    two reads are skipped and counted in ``dropped``.
     """
 
-    def __init__(self, inner: Cv2Camera):
+    def __init__(self, inner: Cv2Camera, timeout: float = 1.0):
         self._inner = inner
+        self.timeout = float(timeout)
         self._latest: Optional[Frame] = None
-        self._lock = threading.Lock()
+        self._seq = 0  # sequence number of _latest; 0 = nothing published yet
+        self._cond = threading.Condition()
+        self._last_seq = 0  # last sequence returned by read()
+        self.dropped = 0
         self._running = False
         self._thread: Optional[threading.Thread] = None
 
@@ -138,30 +296,71 @@ class ThreadedCamera:
     def _drain(self) -> None:
         cap = self._inner.cap
         clock = self._inner.clock
+        preroll = getattr(self._inner, "preroll", None)
+        pool = self.pool
+        convert = getattr(self._inner, "convert", lambda img: (img, None))
+        pts_clock = PtsClock()
+        shape = None
         idx = 0
         while self._running:
-            ok, img = cap.read()
+            ok, img = _read_into(cap, pool, shape)
             if not ok:
                 time.sleep(0.005)
                 continue
+            shape = img.shape
+            capture_t = _capture_time(cap, pts_clock)
             idx += 1
+            img, full = convert(img)
             h, w = img.shape[:2]
-            with self._lock:
-                self._latest = Frame(image=img, t=clock.now(), index=idx, w=w, h=h)
+            frame = Frame(image=img, t=clock.now(), index=idx, w=w, h=h, capture_t=capture_t, full=full)
+            if preroll is not None:
+                preroll.push(frame)
+            with self._cond:
+                self._latest = frame
+                self._seq = idx
+                self._cond.notify_all()
+            del img, full, frame  # don't keep the pooled buffer leased while decoding the next one
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest decoded frame (0 before the first)."""
+        return self._seq
+
+    def wait_for(self, after: int, timeout: Optional[float] = None) -> Tuple[int, Optional[Frame]]:
+        """Block until a frame newer than sequence *after* exists; ``(seq, frame)``.
+
+        ``frame`` is None on timeout or once the camera is closed. Consumers
+        other than ``read()`` keep their own *after*.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._seq > after or not self._running,
+                self.timeout if timeout is None else timeout,
+            )
+            if self._seq <= after:
+                return after, None
+            return self._seq, self._latest
+
+    @property
+    def pool(self) -> Optional[FramePool]:
+        return getattr(self._inner, "pool", None)
 
     def grab(self) -> bool:
         return True
 
     def read(self) -> Optional[Frame]:
-        with self._lock:
-            frame = self._latest
-            self._latest = None
+        seq, frame = self.wait_for(self._last_seq)
         if frame is None:
-            time.sleep(0.005)
+            return None
+        if self._last_seq > 0:
+            self.dropped += seq - self._last_seq - 1
+        self._last_seq = seq
         return frame
 
     def close(self) -> None:
-        self._running = False
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
         if self._thread is not None:
             self._thread.join(timeout=5)
         self._inner.close()
@@ -0,0 +1,148 @@
+"""Replay camera for benchmarks: a video file or synthetic frames, paced on a Clock.
+
+Frame ``k`` of the source is due at ``start + k / fps`` on the given clock.
+``read()`` waits (``clock.sleep``) for the next due frame; with ``live=True`` a
+reader that fell behind skips to the newest due frame like an RTSP appsink with
+``drop=1`` would, and the skipped frames are counted in ``dropped``.
+``Frame.index`` is the source frame number so detection scripts stay aligned.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from ..core.clock import Clock, SystemClock
+from ..core.ports import Camera, Frame
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC = "synthetic"
+
+
+def synthetic_frames(width: int, height: int, count: int = 8, seed: int = 0) -> List[np.ndarray]:
+    """A few distinct BGR frames (noise + a moving block) to cycle through."""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    frames = []
+    bw, bh = max(1, width // 8), max(1, height // 4)
+    for i in range(count):
+        img = base.copy()
+        x = (i * width // count) % max(1, width - bw)
+        img[height // 3 : height // 3 + bh, x : x + bw] = (40, 200, 40)
+        frames.append(img)
+    return frames
+
+
+class ReplayCamera(Camera):
+    def __init__(
+        self,
+        source: str = SYNTHETIC,
+        clock: Optional[Clock] = None,
+        fps: float = 0.0,
+        max_frames: int = 0,
+        live: bool = True,
+        width: int = 1280,
+        height: int = 720,
+        loop: bool = False,
+    ):
+        self.source = source
+        self.clock = clock or SystemClock()
+        self.fps = float(fps)
+        self.max_frames = int(max_frames)
+        self.live = live
+        self.loop = loop
+        self._size = (int(width), int(height))
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._synthetic: List[np.ndarray] = []
+        self._start = 0.0
+        self._next = 0  # source index of the next frame to deliver
+        self.frames_read = 0
+        self.dropped = 0
+        self.exhausted = False
+
+    def open(self) -> None:
+        if self.source == SYNTHETIC:
+            self._synthetic = synthetic_frames(*self._size)
+            self.fps = self.fps or 25.0
+        else:
+            self._cap = cv2.VideoCapture(self.source)
+            if not self._cap.isOpened():
+                raise RuntimeError(f"Failed to open replay source: {self.source}")
+            self.fps = self.fps or (self._cap.get(cv2.CAP_PROP_FPS) or 25.0)
+        self._start = self.clock.now()
+        self._next = 0
+        self.exhausted = False
+
+    def _due_index(self) -> int:
+        return int(math.floor((self.clock.now() - self._start) * self.fps + 1e-9))
+
+    def _wait_for(self, k: int) -> None:
+        due_t = self._start + k / self.fps
+        now = self.clock.now()
+        if due_t > now:
+            self.clock.sleep(due_t - now)
+
+    def _decode(self, k: int) -> Optional[np.ndarray]:
+        if self._synthetic:
+            return self._synthetic[k % len(self._synthetic)]
+        ok, img = self._cap.read()
+        if not ok and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, img = self._cap.read()
+        return img if ok else None
+
+    def _skip(self, n: int) -> None:
+        if self._cap is None:
+            return
+        for _ in range(n):
+            if not self._cap.grab():
+                if not self.loop:
+                    return
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _advance(self) -> int:
+        """Source index of the frame to deliver now (after waiting / live skipping)."""
+        k = self._next
+        if self.live:
+            due = self._due_index()
+            if due > k:
+                self._skip(due - k)
+                self.dropped += due - k
+                k = due
+        self._wait_for(k)
+        self._next = k + 1
+        return k
+
+    def _done(self) -> bool:
+        if self.max_frames and self.frames_read >= self.max_frames:
+            self.exhausted = True
+        return self.exhausted
+
+    def grab(self) -> bool:
+        if self._done():
+            return False
+        self._advance()
+        self._skip(1)
+        self.frames_read += 1
+        return True
+
+    def read(self) -> Optional[Frame]:
+        if self._done():
+            return None
+        k = self._advance()
+        img = self._decode(k)
+        if img is None:
+            self.exhausted = True
+            return None
+        self.frames_read += 1
+        h, w = img.shape[:2]
+        return Frame(image=img, t=self.clock.now(), index=k, w=w, h=h)
+
+    def close(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
@@ -0,0 +1,202 @@
+"""Camera that reads frames decoded by another process (``shm://<name>`` sources).
+
+The decoder (``python -m app.app.decode_shm``) owns the RTSP connection and
+H.264 decode and publishes BGR frames into a shared-memory ring
+(``shm_ring.py``). Any number of ``ShmCamera`` readers, such as the alert
+pipeline and the preview, attach to the same ring by name. No service decodes
+the camera twice, and decoding no longer competes with inference for this
+process's GIL.
+
+``read()`` returns the newest frame, never the same frame twice. The pixels
+are copied out of the ring into a buffer from ``pool`` (``frame_pool.py``),
+because the decoder overwrites a slot ``SHM_SLOTS - 1`` frames later while
+a frame can live far longer (queued contexts, snapshot workers, pre-roll).
+The copy is checked against the slot's sequence number (and checksum, on
+weakly ordered CPUs) afterwards and retried if the decoder lapped it
+mid-copy. A pooled buffer goes back to the
+pool once nothing references the frame, so steady state allocates nothing. Frames published since the
+previous read are skipped and counted in ``dropped``, like ``ThreadedCamera``
+keeping only the latest frame. With ``spawn_src`` set, the camera starts a
+decoder subprocess for that source when none is running.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..core.clock import SystemClock
+from ..core.frame_pool import FramePool
+from ..core.frame_ring import FrameRing
+from ..core.ports import Camera, Frame
+from .shm_ring import ShmFrameRing
+
+logger = logging.getLogger(__name__)
+
+SHM_SCHEME = "shm://"
+
+
+def shm_name_for(src: str) -> str:
+    """Stable segment name for a camera source, so every service finds the same decoder."""
+    return "yolo_" + hashlib.sha1(str(src).encode()).hexdigest()[:12]
+
+
+def start_decoder(src: str, name: str, slots: int = 4) -> subprocess.Popen:
+    """Run ``app.app.decode_shm`` for *src* in a child process; it exits when this process does."""
+    cmd = [sys.executable, "-m", "app.app.decode_shm", "--src", str(src), "--name", name,
+           "--slots", str(slots), "--parent-pid", str(os.getpid())]
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    return subprocess.Popen(cmd, env=env)
+
+
+class ShmCamera(Camera):
+    def __init__(
+        self,
+        name: str,
+        clock=None,
+        spawn_src: Optional[str] = None,
+        slots: int = 4,
+        timeout: float = 1.0,
+        open_timeout: float = 15.0,
+        preroll: Optional[FrameRing] = None,
+        pool: Optional[FramePool] = None,
+    ):
+        self.name = name[len(SHM_SCHEME):] if name.startswith(SHM_SCHEME) else name
+        self.clock = clock or SystemClock()
+        self.spawn_src = spawn_src
+        self.slots = int(slots)
+        self.timeout = float(timeout)
+        self.open_timeout = float(open_timeout)
+        self.preroll = preroll
+        self.pool = pool  # buffers the ring slots are copied into (frame_pool.py)
+        self.ring: Optional[ShmFrameRing] = None
+        self.dropped = 0
+        self._proc: Optional[subprocess.Popen] = None
+        self._last_seq = -1
+
+    def _attach(self) -> bool:
+        try:
+            ring = ShmFrameRing.attach(self.name)
+        except (FileNotFoundError, ValueError):
+            return False
+        if self.ring is not None:
+            self.ring.close()
+        self.ring = ring
+        # a restarted decoder counts from 0 again
+        self._last_seq = min(self._last_seq, ring.latest - 1)
+        return True
+
+    def _spawn(self) -> None:
+        """Start our own decoder unless one (ours or another service's) is running."""
+        if self.spawn_src is None or (self._proc is not None and self._proc.poll() is None):
+            return
+        if self.ring is not None and self.ring.writer_alive():
+            return
+        logger.info("Starting decoder process for %s (shm %s)", self.spawn_src, self.name)
+        self._proc = start_decoder(self.spawn_src, self.name, self.slots)
+
+    def open(self) -> None:
+        if self._attach():
+            return
+        self._spawn()
+        deadline = time.monotonic() + self.open_timeout
+        while time.monotonic() < deadline:
+            if self._attach():
+                return
+            if self._proc is not None and self._proc.poll() is not None:
+                # ours lost the race to another service's decoder, or failed to open the source
+                if self._attach():
+                    return
+                break
+            time.sleep(0.05)
+        raise RuntimeError(f"No decoder is publishing shared-memory frames as {self.name!r}")
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest published frame (-1 before the first)."""
+        return -1 if self.ring is None else self.ring.latest
+
+    def wait_for(self, after: int, timeout: Optional[float] = None) -> Tuple[int, None]:
+        """Block until the decoder publishes a frame newer than *after*; ``(seq, None)``.
+
+        The decoder is another process, so this polls the ring header. Read the
+        frame itself with ``read()``.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while self.ring is not None:
+            seq = self.ring.latest
+            if seq > after or time.monotonic() >= deadline:
+                return max(seq, after), None
+            time.sleep(0.001)
+        return after, None
+
+    def grab(self) -> bool:
+        # nothing to skip: read() always jumps to the newest frame
+        return self.ring is not None
+
+    def read(self) -> Optional[Frame]:
+        if self.ring is None:
+            raise RuntimeError("Camera not opened. Call open() first.")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            seq = self.ring.latest
+            if seq > self._last_seq:
+                got = self.ring.read(seq)
+                if got is not None:
+                    image = self._copy(got[0])
+                    if self.ring.verify(seq, image, *got[1:]):
+                        break
+                    if self.ring.latest != seq:
+                        continue  # lapped while copying: take the newer frame
+                    # otherwise the pixels are not visible yet (weakly ordered CPU): wait
+            if time.monotonic() >= deadline:
+                # decoder restarted (new segment), stalled or gone (e.g. the service
+                # that spawned it stopped): pick up a new ring, or start a decoder
+                if not self._attach() or not self.ring.writer_alive():
+                    self._spawn()
+                return None
+            time.sleep(0.002)
+        _, _, capture_t = got
+        if self._last_seq >= 0:
+            self.dropped += seq - self._last_seq - 1
+        self._last_seq = seq
+        frame = Frame(
+            image=image, t=self.clock.now(), index=seq + 1,
+            w=self.ring.width, h=self.ring.height, capture_t=capture_t,
+        )
+        if self.preroll is not None:
+            self.preroll.push(frame)
+        return frame
+
+    def _copy(self, view: np.ndarray) -> np.ndarray:
+        if self.pool is None:
+            return view.copy()
+        buf = self.pool.acquire(view.shape, view.dtype)
+        np.copyto(buf, view)
+        return buf
+
+    def close(self) -> None:
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        if self._proc is not None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
+
+    def release(self) -> None:
+        self.close()
+
+    def shape(self) -> Optional[Tuple[int, int]]:
+        return None if self.ring is None else (self.ring.height, self.ring.width)
@@ -0,0 +1,39 @@
+"""CPU detector on OpenCV DNN for YOLOv8-style ``.onnx`` exports.
+
+Needs nothing beyond the OpenCV already used for capture. ``threads`` > 0
+calls ``cv2.setNumThreads``, which is process-wide (it also bounds resize and
+JPEG encode elsewhere); 0 keeps OpenCV's default. OpenCV cannot read ONNX
+metadata, so class names come from *labels* (default: COCO).
+"""
+from __future__ import annotations
+
+from typing import Dict, Sequence, Union
+
+import cv2
+import numpy as np
+
+from .yolo_io import ArrayYoloDetector
+
+
+class OpenCvDnnDetector(ArrayYoloDetector):
+    def __init__(
+        self,
+        model_path: str,
+        conf: float,
+        imgsz: int = 640,
+        threads: int = 0,
+        max_batch: int = 1,
+        iou: float = 0.45,
+        labels: Union[Dict[int, str], Sequence[str], None] = None,
+    ):
+        if threads > 0:
+            cv2.setNumThreads(int(threads))
+        self.net = cv2.dnn.readNet(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.imgsz = int(imgsz)
+        super().__init__(conf=conf, max_batch=max_batch, iou=iou, labels=labels)
+
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        self.net.setInput(batch)
+        return self.net.forward()
@@ -0,0 +1,75 @@
+"""Build the Detector selected by DETECTOR_BACKEND and the tracker for TRACKER_BACKEND.
+
+Backends are imported lazily so a CPU-only box never needs Ultralytics /
+torch, and a Jetson never needs ONNX Runtime.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from ..core.ports import Detector, ITracker
+
+logger = logging.getLogger(__name__)
+
+ULTRALYTICS = "ultralytics"
+ONNX = "onnx"
+OPENCV = "opencv"
+BACKENDS = (ULTRALYTICS, ONNX, OPENCV)
+
+SORT = "sort"
+TRACKER_BACKENDS = (ULTRALYTICS, SORT)
+
+
+def build_detector(
+    backend: str,
+    model_path: str,
+    conf: float,
+    imgsz: int,
+    tracker_cfg: Optional[str] = None,
+    max_batch: int = 1,
+    threads: int = 0,
+    iou: float = 0.45,
+) -> Detector:
+    backend = (backend or ULTRALYTICS).strip().lower()
+    if backend == ULTRALYTICS:
+        from .detector_ultra import UltralyticsDetector
+
+        return UltralyticsDetector(
+            engine_path=model_path, conf=conf, imgsz=imgsz,
+            tracker_cfg=tracker_cfg, max_batch=max_batch,
+        )
+    if tracker_cfg:
+        logger.warning("DETECTOR_BACKEND=%s has no built-in tracker; track ids are off", backend)
+    if backend == ONNX:
+        from .detector_onnx import OnnxDetector
+
+        return OnnxDetector(model_path, conf=conf, imgsz=imgsz, threads=threads,
+                            max_batch=max_batch, iou=iou)
+    if backend == OPENCV:
+        from .detector_cvdnn import OpenCvDnnDetector
+
+        return OpenCvDnnDetector(model_path, conf=conf, imgsz=imgsz, threads=threads,
+                                 max_batch=max_batch, iou=iou)
+    raise ValueError(f"Unknown DETECTOR_BACKEND {backend!r}; expected one of {BACKENDS}")
+
+
+def build_tracker(
+    backend: str,
+    iou_thresh: float = 0.3,
+    max_age: int = 30,
+    min_hits: int = 3,
+    high_conf: float = 0.5,
+    low_conf: float = 0.1,
+) -> Optional[ITracker]:
+    """Native tracker for DetectStep, or None when tracking runs inside the Ultralytics model."""
+    backend = (backend or ULTRALYTICS).strip().lower()
+    if backend == ULTRALYTICS:
+        return None
+    if backend == SORT:
+        from .tracker_sort import SortTracker
+
+        return SortTracker(
+            iou_thresh=iou_thresh, max_age=max_age, min_hits=min_hits, high_conf=high_conf, low_conf=low_conf
+        )
+    raise ValueError(f"Unknown TRACKER_BACKEND {backend!r}; expected one of {TRACKER_BACKENDS}")
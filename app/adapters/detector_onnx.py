@@ -0,0 +1,46 @@
+"""CPU detector on ONNX Runtime for YOLOv8-style ``.onnx`` exports.
+
+``onnxruntime`` is imported on construction, so the module is importable on
+boxes without it. ``threads`` sets intra-op parallelism (0 = one thread per
+physical core, ONNX Runtime's default); inter-op parallelism stays at 1
+because a YOLO graph is a single chain.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .yolo_io import ArrayYoloDetector
+
+
+class OnnxDetector(ArrayYoloDetector):
+    def __init__(
+        self,
+        model_path: str,
+        conf: float,
+        imgsz: int = 640,
+        threads: int = 0,
+        max_batch: int = 1,
+        iou: float = 0.45,
+        labels: Union[Dict[int, str], Sequence[str], None] = None,
+    ):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = max(0, int(threads))
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, opts, providers=["CPUExecutionProvider"])
+        inp = self.session.get_inputs()[0]
+        self._input_name = inp.name
+        # exported shapes are ints when static, strings ("batch", "height") when dynamic
+        batch_dim, _, height, _ = inp.shape
+        self.model_batch = batch_dim if isinstance(batch_dim, int) else 0
+        self.imgsz = height if isinstance(height, int) else int(imgsz)
+        meta: Optional[str] = self.session.get_modelmeta().custom_metadata_map.get("names")
+        super().__init__(conf=conf, max_batch=max_batch, iou=iou, labels=labels or meta)
+
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self._input_name: batch})[0]
@@ -0,0 +1,163 @@
+"""Replay detector: pre-recorded detections at a simulated inference latency.
+
+Detection scripts are JSONL, one line per source frame index::
+
+    {"labels": ["person", "bicycle", ...]}          (optional first line)
+    {"index": 42, "dets": [[x1, y1, x2, y2, conf, cls_id, track_id_or_null], ...]}
+
+Frames missing from the script have no detections. ``RecordingDetector`` wraps a
+real detector and writes this format, so a session on the device can be replayed
+later without the GPU.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import random
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from ..core.clock import Clock, SystemClock
+from ..core.ports import Detection, Detector, Frame, detect_frames
+from .yolo_io import COCO_LABELS
+
+
+Script = Union[Dict[int, Sequence[Detection]], Callable[[int], Sequence[Detection]]]
+
+
+def _det_from_row(row: Sequence) -> Detection:
+    x1, y1, x2, y2, conf, cls_id = row[:6]
+    tid = row[6] if len(row) > 6 else None
+    return Detection(
+        xyxy=(int(x1), int(y1), int(x2), int(y2)),
+        conf=float(conf),
+        cls_id=int(cls_id),
+        track_id=None if tid is None else int(tid),
+    )
+
+
+def _det_to_row(d: Detection) -> list:
+    return [*map(int, d.xyxy), round(float(d.conf), 4), int(d.cls_id), d.track_id]
+
+
+def load_detection_script(path: str) -> tuple[Dict[int, List[Detection]], Optional[list]]:
+    """Read a JSONL detection script -> ({frame_index: dets}, labels or None)."""
+    script: Dict[int, List[Detection]] = {}
+    labels = None
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            if "labels" in rec:
+                labels = list(rec["labels"])
+                continue
+            script[int(rec["index"])] = [_det_from_row(r) for r in rec.get("dets", ())]
+    return script, labels
+
+
+def synthetic_script(
+    period_frames: int = 250,
+    present_frames: int = 75,
+    cls_id: int = 0,
+    width: int = 1280,
+    height: int = 720,
+    conf: float = 0.8,
+) -> Callable[[int], Sequence[Detection]]:
+    """One object (track id = visit number) present for *present_frames* of every period."""
+    w, h = width // 6, height // 2
+
+    def lookup(k: int) -> Sequence[Detection]:
+        visit, phase = divmod(k, max(1, period_frames))
+        if phase >= present_frames:
+            return ()
+        x = int((width - w) * phase / max(1, present_frames))
+        return (Detection(xyxy=(x, height // 4, x + w, height // 4 + h), conf=conf,
+                          cls_id=cls_id, track_id=visit + 1),)
+
+    return lookup
+
+
+class ReplayDetector(Detector):
+    def __init__(
+        self,
+        script: Script,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        clock: Optional[Clock] = None,
+        labels: Optional[list] = None,
+        seed: int = 0,
+    ):
+        self._lookup = script.get if isinstance(script, dict) else script
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.clock = clock or SystemClock()
+        self.labels = labels or COCO_LABELS
+        self._rng = random.Random(seed)
+
+    def _simulate(self, n_frames: int) -> None:
+        ms = self.latency_ms * n_frames
+        if self.jitter_ms > 0:
+            ms += abs(self._rng.gauss(0.0, self.jitter_ms))
+        self.clock.sleep(ms / 1000.0)
+
+    def detect(self, frame: Frame) -> Sequence[Detection]:
+        self._simulate(1)
+        return list(self._lookup(frame.index) or ())
+
+    def detect_batch(self, frames: Sequence[Frame]) -> List[Sequence[Detection]]:
+        # one call for the whole batch, costing roughly one frame of latency each
+        self._simulate(len(frames))
+        return [list(self._lookup(f.index) or ()) for f in frames]
+
+
+class RecordingDetector(Detector):
+    """Pass-through wrapper that writes every result to a JSONL detection script.
+
+    An existing file at *path* is replaced: frame indices restart with every
+    session, so two sessions in one script would overwrite each other's frames.
+    Records are per frame, so tiling (TILE_SIZE) goes inside the recorder, see
+    ``wrap_inner``; replay such a script with TILE_SIZE=0.
+    """
+
+    def __init__(self, inner: Detector, path: str):
+        self._inner = inner
+        self.labels = getattr(inner, "labels", None)
+        self._fh = open(path, "w", encoding="utf-8", buffering=1)  # line-buffered
+        self._lock = threading.Lock()
+        labels = self.labels
+        if isinstance(labels, dict):
+            labels = [labels[k] for k in sorted(labels)]
+        if labels:
+            self._fh.write(json.dumps({"labels": list(labels)}) + "\n")
+
+    def _write(self, frame: Frame, dets: Sequence[Detection]) -> None:
+        line = json.dumps({"index": frame.index, "dets": [_det_to_row(d) for d in dets]})
+        with self._lock:
+            self._fh.write(line + "\n")
+
+    def detect(self, frame: Frame) -> Sequence[Detection]:
+        dets = self._inner.detect(frame)
+        self._write(frame, dets)
+        return dets
+
+    def detect_batch(self, frames: Sequence[Frame]) -> List[Sequence[Detection]]:
+        results = detect_frames(self._inner, frames)
+        for f, dets in zip(frames, results):
+            self._write(f, dets)
+        return results
+
+    def wrap_inner(self, wrap: Callable[[Detector], Detector]) -> "RecordingDetector":
+        """A recorder on the same file around ``wrap(inner)``, e.g. a TiledDetector.
+
+        The merged result of each frame is then recorded once, instead of
+        every tile overwriting the frame's record.
+        """
+        rec = copy.copy(self)
+        rec._inner = wrap(self._inner)
+        return rec
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
@@ -1,42 +1,90 @@
 from ultralytics import YOLO
-from typing import Optional
-from ..core.ports import Detector, Detection, Frame
+from typing import List, Optional, Sequence
+from ..core.ports import Detector, DetectionBatch, Frame
+from .yolo_io import LetterboxBatch, boxes_arrays, to_detections
 
 class UltralyticsDetector(Detector):
-    def __init__(self, engine_path: str, conf: float, imgsz: int, tracker_cfg: Optional[str] = None):
+    def __init__(
+        self,
+        engine_path: str,
+        conf: float,
+        imgsz: int,
+        tracker_cfg: Optional[str] = None,
+        max_batch: int = 1,
+    ):
         self.model = YOLO(engine_path, task="detect")
         self.conf = conf
         self.imgsz = imgsz
         self.tracker_cfg = tracker_cfg  # e.g. botsort.yaml or bytetrack.yaml
         self.labels = getattr(self.model, "names", None)
+        # Engines are exported with a fixed batch (DETECT_BATCH); larger requests are
+        # chunked and smaller ones padded, since a static engine accepts no other shape.
+        self.max_batch = max(1, int(max_batch))
+        if self.tracker_cfg and self.max_batch > 1:
+            raise ValueError(
+                f"the Ultralytics tracker runs one frame per call, which an engine exported with "
+                f"DETECT_BATCH={self.max_batch} rejects; use DETECT_BATCH=1 or TRACKER_BACKEND=sort"
+            )
+        self._batch: Optional[LetterboxBatch] = None
 
-    def detect(self, frame: Frame):
-        r = self.model.track(
-            source=frame.image,
-            imgsz=self.imgsz,
-            conf=self.conf,
-            vid_stride=1,
-            tracker=self.tracker_cfg,
-            persist=True,
-            device=0,
-            verbose=False,
-        )[0]
+    def detect(self, frame: Frame) -> DetectionBatch:
+        if self.max_batch > 1:
+            return self.detect_batch([frame])[0]
+        if self.tracker_cfg:
+            r = self.model.track(
+                source=frame.image,
+                imgsz=self.imgsz,
+                conf=self.conf,
+                vid_stride=1,
+                tracker=self.tracker_cfg,
+                persist=True,
+                device=0,
+                verbose=False,
+            )[0]
+        else:
+            # No tracker: plain predict keeps no per-stream state, so one model
+            # can safely serve several cameras.
+            r = self.model.predict(
+                source=frame.image,
+                imgsz=self.imgsz,
+                conf=self.conf,
+                device=0,
+                verbose=False,
+            )[0]
 
         boxes = getattr(r, "boxes", None)
         if boxes is None or len(boxes) == 0:
-            return []
-        xyxy = boxes.xyxy.cpu().numpy()
-        conf = boxes.conf.cpu().numpy()
-        cls  = boxes.cls.cpu().numpy()
-        ids  = boxes.id.cpu().numpy() if getattr(boxes, "id", None) is not None else None
+            return DetectionBatch.empty()
+        return to_detections(*boxes_arrays(boxes))
 
-        dets = []
-        for i in range(len(xyxy)):
-            x1,y1,x2,y2 = [int(v) for v in xyxy[i]]
-            dets.append(Detection(
-                xyxy=(x1,y1,x2,y2),
-                conf=float(conf[i]),
-                cls_id=int(cls[i]),
-                track_id=int(ids[i]) if ids is not None and ids[i] is not None else None
-            ))
-        return dets
+    def detect_batch(self, frames: Sequence[Frame]) -> List[DetectionBatch]:
+        """Run several frames through the engine per call (no tracking).
+
+        Frames are letterboxed into a preallocated batch tensor, and boxes are
+        mapped back to each frame's pixels with array ops. A short last chunk
+        is padded to the engine batch and the padding results are dropped.
+        """
+        import torch
+
+        if self._batch is None:
+            self._batch = LetterboxBatch(self.imgsz, self.max_batch)
+        out: List[DetectionBatch] = []
+        for start in range(0, len(frames), self.max_batch):
+            chunk = frames[start:start + self.max_batch]
+            self._batch.fill(chunk)
+            batch = self._batch.view(self.max_batch)
+            results = self.model.predict(
+                source=torch.from_numpy(batch),
+                imgsz=self.imgsz,
+                conf=self.conf,
+                device=0,
+                verbose=False,
+            )
+            for i, r in enumerate(results[:len(chunk)]):
+                boxes = getattr(r, "boxes", None)
+                if boxes is None or len(boxes) == 0:
+                    out.append(DetectionBatch.empty())
+                    continue
+                xyxy, conf, cls, _ = boxes_arrays(boxes)
+                out.append(to_detections(self._batch.unscale(i, xyxy), conf, cls))
+        return out
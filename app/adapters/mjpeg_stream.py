@@ -1,14 +1,18 @@
 """
 MJPEG over HTTP for remote preview: encoder thread + drop-old-frames queue so
 inference never blocks on network or slow clients.
+
+``/stats`` returns JSON from an optional ``stats_provider`` callable (the preview
+passes per-step latency percentiles).
 """
 from __future__ import annotations
 
+import json
 import queue
 import threading
 import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import cv2
 import numpy as np
@@ -245,12 +249,14 @@ class MjpegStreamServer:
         max_width: int = 1280,
         quality: int = 80,
         max_fps: float = 25.0,
+        stats_provider: Optional[Callable[[], Any]] = None,
     ):
         self._host = host
         self._port = port
         self._max_width = max(0, int(max_width))
         self._quality = int(np.clip(quality, 30, 95))
         self._min_frame_interval = 1.0 / max(1.0, float(max_fps))
+        self._stats_provider = stats_provider
         self._frame_q: queue.Queue = queue.Queue(maxsize=1)
         self._jpeg: Optional[bytes] = None
         self._jpeg_seq: int = 0
@@ -348,6 +354,14 @@ class MjpegStreamServer:
                     self.end_headers()
                     self.wfile.write(html_body)
                     return
+                if path == "/stats" and server._stats_provider is not None:
+                    body = json.dumps(server._stats_provider()).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Cache-Control", "no-store")
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
                 if path == "/stream":
                     self.send_response(200)
                     self.send_header("Cache-Control", "no-cache, no-store, must-revalidate")
@@ -0,0 +1,218 @@
+"""Decoded frames in a ``multiprocessing.shared_memory`` ring.
+
+One writer (the decoder process, ``app.app.decode_shm``) and any number of
+readers in other processes. The segment holds a small header, per-slot
+metadata and ``slots`` fixed-size BGR images::
+
+    header  int64[16]   magic, version, width, height, channels, slots,
+                        latest sequence number, writer pid
+    seq     int64[slots]    sequence number of the frame in each slot (-1 while written)
+    t       float64[slots]  writer wall time of the frame
+    cap_t   float64[slots]  capture (PTS) wall time, NaN if unknown
+    crc     int64[slots]    CRC32 of seq, times and pixels (weakly ordered CPUs only)
+    images  uint8[slots, height, width, channels]
+
+Frame ``n`` goes to slot ``n % slots``. The writer marks the slot ``-1``,
+copies the pixels, stores the metadata and the slot's sequence number, then
+publishes ``n`` in the header. A reader takes the latest sequence number,
+checks the slot still carries it and returns a read-only view into the
+segment, with no copy. The view stays valid until the writer laps the ring,
+``slots - 1`` frames later; a reader that keeps frames longer copies them
+out and checks ``verify()`` afterwards to detect a copy torn by the writer.
+
+Python has no memory barriers, so this sequence-number protocol relies on
+stores becoming visible to other cores in program order, which x86 (TSO)
+guarantees. Elsewhere (aarch64) a reader could see the new sequence number
+before the pixels, so the writer also stores a CRC32 of the frame in its
+slot and ``verify()`` recomputes it over the reader's copy: a stale or torn
+copy fails the check and is read again. That costs one pass over the frame
+on each side (about 2 ms at 1080p) and is skipped on x86.
+"""
+from __future__ import annotations
+
+import math
+import os
+import platform
+import struct
+import zlib
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+MAGIC = 0x594F4C4F53484D31  # "YOLOSHM1"
+VERSION = 2
+_HEADER = 16
+_ALIGN = 64
+
+# stores are seen in program order only on x86; elsewhere copies are checksummed
+CHECKSUM = platform.machine().lower() not in ("x86_64", "amd64", "i386", "i686")
+
+# header fields
+_MAGIC, _VERSION, _W, _H, _C, _SLOTS, _LATEST, _PID = range(8)
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _layout(w: int, h: int, c: int, slots: int) -> Tuple[int, int, int, int, int, int]:
+    """Byte offsets of seq, t, cap_t, crc and images, and the total size."""
+    seq = _align(_HEADER * 8)
+    t = _align(seq + slots * 8)
+    cap_t = _align(t + slots * 8)
+    crc = _align(cap_t + slots * 8)
+    images = _align(crc + slots * 8)
+    return seq, t, cap_t, crc, images, images + slots * w * h * c
+
+
+def _checksum(seq: int, image: np.ndarray, t: float, capture_t: Optional[float]) -> int:
+    meta = struct.pack("<qdd", seq, t, math.nan if capture_t is None else capture_t)
+    return zlib.crc32(np.ascontiguousarray(image), zlib.crc32(meta))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without letting this process's resource tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ShmFrameRing:
+    """A created (writer) or attached (reader) shared-memory frame ring."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+        buf = shm.buf
+        self._header = np.ndarray((_HEADER,), dtype=np.int64, buffer=buf)
+        if int(self._header[_MAGIC]) != MAGIC or int(self._header[_VERSION]) != VERSION:
+            raise ValueError(f"shared memory {self.name!r} is not a frame ring (v{VERSION})")
+        self.width, self.height, self.channels, self.slots = (
+            int(self._header[_W]), int(self._header[_H]), int(self._header[_C]), int(self._header[_SLOTS]),
+        )
+        seq, t, cap_t, crc, images, _ = _layout(self.width, self.height, self.channels, self.slots)
+        self._seq = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=seq)
+        self._t = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=t)
+        self._cap_t = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=cap_t)
+        self._crc = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=crc)
+        self._images = np.ndarray(
+            (self.slots, self.height, self.width, self.channels), dtype=np.uint8, buffer=buf, offset=images,
+        )
+        self._views = [self._images[i] for i in range(self.slots)]
+        for v in self._views:
+            if not owner:
+                v.flags.writeable = False
+
+    @classmethod
+    def create(cls, name: str, width: int, height: int, channels: int = 3, slots: int = 4) -> "ShmFrameRing":
+        if slots < 2:
+            raise ValueError("a shared-memory ring needs at least 2 slots")
+        seq_offset, _, _, _, _, size = _layout(width, height, channels, slots)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = _attach(name)
+            pid = 0
+            if stale.size >= _HEADER * 8:
+                pid = int(np.ndarray((_HEADER,), dtype=np.int64, buffer=stale.buf)[_PID])
+            stale.close()
+            if pid and _alive(pid):
+                raise RuntimeError(f"shared memory {name!r} already has a live writer (pid {pid})") from None
+            stale.unlink()  # left behind by a writer that died
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[[_VERSION, _W, _H, _C, _SLOTS, _LATEST, _PID]] = (
+            VERSION, width, height, channels, slots, -1, os.getpid(),
+        )
+        np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=seq_offset)[:] = -1
+        header[_MAGIC] = MAGIC  # last: readers only trust a fully initialised header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmFrameRing":
+        """Raises FileNotFoundError if no writer has created *name* yet."""
+        return cls(_attach(name), owner=False)
+
+    @property
+    def latest(self) -> int:
+        return int(self._header[_LATEST])
+
+    @property
+    def writer_pid(self) -> int:
+        return int(self._header[_PID])
+
+    def writer_alive(self) -> bool:
+        return _alive(self.writer_pid)
+
+    def write(self, image: np.ndarray, t: float, capture_t: Optional[float] = None) -> int:
+        """Publish *image* as the next frame; returns its sequence number."""
+        n = self.latest + 1
+        i = n % self.slots
+        self._seq[i] = -1
+        np.copyto(self._views[i], image.reshape(self._views[i].shape))
+        self._t[i] = t
+        self._cap_t[i] = math.nan if capture_t is None else capture_t
+        if CHECKSUM:
+            self._crc[i] = _checksum(n, self._views[i], t, capture_t)
+        self._seq[i] = n
+        self._header[_LATEST] = n
+        return n
+
+    def read(self, seq: int) -> Optional[Tuple[np.ndarray, float, Optional[float]]]:
+        """``(view, t, capture_t)`` of frame *seq*, or None if it was overwritten (or is being written)."""
+        i = seq % self.slots
+        if int(self._seq[i]) != seq:
+            return None
+        t, cap_t = float(self._t[i]), float(self._cap_t[i])
+        if int(self._seq[i]) != seq:
+            return None
+        return self._views[i], t, None if math.isnan(cap_t) else cap_t
+
+    def holds(self, seq: int) -> bool:
+        """True while frame *seq* is still in its slot (not lapped or being rewritten)."""
+        return self._seq is not None and int(self._seq[seq % self.slots]) == seq
+
+    def verify(self, seq: int, image: np.ndarray, t: float, capture_t: Optional[float]) -> bool:
+        """True if *image*, a copy of frame *seq* as returned by ``read()``, is what the writer published.
+
+        Checks ``holds(seq)``, plus the frame's checksum where stores may be
+        seen out of order (see the module docstring).
+        """
+        if not self.holds(seq):
+            return False
+        return not CHECKSUM or _checksum(seq, image, t, capture_t) == int(self._crc[seq % self.slots])
+
+    def close(self) -> None:
+        """Detach; the writer also removes the segment."""
+        self._views = []
+        self._header = self._seq = self._t = self._cap_t = self._crc = self._images = None
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # a frame view is still referenced (e.g. queued); the mapping goes at exit
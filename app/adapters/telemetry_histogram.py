@@ -0,0 +1,73 @@
+"""Telemetry decorator that aggregates time_ms samples into percentile histograms.
+
+Wraps any backend (log / OTLP). Every ``time_ms`` sample is recorded under its
+name (plus non-``msg`` tags, e.g. ``detect_ms{camera=door}``) in two registries:
+
+- ``totals``: cumulative since start, for benchmarks / the preview ``/stats`` page;
+- ``window``: reset after each periodic summary logged on the ``telemetry`` logger.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from ..core.histogram import HistogramRegistry
+from ..core.ports import Telemetry
+
+log = logging.getLogger("telemetry")
+
+
+def _key(name: str, tags: dict) -> str:
+    extra = ",".join(f"{k}={v}" for k, v in sorted(tags.items()) if k != "msg")
+    return f"{name}{{{extra}}}" if extra else name
+
+
+class HistogramTelemetry(Telemetry):
+    def __init__(self, inner: Optional[Telemetry] = None, summary_sec: float = 60.0):
+        self._inner = inner
+        self.summary_sec = float(summary_sec)
+        self.totals = HistogramRegistry()
+        self.window = HistogramRegistry()
+        self._last_summary = time.monotonic()
+        self._summary_lock = threading.Lock()
+
+    def incr(self, name: str, value: int = 1, **tags):
+        if self._inner is not None:
+            self._inner.incr(name, value, **tags)
+
+    def gauge(self, name: str, value: float, **tags):
+        if self._inner is not None:
+            self._inner.gauge(name, value, **tags)
+
+    def time_ms(self, name: str, value: float, **tags):
+        if self._inner is not None:
+            self._inner.time_ms(name, value, **tags)
+        key = _key(name, tags)
+        self.totals.record(key, value)
+        self.window.record(key, value)
+        if self.summary_sec > 0 and (time.monotonic() - self._last_summary) >= self.summary_sec:
+            self.emit_summary()
+
+    def emit_summary(self) -> str:
+        """Log and return the windowed percentile summary, then start a new window."""
+        with self._summary_lock:
+            line = self.window.summary()
+            self.window.reset()
+            self._last_summary = time.monotonic()
+        if line:
+            log.info("latency %s", line)
+        return line
+
+
+def find_histograms(tel: Telemetry) -> Optional[HistogramRegistry]:
+    """Cumulative registry of *tel* if it (or what it wraps) aggregates histograms."""
+    seen = 0
+    while tel is not None and seen < 8:
+        totals = getattr(tel, "totals", None)
+        if isinstance(totals, HistogramRegistry):
+            return totals
+        tel = getattr(tel, "_inner", None)
+        seen += 1
+    return None
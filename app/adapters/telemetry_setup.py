@@ -1,4 +1,9 @@
-"""Select telemetry backend: TELEMETRY_BACKEND=log (default) or otlp."""
+"""Select telemetry backend: TELEMETRY_BACKEND=log (default) or otlp.
+
+TELEMETRY_HISTOGRAMS=1 (default) wraps the backend in HistogramTelemetry, which
+keeps per-name time_ms percentiles in memory and logs a summary every
+TELEMETRY_SUMMARY_SEC seconds (0 = never log, still queryable).
+"""
 import logging
 import os
 
@@ -8,6 +13,15 @@ _log = logging.getLogger("telemetry")
 
 
 def get_telemetry() -> Telemetry:
+    tel = _backend()
+    if os.getenv("TELEMETRY_HISTOGRAMS", "1").strip().lower() in ("1", "true", "yes"):
+        from .telemetry_histogram import HistogramTelemetry
+
+        return HistogramTelemetry(tel, summary_sec=float(os.getenv("TELEMETRY_SUMMARY_SEC", "60")))
+    return tel
+
+
+def _backend() -> Telemetry:
     backend = os.getenv("TELEMETRY_BACKEND", "log").strip().lower()
     if backend in ("otlp", "otel", "opentelemetry"):
         try:
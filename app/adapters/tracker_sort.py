@@ -0,0 +1,209 @@
+"""Native SORT / ByteTrack-style multi-object tracker (TRACKER_BACKEND=sort).
+
+Runs after any detector (Ultralytics predict, ONNX, OpenCV DNN, tiled), so
+track ids do not depend on the backend and the tracker can be profiled on
+its own (``track_ms``). Track state lives in NumPy arrays, one row per
+track: a constant-velocity Kalman filter over ``(cx, cy, w, h)`` is
+predicted for all tracks at once, the track/detection cost is one IoU
+matrix, and assignment is greedy (highest IoU first, same class only).
+
+Association runs in two passes as in ByteTrack: detections with
+``conf >= high_conf`` are matched first, then the remaining ones down to
+``low_conf`` may continue (never start) a track. For that second pass to
+see anything the detector runs at TRACKER_LOW_CONF and DetectStep applies
+CONF_THRESH to the tracker's output. A track gets its id reported after
+``min_hits`` matches and is dropped after ``max_age`` detector passes
+without a match (before that, after one).
+
+``predict()`` advances the filter one frame without a detector result and
+returns where the live tracks should be, for frames the detector skips
+(DETECT_EVERY); ``speed()`` tells DetectStep how far apart those may be.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.boxes import iou_matrix
+from ..core.ports import Detection, DetectionBatch, Frame, ITracker
+
+_F = np.eye(8, dtype=np.float64)
+_F[:4, 4:] = np.eye(4)  # position += velocity, one frame per step
+
+_STD_POS = 1.0 / 20.0  # noise scales with box size, as in ByteTrack's filter
+_STD_VEL = 1.0 / 160.0
+_SETTLE_HITS = 3  # matches before a track's velocity estimate is trusted
+
+
+def _sizes(mean: np.ndarray) -> np.ndarray:
+    """``(w, h, w, h)`` per row, floored so tiny boxes keep some noise."""
+    wh = np.maximum(mean[:, 2:4], 1.0)
+    return np.concatenate((wh, wh), axis=1)
+
+
+def _to_xyxy(mean: np.ndarray) -> np.ndarray:
+    cx, cy, w, h = mean[:, 0], mean[:, 1], mean[:, 2], mean[:, 3]
+    return np.stack((cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2), axis=1)
+
+
+def _to_cxcywh(xyxy: np.ndarray) -> np.ndarray:
+    xyxy = xyxy.astype(np.float64)
+    wh = xyxy[:, 2:] - xyxy[:, :2]
+    return np.concatenate((xyxy[:, :2] + wh / 2, wh), axis=1)
+
+
+def greedy_match(cost: np.ndarray, thresh: float) -> List[Tuple[int, int]]:
+    """(row, col) pairs, best score first, each row and column used once, score >= *thresh*."""
+    rows, cols = np.nonzero(cost >= thresh)
+    order = np.argsort(-cost[rows, cols], kind="stable")
+    used_r, used_c, pairs = set(), set(), []
+    for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+class SortTracker(ITracker):
+    def __init__(
+        self,
+        iou_thresh: float = 0.3,
+        max_age: int = 30,
+        min_hits: int = 3,
+        high_conf: float = 0.5,
+        low_conf: float = 0.1,
+    ):
+        self.iou_thresh = float(iou_thresh)
+        self.max_age = int(max_age)
+        self.min_hits = int(min_hits)
+        self.high_conf = float(high_conf)
+        self.low_conf = float(low_conf)
+        self.reset()
+
+    def reset(self) -> None:
+        self._mean = np.zeros((0, 8))
+        self._cov = np.zeros((0, 8, 8))
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._cls = np.zeros(0, dtype=np.int64)
+        self._conf = np.zeros(0, dtype=np.float32)
+        self._hits = np.zeros(0, dtype=np.int64)
+        self._misses = np.zeros(0, dtype=np.int64)  # detector passes since the last match
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ---------- Kalman filter (all tracks at once) ----------
+    def _step(self) -> None:
+        if not len(self._ids):
+            return
+        std = _sizes(self._mean)
+        q = np.concatenate((_STD_POS * std, _STD_VEL * std), axis=1) ** 2
+        self._mean = self._mean @ _F.T
+        self._cov = _F @ self._cov @ _F.T
+        self._cov[:, np.arange(8), np.arange(8)] += q
+
+    def _correct(self, rows: np.ndarray, meas: np.ndarray) -> None:
+        mean, cov = self._mean[rows], self._cov[rows]
+        r = (_STD_POS * _sizes(mean)) ** 2
+        s = cov[:, :4, :4].copy()
+        s[:, np.arange(4), np.arange(4)] += r
+        gain = cov[:, :, :4] @ np.linalg.inv(s)  # (n, 8, 4)
+        innov = meas - mean[:, :4]
+        self._mean[rows] = mean + (gain @ innov[:, :, None])[:, :, 0]
+        self._cov[rows] = cov - gain @ s @ gain.transpose(0, 2, 1)
+
+    def _spawn(self, meas: np.ndarray, cls: np.ndarray, conf: np.ndarray) -> None:
+        n = len(meas)
+        mean = np.concatenate((meas, np.zeros((n, 4))), axis=1)
+        std = _sizes(mean)
+        var = np.concatenate((2 * _STD_POS * std, 10 * _STD_VEL * std), axis=1) ** 2
+        cov = np.zeros((n, 8, 8))
+        cov[:, np.arange(8), np.arange(8)] = var
+        self._mean = np.concatenate((self._mean, mean))
+        self._cov = np.concatenate((self._cov, cov))
+        self._ids = np.concatenate((self._ids, np.arange(self._next_id, self._next_id + n)))
+        self._next_id += n
+        self._cls = np.concatenate((self._cls, cls.astype(np.int64)))
+        self._conf = np.concatenate((self._conf, conf.astype(np.float32)))
+        self._hits = np.concatenate((self._hits, np.ones(n, dtype=np.int64)))
+        self._misses = np.concatenate((self._misses, np.zeros(n, dtype=np.int64)))
+
+    def _keep(self, keep: np.ndarray) -> None:
+        for name in ("_mean", "_cov", "_ids", "_cls", "_conf", "_hits", "_misses"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    # ---------- association ----------
+    def _associate(self, dets: DetectionBatch, det_idx: np.ndarray, tracks: np.ndarray):
+        """Greedy IoU matches between *tracks* rows and *det_idx* detections of the same class."""
+        if not len(det_idx) or not len(tracks):
+            return []
+        cost = iou_matrix(_to_xyxy(self._mean[tracks]), dets.xyxy[det_idx])
+        cost[self._cls[tracks][:, None] != dets.cls_id[det_idx][None, :]] = 0.0
+        return [(tracks[r], det_idx[c]) for r, c in greedy_match(cost, self.iou_thresh)]
+
+    def update(self, frame: Frame, dets: Sequence[Detection]) -> DetectionBatch:
+        """Advance one frame, match *dets* to tracks and return them with ``track_id`` set."""
+        dets = DetectionBatch.from_detections(dets)
+        self._step()
+        idx = np.arange(len(dets))
+        high = idx[dets.conf >= self.high_conf]
+        low = idx[(dets.conf < self.high_conf) & (dets.conf >= self.low_conf)]
+
+        matches = self._associate(dets, high, np.arange(len(self._ids)))
+        taken = {t for t, _ in matches}
+        rest = np.array([t for t in range(len(self._ids)) if t not in taken], dtype=np.int64)
+        matches += self._associate(dets, low, rest)
+
+        track_id = np.full(len(dets), -1, dtype=np.int64)
+        self._misses += 1
+        if matches:
+            rows = np.array([t for t, _ in matches])
+            cols = np.array([d for _, d in matches])
+            self._correct(rows, _to_cxcywh(dets.xyxy[cols]))
+            self._conf[rows] = dets.conf[cols]
+            self._hits[rows] += 1
+            self._misses[rows] = 0
+            confirmed = self._hits[rows] >= self.min_hits
+            track_id[cols[confirmed]] = self._ids[rows[confirmed]]
+
+        matched = {d for _, d in matches}
+        new = np.array([d for d in high if d not in matched], dtype=np.int64)
+        # tentative tracks die on their first miss, confirmed ones after max_age
+        self._keep((self._misses == 0) | ((self._hits >= self.min_hits) & (self._misses <= self.max_age)))
+        if len(new):
+            self._spawn(_to_cxcywh(dets.xyxy[new]), dets.cls_id[new], dets.conf[new])
+            if self.min_hits <= 1:
+                track_id[new] = self._ids[-len(new):]
+        return DetectionBatch(dets.xyxy, dets.conf, dets.cls_id, track_id)
+
+    def speed(self) -> Optional[float]:
+        """Fastest track in box widths/heights per frame.
+
+        None when nothing is confirmed, or while any visible track is too new
+        for its velocity to be known: the detector should keep running then.
+        """
+        live = self._misses == 0
+        if not (live & (self._hits >= self.min_hits)).any():
+            return None
+        if (self._hits[live] < max(self.min_hits, _SETTLE_HITS)).any():
+            return None
+        mean = self._mean[live]
+        wh = np.maximum(mean[:, 2:4], 1.0)
+        return float(np.hypot(mean[:, 4] / wh[:, 0], mean[:, 5] / wh[:, 1]).max())
+
+    def predict(self, frame: Optional[Frame] = None) -> DetectionBatch:
+        """Advance one frame without detections; boxes of confirmed tracks matched last pass."""
+        self._step()
+        live = (self._misses == 0) & (self._hits >= self.min_hits)
+        if not live.any():
+            return DetectionBatch.empty()
+        xyxy = _to_xyxy(self._mean[live])
+        if frame is not None:
+            xyxy = np.clip(xyxy, 0, [frame.w, frame.h, frame.w, frame.h])
+        return DetectionBatch(
+            np.round(xyxy).astype(np.int32), self._conf[live], self._cls[live], self._ids[live]
+        )
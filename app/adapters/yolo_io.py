@@ -0,0 +1,203 @@
+"""NumPy pre/post-processing shared by the YOLO detector adapters.
+
+Letterboxing writes into a preallocated batch buffer (no per-frame tensor
+allocation), and box post-processing works on whole arrays at once.
+``ArrayYoloDetector`` is the common base of the CPU backends that return raw
+YOLOv8-style output tensors (ONNX Runtime, OpenCV DNN).
+"""
+from __future__ import annotations
+
+import ast
+from abc import abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..core.boxes import nms
+from ..core.ports import Detector, DetectionBatch, Frame
+
+PAD_VALUE = 114
+
+COCO_LABELS = [
+    "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat",
+    "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
+    "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack",
+    "umbrella", "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball",
+    "kite", "baseball bat", "baseball glove", "skateboard", "surfboard", "tennis racket",
+    "bottle", "wine glass", "cup", "fork", "knife", "spoon", "bowl", "banana", "apple",
+    "sandwich", "orange", "broccoli", "carrot", "hot dog", "pizza", "donut", "cake", "chair",
+    "couch", "potted plant", "bed", "dining table", "toilet", "tv", "laptop", "mouse",
+    "remote", "keyboard", "cell phone", "microwave", "oven", "toaster", "sink",
+    "refrigerator", "book", "clock", "vase", "scissors", "teddy bear", "hair drier",
+    "toothbrush",
+]
+
+
+class LetterboxBatch:
+    """Reusable NCHW float32 batch of letterboxed RGB images in [0, 1]."""
+
+    def __init__(self, imgsz: int, max_batch: int = 1):
+        self.imgsz = int(imgsz)
+        self.max_batch = max(1, int(max_batch))
+        self._hwc = np.full((self.max_batch, self.imgsz, self.imgsz, 3), PAD_VALUE, dtype=np.uint8)
+        self._nchw = np.empty((self.max_batch, 3, self.imgsz, self.imgsz), dtype=np.float32)
+        self.ratios = np.ones(self.max_batch, dtype=np.float32)
+        self.pads = np.zeros((self.max_batch, 2), dtype=np.float32)  # (left, top)
+        self.sizes = np.zeros((self.max_batch, 2), dtype=np.float32)  # (w, h) of the source
+
+    def fill(self, images: Sequence[Union[np.ndarray, Frame]]) -> np.ndarray:
+        """Letterbox *images* (BGR arrays or Frames) into the buffer. Returns the ``(n, 3, S, S)`` view.
+
+        For a Frame, a downscale reuses the frame's pyramid level of that width
+        when its height matches (see pyramid.py).
+        """
+        n = len(images)
+        if n > self.max_batch:
+            raise ValueError(f"batch of {n} exceeds max_batch={self.max_batch}")
+        s = self.imgsz
+        for i, img in enumerate(images):
+            frame = img if isinstance(img, Frame) else None
+            if frame is not None:
+                img = frame.image
+            h, w = img.shape[:2]
+            r = min(s / h, s / w)
+            nw, nh = int(round(w * r)), int(round(h * r))
+            left, top = (s - nw) // 2, (s - nh) // 2
+            slot = self._hwc[i]
+            if (nw, nh) != (s, s):
+                slot.fill(PAD_VALUE)
+            if frame is not None and nw < w:
+                small = frame.scaled(nw)
+                img = small if small.shape[0] == nh else cv2.resize(img, (nw, nh), interpolation=cv2.INTER_AREA)
+            elif (nw, nh) != (w, h):
+                img = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+            slot[top:top + nh, left:left + nw] = img
+            self.ratios[i] = r
+            self.pads[i] = (left, top)
+            self.sizes[i] = (w, h)
+        # BGR HWC uint8 -> RGB CHW float32 for the whole batch in one pass
+        np.multiply(
+            self._hwc[:n, :, :, ::-1].transpose(0, 3, 1, 2),
+            1.0 / 255.0,
+            out=self._nchw[:n],
+            casting="unsafe",
+        )
+        return self._nchw[:n]
+
+    def view(self, n: int) -> np.ndarray:
+        """The first *n* slots of the NCHW buffer (for models with a fixed batch size)."""
+        return self._nchw[:n]
+
+    def unscale(self, i: int, xyxy: np.ndarray) -> np.ndarray:
+        """Map letterboxed boxes of batch item *i* back to source pixels (clipped)."""
+        left, top = self.pads[i]
+        out = (xyxy - np.array([left, top, left, top], dtype=np.float32)) / self.ratios[i]
+        w, h = self.sizes[i]
+        np.clip(out[:, 0::2], 0, w, out=out[:, 0::2])
+        np.clip(out[:, 1::2], 0, h, out=out[:, 1::2])
+        return out
+
+
+def to_detections(
+    xyxy: np.ndarray,
+    conf: np.ndarray,
+    cls: np.ndarray,
+    ids: Optional[np.ndarray] = None,
+) -> DetectionBatch:
+    """Wrap box arrays as a ``DetectionBatch`` (one vectorized cast per column)."""
+    if len(xyxy) == 0:
+        return DetectionBatch.empty()
+    return DetectionBatch(np.asarray(xyxy), conf, cls, ids)
+
+
+def boxes_arrays(boxes) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Pull xyxy / conf / cls / id arrays off an Ultralytics ``Boxes`` object."""
+    xyxy = boxes.xyxy.cpu().numpy()
+    conf = boxes.conf.cpu().numpy()
+    cls = boxes.cls.cpu().numpy()
+    ids = boxes.id.cpu().numpy() if getattr(boxes, "id", None) is not None else None
+    return xyxy, conf, cls, ids
+
+
+def decode_yolo(
+    pred: np.ndarray,
+    conf_thresh: float,
+    iou_thresh: float = 0.45,
+    max_det: int = 300,
+    max_candidates: int = 3000,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Raw YOLOv8/11 output of one image, ``(4 + nc, N)`` rows of ``cx, cy, w, h``
+    then class scores, -> NMS-filtered xyxy / conf / cls arrays in letterbox pixels."""
+    pred = np.asarray(pred, dtype=np.float32).T
+    scores = pred[:, 4:]
+    cls = scores.argmax(axis=1)
+    conf = scores[np.arange(len(scores)), cls]
+    keep = conf >= conf_thresh
+    boxes, conf, cls = pred[keep, :4], conf[keep], cls[keep]
+    if len(conf) > max_candidates:
+        top = np.argpartition(-conf, max_candidates)[:max_candidates]
+        boxes, conf, cls = boxes[top], conf[top], cls[top]
+    xyxy = np.empty_like(boxes)
+    half = boxes[:, 2:] / 2.0
+    xyxy[:, :2] = boxes[:, :2] - half
+    xyxy[:, 2:] = boxes[:, :2] + half
+    kept = np.array([g[0] for g in nms(xyxy, conf, cls, iou_thresh)][:max_det], dtype=np.int64)
+    return xyxy[kept], conf[kept], cls[kept]
+
+
+def parse_labels(raw: Union[str, Dict, Sequence, None]) -> Optional[Dict[int, str]]:
+    """Class names from model metadata (``"{0: 'person', ...}"``), a dict or a list."""
+    if not raw:
+        return None
+    if isinstance(raw, str):
+        try:
+            raw = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            return None
+    if isinstance(raw, dict):
+        return {int(k): str(v) for k, v in raw.items()}
+    return {i: str(v) for i, v in enumerate(raw)}
+
+
+class ArrayYoloDetector(Detector):
+    """Letterbox -> ``_forward`` -> vectorized decode + NMS -> frame pixels.
+
+    Subclasses set ``imgsz`` / ``model_batch`` and implement ``_forward``,
+    which takes an NCHW float32 batch and returns ``(B, 4 + nc, N)``.
+    ``model_batch`` > 0 means the model was exported with that fixed batch
+    size; ``0`` accepts any batch up to ``max_batch``.
+    """
+
+    imgsz: int = 640
+    model_batch: int = 0
+
+    def __init__(self, conf: float, max_batch: int = 1, iou: float = 0.45,
+                 labels: Union[Dict[int, str], Sequence[str], None] = None):
+        self.conf = float(conf)
+        self.iou = float(iou)
+        self.max_batch = self.model_batch or max(1, int(max_batch))
+        self.labels = parse_labels(labels) or dict(enumerate(COCO_LABELS))
+        self._batch: Optional[LetterboxBatch] = None
+
+    @abstractmethod
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        """Run the model on an NCHW float32 batch; ``(B, 4 + nc, N)`` predictions."""
+
+    def detect(self, frame: Frame) -> DetectionBatch:
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: Sequence[Frame]) -> List[DetectionBatch]:
+        if self._batch is None:
+            self._batch = LetterboxBatch(self.imgsz, self.max_batch)
+        out: List[DetectionBatch] = []
+        for start in range(0, len(frames), self.max_batch):
+            chunk = frames[start:start + self.max_batch]
+            batch = self._batch.fill(chunk)
+            if self.model_batch:
+                batch = self._batch.view(self.model_batch)
+            preds = self._forward(batch)
+            for i in range(len(chunk)):
+                xyxy, conf, cls = decode_yolo(preds[i], self.conf, self.iou)
+                out.append(to_detections(self._batch.unscale(i, xyxy), conf, cls))
+        return out
@@ -0,0 +1,79 @@
+"""Decoder process: read one camera and publish its frames to shared memory.
+
+    python -m app.app.decode_shm --src rtsp://cam/stream --name driveway
+
+Consumers then use ``SRC=shm://driveway`` (see ``camera_shm.py``). Services
+with ``DECODE_PROCESS=1`` start this themselves for their ``SRC`` and share
+it. The ring is (re)created from the first frame's size, so a resolution
+change on the camera is picked up. With ``--parent-pid`` the decoder exits
+once that process is gone.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import time
+
+from ..adapters.camera_cv2 import Cv2Camera
+from ..adapters.shm_ring import ShmFrameRing
+from ..core.frame_pool import FramePool
+
+logger = logging.getLogger(__name__)
+
+
+def _parent_gone(pid: int) -> bool:
+    return pid > 0 and os.getppid() != pid
+
+
+def run_decoder(src: str, name: str, slots: int = 4, parent_pid: int = 0) -> None:
+    stop = []
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(True))
+    cam = Cv2Camera(src, pool=FramePool(2))  # each frame is copied into the ring right away
+    cam.open()
+    ring = None
+    failures = 0
+    try:
+        while not stop and not _parent_gone(parent_pid):
+            frame = cam.read()
+            if frame is None:
+                failures += 1
+                if failures % 50 == 0:
+                    logger.warning("Decoder %s: no frames from %s, reopening", name, src)
+                    cam.close()
+                    cam.open()
+                time.sleep(0.01)
+                continue
+            failures = 0
+            if ring is None or (ring.width, ring.height) != (frame.w, frame.h):
+                if ring is not None:
+                    ring.close()
+                try:
+                    ring = ShmFrameRing.create(name, frame.w, frame.h, slots=slots)
+                except RuntimeError as e:
+                    logger.info("Decoder %s: %s, exiting", name, e)
+                    ring = None
+                    return
+                logger.info("Decoder %s: publishing %dx%d frames from %s", name, frame.w, frame.h, src)
+            ring.write(frame.image, frame.t, frame.capture_t)
+    finally:
+        cam.close()
+        if ring is not None:
+            ring.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Decode a camera into a shared-memory frame ring.")
+    parser.add_argument("--src", required=True, help="Camera source (RTSP URL, device index, file).")
+    parser.add_argument("--name", required=True, help="Shared-memory name consumers attach to (shm://NAME).")
+    parser.add_argument("--slots", type=int, default=int(os.getenv("SHM_SLOTS", "4")))
+    parser.add_argument("--parent-pid", type=int, default=0, help="Exit when this process is gone.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run_decoder(args.src, args.name, slots=args.slots, parent_pid=args.parent_pid)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
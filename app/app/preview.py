@@ -15,6 +15,7 @@ from app.core.alert_policy import AlertPolicy
 from app.core.pipeline import Pipeline, _names_to_ids
 from app.core.ports import Frame, Detection
 from app.core.annotate import draw_detections, color_bgr_for_det
+from app.core.frame_pool import FramePool
 from typing import Any, Optional, Sequence, Set, Dict, List, Tuple
 
 try:
@@ -25,9 +26,11 @@ except ImportError:
     _PIL_OK = False
 
 from app.adapters.camera_cv2 import Cv2Camera, ThreadedCamera
-from app.adapters.detector_ultra import UltralyticsDetector
+from app.adapters.detector_factory import build_detector
 from app.adapters.telemetry_setup import get_telemetry
 from app.adapters.mjpeg_stream import MjpegStreamServer
+from app.app.run import _build_camera, _build_tracker, _detect_conf, _record_detections, _tracker_cfg
+from app.adapters.telemetry_histogram import find_histograms
 
 
 preview_dir = "/workspace/work/preview"
@@ -235,14 +238,23 @@ def _annotate_preview_frame(
     fps: float,
     *,
     tracker_on: bool,
+    pool: Optional[FramePool] = None,
 ) -> np.ndarray:
-    img = frame.image.copy()
     keep: List[Detection] = [
         d
         for d in dets
         if d.conf >= conf and (d.cls_id in draw_ids if draw_ids else True)
     ]
 
+    h, w = frame.image.shape[:2]
+    panel = _build_stats_panel(h, fps, keep, class_names_by_id)
+
+    # frame and panel side by side in one (recycled) canvas instead of copy + hstack
+    shape = (h, w + panel.shape[1], 3)
+    out = pool.acquire(shape) if pool is not None else np.empty(shape, dtype=np.uint8)
+    img = out[:, :w]
+    np.copyto(img, frame.image)
+    out[:, w:] = panel
     draw_detections(
         img,
         keep,
@@ -250,12 +262,13 @@ def _annotate_preview_frame(
         conf_thresh=0.0,
         tracker_on=tracker_on,
     )
+    return out
 
-    h = img.shape[0]
-    panel = _build_stats_panel(h, fps, keep, class_names_by_id)
 
-    out = np.hstack([img, panel])
-    return out
+def _stats_provider(tel):
+    """Latency percentiles for the MJPEG ``/stats`` endpoint, if histograms are on."""
+    hists = find_histograms(tel)
+    return hists.snapshot if hists is not None else None
 
 
 def _use_local_window() -> bool:
@@ -291,15 +304,23 @@ def main():
     clock = SystemClock()
     tel = get_telemetry()
 
-    raw_cam = Cv2Camera(cfg.src, clock=clock)
-    cam = ThreadedCamera(raw_cam)
+    cam = _build_camera(cfg, clock)
+    if isinstance(cam, Cv2Camera):
+        # shared-memory and threaded cameras already decode in the background and return the newest frame
+        cam = ThreadedCamera(cam)
 
-    det = UltralyticsDetector(
-        engine_path=resolve_path(cfg.engine),
-        conf=cfg.conf_thresh,
+    tracker = _build_tracker(cfg)
+    det = build_detector(
+        cfg.detector_backend,
+        resolve_path(cfg.engine),
+        conf=_detect_conf(cfg, tracker),
         imgsz=cfg.img_size,
-        tracker_cfg=resolve_path(cfg.tracker_cfg) if cfg.tracker_on else None,
+        tracker_cfg=_tracker_cfg(cfg, tracker),
+        max_batch=cfg.detect_batch,
+        threads=cfg.detector_threads,
+        iou=cfg.detect_iou,
     )
+    det = _record_detections(cfg, det)
 
     pres = PresencePolicy(
         min_frames=cfg.min_frames, min_persist_sec=cfg.min_persist_sec
@@ -321,7 +342,7 @@ def main():
         clock=clock,
         camera=cam,
         detector=det,
-        tracker=None,
+        tracker=tracker,
         presence=pres,
         rate=rate,
         alerts=alerts,
@@ -344,6 +365,7 @@ def main():
             max_width=max_w,
             quality=quality,
             max_fps=max_fps,
+            stats_provider=_stats_provider(tel),
         )
         stream.start()
         print(
@@ -365,6 +387,7 @@ def main():
     cam.open()
     if use_display:
         cv2.namedWindow("YOLO Preview", cv2.WINDOW_NORMAL)
+    canvas_pool = FramePool(4)  # the MJPEG encoder may still hold the previous canvas
     fps_ema = 0.0
     last_t: Optional[float] = None
     fps_alpha = 0.12
@@ -391,6 +414,7 @@ def main():
                 class_names_by_id,
                 fps_ema,
                 tracker_on=cfg.tracker_on,
+                pool=canvas_pool,
             )
             if stream is not None:
                 stream.submit_frame(vis)
@@ -401,7 +425,10 @@ def main():
     finally:
         if stream is not None:
             stream.stop()
+        pipe.close()
         cam.close()
+        if hasattr(det, "close"):
+            det.close()
         if use_display:
             cv2.destroyAllWindows()
 
@@ -9,8 +9,8 @@ from ..core.presence_policy import PresencePolicy
 from ..core.rate_policy import RatePolicy
 from ..core.alert_policy import AlertPolicy
 from ..core.pipeline import Pipeline
-from ..adapters.camera_cv2 import Cv2Camera
-from ..adapters.detector_ultra import UltralyticsDetector
+from ..adapters.camera_cv2 import Cv2Camera, ThreadedCamera
+from ..adapters.detector_factory import build_detector, build_tracker
 from ..adapters.alerts_telegram import TelegramSink
 from ..adapters.telemetry_setup import get_telemetry
 
@@ -23,6 +23,32 @@ def resolve_path(p: str) -> str:
     return cand if os.path.exists(cand) else p
 
 
+def _build_tracker(cfg: Config):
+    """Native tracker for TRACKER_BACKEND (None when off, or when Ultralytics tracks in-model)."""
+    if not cfg.tracker_on:
+        return None
+    return build_tracker(
+        cfg.tracker_backend,
+        iou_thresh=cfg.tracker_iou,
+        max_age=cfg.tracker_max_age,
+        min_hits=cfg.tracker_min_hits,
+        high_conf=cfg.tracker_high_conf,
+        low_conf=cfg.tracker_low_conf,
+    )
+
+
+def _detect_conf(cfg: Config, tracker) -> float:
+    """Detector threshold: low enough for a native tracker's second pass, CONF_THRESH otherwise."""
+    if tracker is None:
+        return cfg.conf_thresh
+    return min(cfg.conf_thresh, cfg.tracker_low_conf)
+
+
+def _tracker_cfg(cfg: Config, tracker):
+    """Ultralytics tracker yaml, only when no native tracker replaces it."""
+    return resolve_path(cfg.tracker_cfg) if cfg.tracker_on and tracker is None else None
+
+
 def _build_frame_store(cfg: Config):
     """Build FrameStore if frames_dir is configured."""
     if not cfg.frames_dir or cfg.frames_dir == "none":
@@ -35,6 +61,49 @@ def _build_frame_store(cfg: Config):
         return None
 
 
+def _build_preroll(cfg: Config):
+    """Pre-roll ring shared by the camera and FrameCaptureStep; None when PREROLL_SEC is 0."""
+    if cfg.preroll_sec <= 0:
+        return None
+    from ..core.frame_ring import FrameRing
+
+    return FrameRing(cfg.preroll_sec, fps=cfg.preroll_fps, width=cfg.preroll_width,
+                     jpeg_quality=cfg.preroll_jpeg)
+
+
+def _build_camera(cfg: Config, clock, preroll=None):
+    """Cv2Camera, or a shared-memory reader for ``shm://`` sources and DECODE_PROCESS."""
+    from ..adapters.camera_shm import SHM_SCHEME, ShmCamera, shm_name_for
+
+    pool = None
+    if cfg.frame_pool_size > 0:
+        from ..core.frame_pool import FramePool
+
+        pool = FramePool(cfg.frame_pool_size)
+    if str(cfg.src).startswith(SHM_SCHEME):
+        return ShmCamera(cfg.src, clock=clock, slots=cfg.shm_slots, preroll=preroll, pool=pool)
+    if cfg.decode_process:
+        return ShmCamera(shm_name_for(cfg.src), clock=clock, spawn_src=cfg.src,
+                         slots=cfg.shm_slots, preroll=preroll, pool=pool)
+    cam = Cv2Camera(
+        cfg.src, clock=clock, preroll=preroll, pool=pool, decode_width=cfg.decode_width, dual=cfg.decode_dual
+    )
+    if cfg.scheduler_mode == "arrival":
+        # arrivals are only observable while a thread keeps decoding
+        return ThreadedCamera(cam)
+    return cam
+
+
+def _record_detections(cfg: Config, det):
+    """Wrap *det* in a RecordingDetector when DETECT_RECORD_PATH is set."""
+    if not cfg.detect_record_path:
+        return det
+    from ..adapters.detector_replay import RecordingDetector
+
+    logger.info("Recording detections to %s", cfg.detect_record_path)
+    return RecordingDetector(det, cfg.detect_record_path)
+
+
 def _start_cleanup_thread(frame_store, retention_days: int) -> None:
     """Periodically clean up old frames in a background thread."""
     def _cleanup_loop():
@@ -54,14 +123,19 @@ def main():
     clock = SystemClock()
     tel = get_telemetry()
 
-    cam = Cv2Camera(cfg.src, clock=clock)
-    det = UltralyticsDetector(
-        engine_path=resolve_path(cfg.engine),
-        conf=cfg.conf_thresh,
+    tracker = _build_tracker(cfg)
+    det = build_detector(
+        cfg.detector_backend,
+        resolve_path(cfg.engine),
+        conf=_detect_conf(cfg, tracker),
         imgsz=cfg.img_size,
-        tracker_cfg=resolve_path(cfg.tracker_cfg) if cfg.tracker_on else None,
+        tracker_cfg=_tracker_cfg(cfg, tracker),
+        max_batch=cfg.detect_batch,
+        threads=cfg.detector_threads,
+        iou=cfg.detect_iou,
     )
 
+    det = _record_detections(cfg, det)
     sink = TelegramSink(cfg.tg_token, cfg.tg_chat)
 
     pres = PresencePolicy(min_frames=cfg.min_frames, min_persist_sec=cfg.min_persist_sec)
@@ -80,24 +154,30 @@ def main():
         )
         _start_cleanup_thread(frame_store, cfg.frames_retention_days)
 
+    preroll = _build_preroll(cfg) if frame_store else None
+    cam = _build_camera(cfg, clock, preroll=preroll)
     pipe = Pipeline(
         cfg=cfg,
         clock=clock,
         camera=cam,
         detector=det,
-        tracker=None,
+        tracker=tracker,
         presence=pres,
         rate=rate,
         alerts=alerts,
         sink=sink,
         telemetry=tel,
         frame_store=frame_store,
+        preroll=preroll,
     )
     cam.open()
     try:
         pipe.run()
     finally:
+        pipe.close()
         cam.close()
+        if hasattr(det, "close"):
+            det.close()
 
 if __name__ == "__main__":
     main()
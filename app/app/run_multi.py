@@ -0,0 +1,98 @@
+import logging
+
+from ..core.clock import SystemClock
+from ..core.config import Config, camera_configs
+from ..core.presence_policy import PresencePolicy
+from ..core.rate_policy import RatePolicy
+from ..core.alert_policy import AlertPolicy
+from ..core.pipeline import Pipeline
+from ..core.multi_camera import MultiCameraHost, CameraTelemetry
+from ..adapters.detector_factory import build_detector
+from ..adapters.alerts_telegram import TelegramSink
+from ..adapters.telemetry_setup import get_telemetry
+from .run import (
+    resolve_path, _build_camera, _build_frame_store, _build_preroll, _build_tracker, _detect_conf,
+    _start_cleanup_thread,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    cfg = Config()
+    clock = SystemClock()
+    tel = get_telemetry()
+    cams = camera_configs(cfg)
+
+    # One engine in memory for every camera. Ultralytics' built-in tracker keeps
+    # per-stream state, so it is disabled here; TRACKER_BACKEND=sort gives every
+    # camera its own native tracker instead.
+    if cfg.tracker_on and _build_tracker(cfg) is None:
+        logger.warning("Multi-camera host runs the shared detector without the Ultralytics tracker")
+    det = build_detector(
+        cfg.detector_backend,
+        resolve_path(cfg.engine),
+        conf=min(_detect_conf(c, _build_tracker(c)) for c in cams.values()),
+        imgsz=cfg.img_size,
+        tracker_cfg=None,
+        max_batch=cfg.detect_batch,
+        threads=cfg.detector_threads,
+        iou=cfg.detect_iou,
+    )
+
+    if cfg.detect_record_path:
+        # scripts are keyed by one source's frame indices; the host batches several cameras per call
+        logger.warning("DETECT_RECORD_PATH is not supported by the multi-camera host; not recording")
+
+    sink = TelegramSink(cfg.tg_token, cfg.tg_chat)
+    frame_store = _build_frame_store(cfg)
+    if frame_store:
+        _start_cleanup_thread(frame_store, cfg.frames_retention_days)
+
+    pipelines = {}
+    for name, cam_cfg in cams.items():
+        cam_tel = CameraTelemetry(tel, name)
+        preroll = _build_preroll(cam_cfg) if frame_store else None
+        pipelines[name] = Pipeline(
+            cfg=cam_cfg,
+            clock=clock,
+            camera=_build_camera(cam_cfg, clock, preroll=preroll),
+            detector=det,
+            tracker=_build_tracker(cam_cfg),
+            presence=PresencePolicy(
+                min_frames=cam_cfg.min_frames, min_persist_sec=cam_cfg.min_persist_sec
+            ),
+            rate=RatePolicy(
+                base_fps=cam_cfg.base_fps, high_fps=cam_cfg.high_fps,
+                boost_arm_frames=cam_cfg.boost_arm_frames, boost_min_sec=cam_cfg.boost_min_sec,
+                cooldown_sec=cam_cfg.cooldown_sec, base_stride=cam_cfg.vid_stride,
+            ),
+            alerts=AlertPolicy(
+                window_sec=cam_cfg.rate_window_sec, cooldown_sec=cam_cfg.alert_cooldown_sec
+            ),
+            sink=sink,
+            telemetry=cam_tel,
+            frame_store=frame_store,
+            camera_name=name,
+            preroll=preroll,
+        )
+        logger.info("Camera %s: src=%s", name, cam_cfg.src)
+
+    host = MultiCameraHost(
+        pipelines=pipelines,
+        telemetry=tel,
+        schedule=cfg.multi_cam_schedule,
+        batch_size=cfg.detect_batch,
+    )
+    for pipe in pipelines.values():
+        pipe.camera.open()
+    try:
+        host.run()
+    finally:
+        for pipe in pipelines.values():
+            pipe.close()
+            pipe.camera.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import time as _time
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, Optional
 
 
 @dataclass
@@ -17,12 +17,17 @@ class AlertPolicy:
     pending_snapshot_context_classes: set[str] = field(default_factory=set)
     last_by_id: Dict[int, float] = field(default_factory=dict)  # id -> last alert time
     _wall_last_sent: float = field(default=0.0, repr=False)
+    # Restart-safe cooldown source; replays pass their virtual clock's now().
+    wall_clock: Optional[Callable[[], float]] = field(default=None, repr=False)
 
     def __post_init__(self):
         # Seed with wall-clock so the first alert after a restart still
         # respects cooldown (prevents restart-spam).
         if self._wall_last_sent == 0.0:
-            self._wall_last_sent = _time.time()
+            self._wall_last_sent = self._wall_now()
+
+    def _wall_now(self) -> float:
+        return self.wall_clock() if self.wall_clock is not None else _time.time()
 
     def _min_interval_sec(self) -> float:
         return max(self.window_sec, self.cooldown_sec) if self.cooldown_sec > 0 else self.window_sec
@@ -34,7 +39,7 @@ class AlertPolicy:
         restarts (which reset the pipeline clock) don't bypass cooldown.
         """
         pipeline_ok = (now - self.last_sent) >= self._min_interval_sec()
-        wall_ok = (_time.time() - self._wall_last_sent) >= self._min_interval_sec()
+        wall_ok = (self._wall_now() - self._wall_last_sent) >= self._min_interval_sec()
         return pipeline_ok and wall_ok
 
     def add(
@@ -89,5 +94,5 @@ class AlertPolicy:
         self.pending_snapshot_classes.clear()
         self.pending_snapshot_context_classes.clear()
         self.last_sent = now
-        self._wall_last_sent = _time.time()
+        self._wall_last_sent = self._wall_now()
         return n, b, img, classes, context_classes
@@ -0,0 +1,84 @@
+"""Box overlap and greedy non-maximum suppression on NumPy arrays.
+
+Used by the CPU detector adapters (raw YOLO output), by tiled inference
+(merging boxes across tiles) and by the SORT tracker (track/detection cost).
+"""
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+IOU = "iou"
+IOS = "ios"
+
+
+def box_overlap(box: np.ndarray, boxes: np.ndarray, metric: str = IOU) -> np.ndarray:
+    """Overlap of one xyxy *box* with each row of *boxes* (IoU, or intersection over the smaller)."""
+    ix1 = np.maximum(box[0], boxes[:, 0])
+    iy1 = np.maximum(box[1], boxes[:, 1])
+    ix2 = np.minimum(box[2], boxes[:, 2])
+    iy2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    if metric == IOS:
+        denom = np.minimum(area, areas)
+    else:
+        denom = area + areas - inter
+    return inter / np.maximum(denom, 1e-9)
+
+
+def nms(
+    xyxy: np.ndarray,
+    conf: np.ndarray,
+    cls: np.ndarray,
+    thresh: float,
+    metric: str = IOU,
+) -> List[np.ndarray]:
+    """Greedy per-class suppression.
+
+    Returns one index array per kept box, highest confidence first; element 0
+    is the kept box and the rest are the boxes it suppressed.
+    """
+    xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+    if not len(xyxy):
+        return []
+    # shift each class to its own region so one pass never matches across classes
+    shift = (np.asarray(cls, dtype=np.float32) * (float(xyxy.max()) + 1.0))[:, None]
+    boxes = xyxy + shift
+    order = np.argsort(-np.asarray(conf), kind="stable")
+    groups = []
+    while order.size:
+        i = order[0]
+        rest = order[1:]
+        hit = box_overlap(boxes[i], boxes[rest], metric) > thresh
+        groups.append(np.concatenate(([i], rest[hit])))
+        order = rest[~hit]
+    return groups
+
+
+def count_unmatched(
+    xyxy: np.ndarray, cls: np.ndarray, ref_xyxy: np.ndarray, ref_cls: np.ndarray, iou: float = 0.5,
+) -> int:
+    """Boxes with no same-class box in the reference set at IoU >= *iou*."""
+    xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+    ref_xyxy = np.asarray(ref_xyxy, dtype=np.float32).reshape(-1, 4)
+    n = 0
+    for box, k in zip(xyxy, cls):
+        same = ref_xyxy[ref_cls == k]
+        if not len(same) or box_overlap(box, same).max() < iou:
+            n += 1
+    return n
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of xyxy boxes: ``(len(a), len(b))``."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)[:, None, :]
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)[None, :, :]
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
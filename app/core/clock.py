@@ -1,5 +1,6 @@
+import threading
 import time
-from typing import Protocol
+from typing import Callable, Optional, Protocol
 
 class Clock(Protocol):
     def now(self) -> float: ...
@@ -8,4 +9,51 @@ class Clock(Protocol):
 class SystemClock:
     def now(self) -> float: return time.time()
     def sleep(self, seconds: float) -> None:
-        if seconds > 0: time.sleep(seconds)
\ No newline at end of file
+        if seconds > 0: time.sleep(seconds)
+    def perf_counter(self) -> float: return time.perf_counter()
+
+def timer_for(clock) -> Callable[[], float]:
+    """Monotonic timer for step latencies that includes the clock's simulated time."""
+    return getattr(clock, "perf_counter", time.perf_counter)
+
+class FastForwardClock:
+    """Virtual clock for replays and benchmarks.
+
+    ``sleep`` advances virtual time immediately, so rate limiting, cooldowns and
+    simulated inference latency cost no wall time; ``speed > 0`` additionally
+    waits ``seconds / speed`` for real (1.0 = real time). Models a single
+    timeline: sleeps from several threads add up rather than overlap.
+
+    ``perf_counter()`` is real elapsed time plus the virtual time skipped by
+    sleeps, so step timers around a simulated delay (e.g. ReplayDetector's
+    inference latency) report that delay.
+    """
+
+    def __init__(self, start: Optional[float] = None, speed: float = 0.0):
+        self._t = time.time() if start is None else float(start)
+        self.speed = float(speed)
+        self._skipped = 0.0  # virtual seconds not spent waiting for real
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._t
+
+    def perf_counter(self) -> float:
+        return time.perf_counter() + self._skipped
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        waited = 0.0
+        if self.speed > 0:
+            waited = seconds / self.speed
+            time.sleep(waited)
+        self._advance(seconds, seconds - waited)
+
+    def advance(self, seconds: float) -> None:
+        self._advance(seconds, seconds)
+
+    def _advance(self, seconds: float, skipped: float) -> None:
+        with self._lock:
+            self._t += seconds
+            self._skipped += max(0.0, skipped)
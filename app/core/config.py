@@ -1,6 +1,10 @@
+import dataclasses
+import logging
 import os
 from dataclasses import dataclass, field
-from typing import Optional, Set
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
 
 def _csv_to_set_str(csv: str) -> Set[str]:
     return {s.strip().lower() for s in csv.split(",") if s.strip()}
@@ -9,16 +13,71 @@ def _csv_to_set_str(csv: str) -> Set[str]:
 class Config:
     # IO
     src: str = os.getenv("SRC", "0")
+    # Decode SRC in a child process and read frames from shared memory (camera_shm.py);
+    # SRC=shm://NAME reads a decoder started elsewhere
+    decode_process: bool = os.getenv("DECODE_PROCESS", "0") not in ("0", "false", "False", "")
+    shm_slots: int = int(os.getenv("SHM_SLOTS", "4"))  # a read frame stays valid for SHM_SLOTS - 1 newer frames
+    # Decode into up to this many recycled frame buffers (frame_pool.py); 0 = a new array per frame
+    frame_pool_size: int = int(os.getenv("FRAME_POOL_SIZE", "8"))
+    # full, or keyframe: decode only keyframes after IDLE_DECODE_AFTER_SEC without presence
+    # (GStreamer RTSP pipeline only, see Cv2Camera.set_decode_mode)
+    idle_decode: str = os.getenv("IDLE_DECODE", "full").strip().lower()
+    idle_decode_after_sec: float = float(os.getenv("IDLE_DECODE_AFTER_SEC", "30"))
+    # Scale frames to this width inside the GStreamer RTSP pipeline (0 = native); with DECODE_DUAL
+    # the full-resolution frame is still converted on demand for alert snapshots and raw frames
+    decode_width: int = int(os.getenv("DECODE_WIDTH", "0"))
+    decode_dual: bool = os.getenv("DECODE_DUAL", "0") not in ("0", "false", "False", "")
     engine: str = os.getenv("YOLO_ENGINE", "yolov8n.engine")
+    # ultralytics (TensorRT / GPU), onnx (ONNX Runtime CPU) or opencv (OpenCV DNN CPU)
+    detector_backend: str = os.getenv("DETECTOR_BACKEND", "ultralytics").strip().lower()
+    detector_threads: int = int(os.getenv("DETECTOR_THREADS", "0"))  # CPU backends; 0 = library default
+    detect_iou: float = float(os.getenv("DETECT_IOU", "0.45"))  # NMS IoU for the CPU backends
     conf_thresh: float = float(os.getenv("CONF_THRESH", "0.80"))
     img_size: int = int(os.getenv("IMG_SIZE", "640"))
+    # Max frames per detect_batch call (engine must be exported with the same batch)
+    detect_batch: int = int(os.getenv("DETECT_BATCH", "1"))
+    # Write every detection result to this JSONL script for replay (detector_replay.py); empty = off
+    detect_record_path: str = os.getenv("DETECT_RECORD_PATH", "").strip()
     vid_stride: int = int(os.getenv("VID_STRIDE", "6"))
+    # Tiled inference (tiling.py): TILE_SIZE px squares at native resolution; 0 = off
+    tile_size: int = int(os.getenv("TILE_SIZE", "0"))
+    tile_overlap: float = float(os.getenv("TILE_OVERLAP", "0.2"))
+    tile_regions: str = os.getenv("TILE_REGIONS", "")  # "x1,y1,x2,y2|..." px or 0..1; empty = whole frame
+    tile_full_frame: bool = os.getenv("TILE_FULL_FRAME", "1") not in ("0", "false", "False", "")
+    tile_merge_thresh: float = float(os.getenv("TILE_MERGE_THRESH", "0.6"))
+    # Detect every k-th frame while tracks exist; tracker predictions in between (needs TRACKER_BACKEND=sort)
+    detect_every: int = int(os.getenv("DETECT_EVERY", "1"))  # 1 = detector on every frame
+    detect_max_shift: float = float(os.getenv("DETECT_MAX_SHIFT", "0.2"))  # box sizes per k frames; 0 = fixed k
+    detect_flow: bool = os.getenv("DETECT_FLOW", "0") not in ("0", "false", "False", "")
     # FPS policy
     base_fps: float = float(os.getenv("BASE_FPS", "2"))
     high_fps: float = float(os.getenv("HIGH_FPS", "0"))  # 0 = uncapped
     boost_arm_frames: int = int(os.getenv("BOOST_ARM_FRAMES", "3"))
     boost_min_sec: float = float(os.getenv("BOOST_MIN_SEC", "2.0"))
     cooldown_sec: float = float(os.getenv("COOLDOWN_SEC", "5.0"))
+    # Closed-loop rate: cap fps / raise stride from measured detect latency (rate_policy.py)
+    rate_adaptive: bool = os.getenv("RATE_ADAPTIVE", "0") not in ("0", "false", "False", "")
+    rate_target_util: float = float(os.getenv("RATE_TARGET_UTIL", "0.7"))
+    rate_latency_budget_ms: float = float(os.getenv("RATE_LATENCY_BUDGET_MS", "0"))  # 0 = off
+    rate_max_load: float = float(os.getenv("RATE_MAX_LOAD", "0"))  # CPU/GPU load 0..1; 0 = off
+    # sleep: RateStep sleeps 1/fps, then reads; arrival: wait on camera frame arrivals up to
+    # that deadline and read the newest (ArrivalRateStep, decodes on a background thread)
+    scheduler_mode: str = os.getenv("SCHEDULER_MODE", "sleep").strip().lower()
+    # Pipeline execution: serial (one thread) or staged (capture / detect / side effects threads)
+    pipeline_mode: str = os.getenv("PIPELINE_MODE", "serial").strip().lower()
+    stage_queue_size: int = int(os.getenv("STAGE_QUEUE_SIZE", "2"))
+    stage_frame_policy: str = os.getenv("STAGE_FRAME_POLICY", "drop_oldest").strip().lower()
+    stage_effects_policy: str = os.getenv("STAGE_EFFECTS_POLICY", "block").strip().lower()
+    # Motion gate: skip inference on frames that barely differ from the last detected one
+    motion_gate: bool = os.getenv("MOTION_GATE", "0") not in ("0", "false", "False", "")
+    motion_threshold: float = float(os.getenv("MOTION_THRESHOLD", "0.005"))  # changed-pixel fraction
+    motion_pixel_delta: int = int(os.getenv("MOTION_PIXEL_DELTA", "15"))  # gray levels
+    motion_force_sec: float = float(os.getenv("MOTION_FORCE_SEC", "5.0"))  # 0 = never force
+    motion_width: int = int(os.getenv("MOTION_WIDTH", "160"))
+    # Zones (zones.py): "x,y;x,y;x,y|..." in pixels or normalized 0..1; empty = whole frame
+    zone_include: str = os.getenv("ZONE_INCLUDE", "")
+    zone_exclude: str = os.getenv("ZONE_EXCLUDE", "")
+    zone_anchor: str = os.getenv("ZONE_ANCHOR", "bottom").strip().lower()
     # Presence & alerts
     trigger_classes: Set[str] = field(
         default_factory=lambda: _csv_to_set_str(os.getenv("TRIGGER_CLASSES", "person"))
@@ -30,11 +89,21 @@ class Config:
     min_persist_sec: float = float(os.getenv("MIN_PERSIST_SEC", "1.0"))
     rearm_sec: float = float(os.getenv("REARM_SEC", "10"))
     rate_window_sec: float = float(os.getenv("RATE_WINDOW_SEC", "5"))
+    # Alert side effects (snapshots, history, Telegram) off the loop thread; 0 = synchronous
+    alert_workers: int = int(os.getenv("ALERT_WORKERS", "2"))
+    alert_queue_size: int = int(os.getenv("ALERT_QUEUE_SIZE", "32"))
     # Min time between any two alerts (stops same person with new track_id from re-triggering)
     alert_cooldown_sec: float = float(os.getenv("ALERT_COOLDOWN_SEC", "0"))  # 0 = use rate_window_sec only
     # Tracker
     tracker_cfg: Optional[str] = os.getenv("TRACKER", "bytetrack.yaml")
     tracker_on: bool = os.getenv("TRACKER_ON", "1") not in ("0", "false", "False", "")
+    # ultralytics = model.track() inside the detector; sort = native tracker after any detector
+    tracker_backend: str = os.getenv("TRACKER_BACKEND", "ultralytics").strip().lower()
+    tracker_iou: float = float(os.getenv("TRACKER_IOU", "0.3"))
+    tracker_max_age: int = int(os.getenv("TRACKER_MAX_AGE", "30"))  # detector passes without a match
+    tracker_min_hits: int = int(os.getenv("TRACKER_MIN_HITS", "3"))
+    tracker_high_conf: float = float(os.getenv("TRACKER_HIGH_CONF", "0.5"))
+    tracker_low_conf: float = float(os.getenv("TRACKER_LOW_CONF", "0.1"))  # detector threshold with a native tracker
     # Telegram (TELEGRAM_* or TG_BOT/TG_CHAT from README)
     tg_token: Optional[str] = os.getenv("TELEGRAM_TOKEN") or os.getenv("TG_BOT")
     tg_chat: Optional[str] = os.getenv("TELEGRAM_CHAT_ID") or os.getenv("TG_CHAT")
@@ -63,3 +132,67 @@ class Config:
     frames_retention_days: int = int(os.getenv("FRAMES_RETENTION_DAYS", "30"))
     capture_active_fps: float = float(os.getenv("CAPTURE_ACTIVE_FPS", "2.0"))
     capture_cooldown_sec: float = float(os.getenv("CAPTURE_COOLDOWN_SEC", "10.0"))
+    # Skip near-duplicate captures (dHash within CAPTURE_DEDUP_DISTANCE bits of 64, same detections)
+    capture_dedup: bool = os.getenv("CAPTURE_DEDUP", "0") not in ("0", "false", "False", "")
+    capture_dedup_distance: int = int(os.getenv("CAPTURE_DEDUP_DISTANCE", "6"))
+    # Pre-roll ring (frame_ring.py): keep the last PREROLL_SEC of frames, saved when an event starts; 0 = off
+    preroll_sec: float = float(os.getenv("PREROLL_SEC", "0"))
+    preroll_fps: float = float(os.getenv("PREROLL_FPS", "2.0"))
+    preroll_width: int = int(os.getenv("PREROLL_WIDTH", "640"))  # 0 = native resolution
+    preroll_jpeg: int = int(os.getenv("PREROLL_JPEG", "0"))  # JPEG quality for slots; 0 = raw pixels
+    # Binary per-detection log (detection_log.py); empty = off
+    detection_log_dir: str = os.getenv("DETECTION_LOG_DIR", "")
+    detection_log_retention_days: int = int(os.getenv("DETECTION_LOG_RETENTION_DAYS", "30"))  # 0 = keep all
+    # Multi-camera host (app.app.run_multi): "name=src,name=src" or plain "src,src"
+    srcs: str = os.getenv("SRCS", "")
+    multi_cam_schedule: str = os.getenv("MULTI_CAM_SCHEDULE", "round_robin").strip().lower()
+
+
+def _coerce_like(current, raw: str):
+    if isinstance(current, bool):
+        return raw not in ("0", "false", "False", "")
+    if isinstance(current, int):
+        return int(raw)
+    if isinstance(current, float):
+        return float(raw)
+    if isinstance(current, set):
+        return _csv_to_set_str(raw)
+    return raw
+
+
+# Settings of the one detector every camera shares (run_multi); per-camera overrides are ignored
+SHARED_FIELDS = ("engine", "detector_backend", "detector_threads", "detect_iou", "img_size", "detect_batch")
+
+
+def camera_configs(cfg: Config) -> Dict[str, Config]:
+    """Split SRCS into one Config per camera.
+
+    Each camera gets its own snapshot directory (``SAVE_DIR/<name>``). Any field
+    except the shared detector's (``SHARED_FIELDS``) can be overridden per
+    camera with ``CAM_<NAME>_<FIELD>``, e.g. ``CAM_DRIVEWAY_BASE_FPS=1`` or
+    ``CAM_DOOR_TRIGGER_CLASSES=person,dog``.
+    """
+    entries = [e.strip() for e in cfg.srcs.split(",") if e.strip()] or [cfg.src]
+    out: Dict[str, Config] = {}
+    for i, entry in enumerate(entries):
+        name, sep, src = entry.partition("=")
+        if not sep or "://" in name:
+            name, src = f"cam{i}", entry
+        name = name.strip().lower()
+        cam_cfg = dataclasses.replace(
+            cfg,
+            src=src.strip(),
+            save_dir=os.path.join(cfg.save_dir, name),
+            raw_frames_dir=os.path.join(cfg.raw_frames_dir, name),
+            trigger_classes=set(cfg.trigger_classes),
+            draw_classes=set(cfg.draw_classes),
+        )
+        prefix = f"CAM_{name.upper()}_"
+        for f in dataclasses.fields(Config):
+            raw = os.getenv(prefix + f.name.upper())
+            if raw is not None and f.name in SHARED_FIELDS:
+                logger.warning("Ignoring %s%s: all cameras share one detector", prefix, f.name.upper())
+            elif raw is not None:
+                setattr(cam_cfg, f.name, _coerce_like(getattr(cam_cfg, f.name), raw))
+        out[name] = cam_cfg
+    return out
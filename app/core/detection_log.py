@@ -0,0 +1,214 @@
+"""Append-only binary log of every detection the pipeline produced.
+
+Records are fixed-width (``RECORD_DTYPE``, 30 bytes, little-endian, no header)
+and go to one file per UTC hour::
+
+    <log_dir>/detections[-<source>]-YYYYMMDDTHH.v1.bin
+
+so any file can be opened with ``numpy.memmap(path, dtype=RECORD_DTYPE)``.
+A torn record at the end of a file (crash mid-write) is ignored by the reader,
+and cut off by the writer before it appends to that file again. With
+*retention_days* set, the writer deletes its source's files older than that
+whenever it starts a new file.
+"""
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .ports import Detection, DetectionBatch
+
+logger = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),       # frame timestamp (epoch seconds)
+        ("frame", "<u4"),   # frame index
+        ("x1", "<i2"),
+        ("y1", "<i2"),
+        ("x2", "<i2"),
+        ("y2", "<i2"),
+        ("conf", "<f4"),
+        ("cls_id", "<u2"),
+        ("track_id", "<i4"),  # -1 = untracked
+    ]
+)
+_SUFFIX = ".v1.bin"
+_HOUR_FMT = "%Y%m%dT%H"
+
+
+def _prefix(source: str) -> str:
+    return f"detections-{source}" if source else "detections"
+
+
+def log_path(log_dir: str, hour: int, source: str = "") -> str:
+    """File for the UTC hour ``hour`` (= int(epoch // 3600))."""
+    stamp = datetime.fromtimestamp(hour * 3600, tz=timezone.utc).strftime(_HOUR_FMT)
+    return os.path.join(log_dir, f"{_prefix(source)}-{stamp}{_SUFFIX}")
+
+
+class DetectionLog:
+    """Buffered writer; records are flushed when the buffer fills, every
+    *flush_sec* of frame time, on hour rotation and on close()."""
+
+    def __init__(self, log_dir: str, source: str = "", buffer_records: int = 4096, flush_sec: float = 5.0,
+                 retention_days: int = 0):
+        self.log_dir = log_dir
+        self.source = source
+        self.retention_days = int(retention_days)  # 0 = keep every file
+        self._path: Optional[str] = None  # file whose tail has been checked
+        os.makedirs(log_dir, exist_ok=True)
+        self._buf = np.zeros(max(1, int(buffer_records)), dtype=RECORD_DTYPE)
+        self._n = 0
+        self._hour: Optional[int] = None
+        self._flush_sec = float(flush_sec)
+        self._last_flush_t: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def append(self, t: float, frame_index: int, dets: Sequence[Detection]) -> None:
+        if not dets:
+            if self._n:
+                with self._lock:  # quiet period: buffered records still go out every flush_sec
+                    self._flush_due_locked(t)
+            return
+        with self._lock:
+            hour = int(t // 3600)
+            if self._hour is not None and hour != self._hour:
+                self._flush_locked()
+            self._hour = hour
+            batch = DetectionBatch.from_detections(dets)
+            for start in range(0, len(batch), len(self._buf)):
+                part = batch.select(slice(start, start + len(self._buf)))
+                if self._n + len(part) > len(self._buf):
+                    self._flush_locked()
+                rows = self._buf[self._n : self._n + len(part)]
+                rows["t"] = t
+                rows["frame"] = frame_index
+                for j, col in enumerate(("x1", "y1", "x2", "y2")):
+                    rows[col] = part.xyxy[:, j]
+                rows["conf"] = part.conf
+                rows["cls_id"] = part.cls_id
+                rows["track_id"] = part.track_id
+                self._n += len(part)
+            self._flush_due_locked(t)
+
+    def _flush_due_locked(self, t: float) -> None:
+        if self._last_flush_t is None:
+            self._last_flush_t = t
+        elif t - self._last_flush_t >= self._flush_sec:
+            self._flush_locked()
+            self._last_flush_t = t
+
+    def _flush_locked(self) -> None:
+        if self._n == 0 or self._hour is None:
+            return
+        path = log_path(self.log_dir, self._hour, self.source)
+        if path != self._path:
+            self._start_file(path)
+        with open(path, "ab") as fh:
+            fh.write(self._buf[: self._n].tobytes())
+        self._n = 0
+
+    def _start_file(self, path: str) -> None:
+        """First write to *path* from this writer: drop a torn tail, prune old files."""
+        self._path = path
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        torn = size % RECORD_DTYPE.itemsize
+        if torn:
+            logger.warning("Dropping %d bytes of a torn record at the end of %s", torn, path)
+            os.truncate(path, size - torn)
+        if self.retention_days > 0:
+            self.cleanup(self.retention_days, now=self._hour * 3600.0)
+
+    def cleanup(self, max_age_days: int, now: Optional[float] = None) -> int:
+        """Delete this source's hourly files older than *max_age_days*. Returns the count."""
+        cutoff = (time.time() if now is None else now) - max_age_days * 86400
+        deleted = 0
+        for path in log_files(self.log_dir, self.source, end=cutoff // 3600 * 3600):  # hours over by cutoff
+            try:
+                os.remove(path)
+                deleted += 1
+            except OSError:
+                logger.debug("Could not remove detection log: %s", path)
+        if deleted:
+            logger.info("Detection log cleanup: removed %d files older than %d days", deleted, max_age_days)
+        return deleted
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self.flush()
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def open_log(path: str) -> np.ndarray:
+    """Memory-map one hourly file (read-only). Empty files give an empty array."""
+    n = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if n == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(n,))
+
+
+def log_files(log_dir: str, source: str = "", start: Optional[float] = None,
+              end: Optional[float] = None) -> List[str]:
+    """Hourly files of *source* overlapping [start, end), oldest first."""
+    prefix = _prefix(source)
+    out = []
+    for path in sorted(glob.glob(os.path.join(log_dir, f"{prefix}-*{_SUFFIX}"))):
+        stamp = os.path.basename(path)[len(prefix) + 1 : -len(_SUFFIX)]
+        try:
+            t0 = datetime.strptime(stamp, _HOUR_FMT).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue  # another source whose name extends this prefix
+        if (start is None or t0 + 3600 > start) and (end is None or t0 < end):
+            out.append(path)
+    return out
+
+
+def read_detections(log_dir: str, source: str = "", start: Optional[float] = None,
+                    end: Optional[float] = None) -> np.ndarray:
+    """All records of *source* with ``start <= t < end`` as one structured array."""
+    parts = []
+    for path in log_files(log_dir, source, start, end):
+        rec = open_log(path)
+        mask = np.ones(len(rec), dtype=bool)
+        if start is not None:
+            mask &= rec["t"] >= start
+        if end is not None:
+            mask &= rec["t"] < end
+        parts.append(np.asarray(rec[mask]))
+    if not parts:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.concatenate(parts)
+
+
+def to_script(records: np.ndarray) -> Dict[int, List[Detection]]:
+    """Group records by frame index, e.g. for ``ReplayDetector``."""
+    script: Dict[int, List[Detection]] = {}
+    for r in records:
+        tid = int(r["track_id"])
+        script.setdefault(int(r["frame"]), []).append(
+            Detection(
+                xyxy=(int(r["x1"]), int(r["y1"]), int(r["x2"]), int(r["y2"])),
+                conf=float(r["conf"]),
+                cls_id=int(r["cls_id"]),
+                track_id=None if tid < 0 else tid,
+            )
+        )
+    return script
+
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Sequence, Optional
+from typing import Dict, Sequence, Optional
 from .ports import Detection
 
 @dataclass
@@ -21,3 +21,5 @@ class AlertIssued:
     count: int
     best_conf: float
     image_path: Optional[str]
+    # wall-clock stamps of the originating frame per stage (latency.STAGES)
+    timings: Optional[Dict[str, float]] = None
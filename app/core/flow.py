@@ -0,0 +1,80 @@
+"""Sparse optical flow for boxes on frames the detector skips (DETECT_FLOW).
+
+The Kalman prediction of a track assumes constant velocity; a person who
+stops or turns between detector passes drifts away from the box.
+``BoxFlow`` keeps a small grayscale copy of the last frame and the boxes
+shown on it, picks corner features inside each box, follows them into the
+new frame with pyramidal Lucas-Kanade and moves the box by the median
+feature shift. Boxes with too few tracked features keep their prediction.
+All features of all boxes go through one ``calcOpticalFlowPyrLK`` call.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ports import DetectionBatch, Frame
+
+
+class BoxFlow:
+    def __init__(self, width: int = 320, max_corners: int = 20, min_points: int = 3):
+        self.width = int(width)
+        self.max_corners = int(max_corners)
+        self.min_points = int(min_points)
+        self._gray: Optional[np.ndarray] = None
+        self._scale = 1.0
+        self._boxes: Dict[int, np.ndarray] = {}  # track id -> xyxy on the remembered frame
+
+    def _small_gray(self, frame: Frame) -> Tuple[np.ndarray, float]:
+        gray = frame.scaled(self.width, gray=True)
+        return gray, gray.shape[1] / float(frame.image.shape[1])
+
+    def observe(self, frame: Frame, dets: DetectionBatch) -> None:
+        """Remember *frame* and the tracked boxes shown on it."""
+        self._gray, self._scale = self._small_gray(frame)
+        keep = dets.track_id >= 0
+        self._boxes = dict(zip(dets.track_id[keep].tolist(), dets.xyxy[keep].astype(np.float32)))
+
+    def refine(self, frame: Frame, preds: DetectionBatch) -> DetectionBatch:
+        """Replace predicted boxes by flow-shifted previous boxes where enough features track."""
+        if self._gray is None or not len(preds):
+            return preds
+        gray, scale = self._small_gray(frame)
+        if gray.shape != self._gray.shape:
+            return preds
+        points, owner = [], []
+        for i, tid in enumerate(preds.track_id.tolist()):
+            box = self._boxes.get(tid)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = np.round(box * self._scale).astype(int)
+            x1, y1 = max(x1, 0), max(y1, 0)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                continue
+            mask = np.zeros_like(self._gray)
+            mask[y1:y2, x1:x2] = 255
+            pts = cv2.goodFeaturesToTrack(
+                self._gray, self.max_corners, qualityLevel=0.01, minDistance=3, mask=mask,
+            )
+            if pts is None:
+                continue
+            points.append(pts.reshape(-1, 2))
+            owner.extend([i] * len(pts))
+        if not points:
+            return preds
+        p0 = np.concatenate(points).astype(np.float32)
+        p1, status, _ = cv2.calcOpticalFlowPyrLK(self._gray, gray, p0.reshape(-1, 1, 2), None)
+        ok = status.reshape(-1) == 1
+        shift = (p1.reshape(-1, 2) - p0) / scale
+        owner = np.asarray(owner)
+        xyxy = preds.xyxy.astype(np.float32)
+        for i in np.unique(owner[ok]).tolist():
+            sel = ok & (owner == i)
+            if sel.sum() < self.min_points:
+                continue
+            dx, dy = np.median(shift[sel], axis=0)
+            xyxy[i] = self._boxes[int(preds.track_id[i])] + np.array([dx, dy, dx, dy], np.float32)
+        xyxy = np.clip(xyxy, 0, [frame.w, frame.h, frame.w, frame.h])
+        return DetectionBatch(np.round(xyxy), preds.conf, preds.cls_id, preds.track_id)
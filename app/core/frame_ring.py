@@ -0,0 +1,127 @@
+"""Pre-roll ring buffer: the last few seconds of camera frames (PREROLL_SEC).
+
+FrameCaptureStep only starts saving once a trigger class is detected, so
+the seconds before (the person walking up) would be lost. The camera
+pushes every frame it decodes into a ``FrameRing``; the ring keeps at most
+``fps`` of them per second, ``seconds`` long, in a fixed number of slots
+allocated once and reused, and FrameCaptureStep drains it when an event
+starts.
+
+Slots hold either raw BGR images, resized straight into the slot (or
+copied from the frame's pyramid level when another consumer already
+computed that width), or, with ``jpeg_quality`` > 0, JPEG bytes copied into
+per-slot buffers that only grow. ``nbytes`` is the memory held by the
+slots, reported as the ``preroll_bytes`` gauge.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ports import Frame
+from .pyramid import scaled_size
+
+
+class FrameRing:
+    def __init__(self, seconds: float, fps: float = 2.0, width: int = 0, jpeg_quality: int = 0):
+        if seconds <= 0 or fps <= 0:
+            raise ValueError("pre-roll needs seconds > 0 and fps > 0")
+        self.capacity = max(1, int(math.ceil(seconds * fps)))
+        self.interval = 1.0 / fps
+        self.width = int(width)
+        self.jpeg_quality = int(jpeg_quality)
+        self._lock = threading.Lock()
+        self._t = np.zeros(self.capacity)
+        self._images: Optional[np.ndarray] = None  # (capacity, h, w, 3), raw mode
+        self._jpeg: List[bytearray] = [bytearray() for _ in range(self.capacity)]
+        self._jpeg_len = np.zeros(self.capacity, dtype=np.int64)
+        self._head = 0  # next slot to write
+        self._count = 0
+        self._last_t = -math.inf
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        if self.jpeg_quality > 0:
+            return sum(len(b) for b in self._jpeg)
+        return 0 if self._images is None else int(self._images.nbytes)
+
+    def _size(self, frame: Frame) -> Tuple[int, int]:
+        if self.width <= 0 or frame.w <= self.width:
+            return frame.w, frame.h
+        return scaled_size(frame.w, frame.h, self.width)
+
+    def push(self, frame: Frame) -> bool:
+        """Record *frame* if ``1 / fps`` has passed since the last one. True if stored."""
+        if frame.t - self._last_t < 0.9 * self.interval:  # 10% slack for camera timestamp jitter
+            return False
+        w, h = self._size(frame)
+        scaled = (w, h) != (frame.w, frame.h)
+        buf = None
+        if self.jpeg_quality > 0:
+            # shared with other consumers of this size (pyramid.py)
+            img = frame.scaled(w) if scaled else frame.image
+            ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                return False
+        with self._lock:
+            i = self._head
+            if buf is not None:
+                n = len(buf)
+                if len(self._jpeg[i]) < n:
+                    self._jpeg[i].extend(bytes(n - len(self._jpeg[i])))
+                with memoryview(self._jpeg[i]) as view:
+                    view[:n] = buf.reshape(-1)
+                self._jpeg_len[i] = n
+            else:
+                if self._images is None or self._images.shape[1:3] != (h, w):
+                    # first frame, or the stream changed resolution: start over
+                    self._images = np.empty((self.capacity, h, w, 3), dtype=np.uint8)
+                    self._count = 0
+                level = frame.cached_scaled(w) if scaled else frame.image
+                if level is not None:
+                    np.copyto(self._images[i], level)
+                else:  # nobody else needs this size: resize straight into the slot
+                    cv2.resize(frame.image, (w, h), dst=self._images[i], interpolation=cv2.INTER_AREA)
+            self._t[i] = frame.t
+            self._head = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._last_t = frame.t
+        return True
+
+    def drain(self, before: Optional[float] = None) -> List[Tuple[float, np.ndarray]]:
+        """Oldest-first ``(t, image)`` copies of the buffered frames (``t < before``); empties the ring."""
+        return [(t, self.decode(data)) for t, data in self.snapshot(before)]
+
+    def snapshot(self, before: Optional[float] = None) -> List[Tuple[float, np.ndarray]]:
+        """Like :meth:`drain` but without decoding: JPEG slots are returned as encoded bytes.
+
+        Only copies, so it is cheap enough for the frame loop; pass each entry
+        to :meth:`decode` later, e.g. on a worker thread.
+        """
+        with self._lock:
+            start = (self._head - self._count) % self.capacity
+            order = [(start + k) % self.capacity for k in range(self._count)]
+            out = []
+            for i in order:
+                t = float(self._t[i])
+                if before is not None and t >= before:
+                    continue
+                if self.jpeg_quality > 0:
+                    data = np.frombuffer(self._jpeg[i], dtype=np.uint8, count=int(self._jpeg_len[i]))
+                    out.append((t, data.copy()))
+                else:
+                    out.append((t, self._images[i].copy()))
+            self._count = 0
+        return out
+
+    @staticmethod
+    def decode(data: np.ndarray) -> np.ndarray:
+        """Image of a :meth:`snapshot` entry (JPEG bytes are 1-D)."""
+        return cv2.imdecode(data, cv2.IMREAD_COLOR) if data.ndim == 1 else data
@@ -5,13 +5,16 @@ import logging
 import os
 import shutil
 import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Sequence, Set
+from typing import Dict, List, Optional, Sequence
 
 import cv2
 
+from .ports import best_conf as _best_conf, class_ids
+
 logger = logging.getLogger(__name__)
 
 _UTC_FMT = "%Y-%m-%dT%H:%M:%S"
@@ -25,16 +28,23 @@ class FrameRecord:
     detection_classes: tuple[str, ...]
     detection_count: int
     best_conf: float
+    # later capture candidates folded into this frame as near-duplicates
+    repeat_count: int = 0
 
 
 class FrameStore:
-    """Saves captured frames to disk and indexes metadata in SQLite."""
+    """Saves captured frames to disk and indexes metadata in SQLite.
+
+    Writes may come from several threads (the frame loop, pre-roll saves on
+    the alert workers, cleanup); they share one connection under a lock.
+    """
 
     def __init__(self, frames_dir: str, db_path: str | None = None):
         self.frames_dir = frames_dir
         os.makedirs(frames_dir, exist_ok=True)
         self.db_path = db_path or os.path.join(frames_dir, "frame_index.db")
         self._conn: sqlite3.Connection | None = None
+        self._write_lock = threading.Lock()
         self._init_db()
 
     def _get_conn(self) -> sqlite3.Connection:
@@ -55,9 +65,13 @@ class FrameStore:
                 has_detection INTEGER NOT NULL DEFAULT 0,
                 detection_classes TEXT NOT NULL DEFAULT '[]',
                 detection_count INTEGER NOT NULL DEFAULT 0,
-                best_conf REAL NOT NULL DEFAULT 0.0
+                best_conf REAL NOT NULL DEFAULT 0.0,
+                repeat_count INTEGER NOT NULL DEFAULT 0
             )
         """)
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(frames)").fetchall()}
+        if "repeat_count" not in cols:
+            conn.execute("ALTER TABLE frames ADD COLUMN repeat_count INTEGER NOT NULL DEFAULT 0")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_frames_ts ON frames(ts)")
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_frames_det ON frames(has_detection, ts)"
@@ -71,14 +85,20 @@ class FrameStore:
         detections: Sequence | None = None,
         class_names_by_id: Dict[int, str] | None = None,
         jpeg_quality: int = 80,
+        source: str = "",
     ) -> str:
-        """Write a JPEG to disk and index it. Returns the absolute image path."""
+        """Write a JPEG to disk and index it. Returns the absolute image path.
+
+        *source* (camera name) is appended to the file name so several cameras
+        can share one store without colliding on the same millisecond.
+        """
         dt = datetime.fromtimestamp(ts, tz=timezone.utc)
         ts_iso = dt.strftime(_UTC_FMT)
 
         day_dir = os.path.join(self.frames_dir, dt.strftime("%Y-%m-%d"), dt.strftime("%H"))
         os.makedirs(day_dir, exist_ok=True)
-        fname = dt.strftime("%M-%S") + f"-{int(ts * 1000) % 1000:03d}.jpg"
+        suffix = f"-{source}" if source else ""
+        fname = dt.strftime("%M-%S") + f"-{int(ts * 1000) % 1000:03d}{suffix}.jpg"
         img_path = os.path.join(day_dir, fname)
 
         cv2.imwrite(img_path, image, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
@@ -88,31 +108,42 @@ class FrameStore:
         best_conf = 0.0
         if detections:
             names_map = class_names_by_id or {}
-            cls_set: Set[str] = set()
-            for d in detections:
-                cls_set.add(names_map.get(d.cls_id, f"class_{d.cls_id}"))
-                if d.conf > best_conf:
-                    best_conf = d.conf
-            det_classes = sorted(cls_set)
+            det_classes = sorted({names_map.get(k, f"class_{k}") for k in class_ids(detections)})
+            best_conf = max(0.0, _best_conf(detections))
             det_count = len(detections)
 
         has_det = 1 if det_count > 0 else 0
         classes_json = json.dumps(det_classes)
 
         conn = self._get_conn()
-        conn.execute(
-            "INSERT INTO frames(ts, path, has_detection, detection_classes, detection_count, best_conf) "
-            "VALUES(?, ?, ?, ?, ?, ?)",
-            (ts_iso, img_path, has_det, classes_json, det_count, best_conf),
-        )
-        conn.commit()
+        with self._write_lock:
+            conn.execute(
+                "INSERT INTO frames(ts, path, has_detection, detection_classes, detection_count, best_conf) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                (ts_iso, img_path, has_det, classes_json, det_count, best_conf),
+            )
+            conn.commit()
 
         return img_path
 
+    def add_repeats(self, path: str, ts: float, count: int) -> None:
+        """Count *count* skipped near-duplicates against the frame saved at (*ts*, *path*)."""
+        if count <= 0:
+            return
+        ts_iso = datetime.fromtimestamp(ts, tz=timezone.utc).strftime(_UTC_FMT)
+        conn = self._get_conn()
+        with self._write_lock:
+            conn.execute(
+                "UPDATE frames SET repeat_count = repeat_count + ? WHERE ts = ? AND path = ?",
+                (count, ts_iso, path),
+            )
+            conn.commit()
+
     def query_range(self, start_utc: str, end_utc: str) -> List[FrameRecord]:
         conn = self._get_conn()
         rows = conn.execute(
-            "SELECT ts, path, has_detection, detection_classes, detection_count, best_conf "
+            "SELECT ts, path, has_detection, detection_classes, detection_count, best_conf, "
+            "repeat_count "
             "FROM frames WHERE ts >= ? AND ts < ? ORDER BY ts ASC",
             (start_utc, end_utc),
         ).fetchall()
@@ -124,7 +155,8 @@ class FrameStore:
         pattern = f'%"{class_name}"%'
         conn = self._get_conn()
         rows = conn.execute(
-            "SELECT ts, path, has_detection, detection_classes, detection_count, best_conf "
+            "SELECT ts, path, has_detection, detection_classes, detection_count, best_conf, "
+            "repeat_count "
             "FROM frames WHERE ts >= ? AND ts < ? AND detection_classes LIKE ? ORDER BY ts ASC",
             (start_utc, end_utc, pattern),
         ).fetchall()
@@ -154,8 +186,9 @@ class FrameStore:
             except OSError:
                 logger.debug("Could not remove frame file: %s", row["path"])
             deleted += 1
-        conn.execute("DELETE FROM frames WHERE ts < ?", (cutoff_iso,))
-        conn.commit()
+        with self._write_lock:
+            conn.execute("DELETE FROM frames WHERE ts < ?", (cutoff_iso,))
+            conn.commit()
 
         self._cleanup_empty_dirs()
         logger.info("Frame cleanup: removed %d frames older than %d days", deleted, max_age_days)
@@ -192,4 +225,5 @@ def _row_to_record(row: sqlite3.Row) -> FrameRecord:
         detection_classes=_parse_classes(row["detection_classes"]),
         detection_count=int(row["detection_count"]),
         best_conf=float(row["best_conf"]),
+        repeat_count=int(row["repeat_count"]),
     )
@@ -0,0 +1,112 @@
+"""Constant-memory latency histograms with percentile queries.
+
+Buckets are log-spaced (``buckets_per_decade`` per power of ten between
+``min_ms`` and ``max_ms``), so relative error is bounded (~6% at 20/decade)
+no matter how many samples are recorded.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (50.0, 95.0, 99.0)
+
+
+class LatencyHistogram:
+    def __init__(self, min_ms: float = 0.01, max_ms: float = 120_000.0, buckets_per_decade: int = 20):
+        self.min_ms = float(min_ms)
+        self.max_ms = float(max_ms)
+        self._per_decade = int(buckets_per_decade)
+        n = int(math.ceil(math.log10(self.max_ms / self.min_ms) * self._per_decade)) + 1
+        # upper edge of every bucket; bucket 0 also holds everything <= min_ms
+        self._edges = self.min_ms * 10.0 ** (np.arange(n) / self._per_decade)
+        self._counts = np.zeros(n, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_ms:
+            return 0
+        idx = int(math.ceil(math.log10(value / self.min_ms) * self._per_decade))
+        return min(idx, len(self._counts) - 1)
+
+    def record(self, value: float) -> None:
+        value = max(0.0, float(value))
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> float:
+        """Upper bucket edge below which *p* percent of samples fall (0 when empty)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * p / 100.0)))
+        idx = int(np.searchsorted(np.cumsum(self._counts), rank))
+        return float(min(self._edges[idx], self.max))
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        self._counts[:] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class HistogramRegistry:
+    """Thread-safe name -> LatencyHistogram map."""
+
+    def __init__(self, **hist_kwargs):
+        self._hists: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._hist_kwargs = hist_kwargs
+
+    def record(self, name: str, value: float) -> None:
+        with self._lock:
+            h = self._hists.get(name)
+            if h is None:
+                h = self._hists[name] = LatencyHistogram(**self._hist_kwargs)
+            h.record(value)
+
+    def get(self, name: str) -> Optional[LatencyHistogram]:
+        return self._hists.get(name)
+
+    def percentiles(self, name: str, ps: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[float, float]:
+        with self._lock:
+            h = self._hists.get(name)
+            return {p: (h.percentile(p) if h else 0.0) for p in ps}
+
+    def snapshot(self, ps: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """``{name: {"count", "mean", "max", "p50", ...}}`` for every histogram."""
+        ps = tuple(ps)
+        with self._lock:
+            out: Dict[str, Dict[str, float]] = {}
+            for name, h in sorted(self._hists.items()):
+                row = {"count": float(h.count), "mean": h.mean(), "max": h.max}
+                row.update({f"p{p:g}": h.percentile(p) for p in ps})
+                out[name] = row
+            return out
+
+    def summary(self, ps: Iterable[float] = DEFAULT_PERCENTILES) -> str:
+        """One compact line: ``name n=.. p50/p95/p99=a/b/c`` per histogram."""
+        ps = tuple(ps)
+        label = "/".join(f"p{p:g}" for p in ps)
+        parts = []
+        for name, row in self.snapshot(ps).items():
+            if not row["count"]:
+                continue
+            vals = "/".join(f"{row[f'p{p:g}']:.1f}" for p in ps)
+            parts.append(f"{name} n={int(row['count'])} {label}={vals}")
+        return "; ".join(parts)
+
+    def reset(self) -> None:
+        with self._lock:
+            for h in self._hists.values():
+                h.reset()
@@ -0,0 +1,101 @@
+"""Glass-to-alert latency: wall-clock stamps from frame capture to alert delivery.
+
+A :class:`LatencyTrace` rides along with each frame (``Ctx.trace``) and is
+stamped as the frame moves through the pipeline. The frame that arms an alert
+window keeps its trace until the window is delivered, so an alert carries the
+stamps of the frame that caused it. Stages, in order:
+
+``capture``  frame existed (stream PTS mapped to wall time, else read time)
+``read``     frame returned by the camera
+``detect``   detections (and tracking) done
+``presence`` presence confirmed on this frame (optional)
+``armed``    frame opened an alert window
+``flush``    window flushed by AlertPolicy
+``history``  alert inserted into the history DB (optional)
+``sent``     sink delivery returned
+
+:func:`record_trace` reports each gap as ``latency_<stage>_ms`` plus the total
+``latency_glass_to_alert_ms``; the histogram telemetry wrapper turns those into
+p50/p95/p99.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .ports import Telemetry
+
+STAGES = ("capture", "read", "detect", "presence", "armed", "flush", "history", "sent")
+
+
+def wall_now() -> float:
+    return time.time()
+
+
+class LatencyTrace:
+    __slots__ = ("stamps",)
+
+    def __init__(self, capture_t: Optional[float] = None, read_t: Optional[float] = None):
+        read_t = wall_now() if read_t is None else read_t
+        self.stamps: Dict[str, float] = {
+            "capture": read_t if capture_t is None else min(capture_t, read_t),
+            "read": read_t,
+        }
+
+    def mark(self, stage: str, t: Optional[float] = None) -> None:
+        self.stamps[stage] = wall_now() if t is None else t
+
+    def stages_ms(self) -> List[Tuple[str, float]]:
+        """(stage, ms since the previous stamped stage) in pipeline order."""
+        out = []
+        prev = None
+        for stage in STAGES:
+            t = self.stamps.get(stage)
+            if t is None:
+                continue
+            if prev is not None:
+                out.append((stage, max(0.0, (t - prev) * 1000.0)))
+            prev = t
+        return out
+
+    def total_ms(self) -> float:
+        last = max(self.stamps.values())
+        return max(0.0, (last - self.stamps["capture"]) * 1000.0)
+
+
+def record_trace(telemetry: Telemetry, trace: LatencyTrace) -> None:
+    for stage, ms in trace.stages_ms():
+        telemetry.time_ms(f"latency_{stage}_ms", ms)
+    telemetry.time_ms("latency_glass_to_alert_ms", trace.total_ms())
+
+
+class PtsClock:
+    """Map stream presentation timestamps (ms) to wall-clock capture times.
+
+    The offset ``received - pts`` is smallest for the frame that reached us
+    with the least delay; that minimum anchors the stream timeline, and every
+    frame's capture time is ``anchor + pts``. The anchor may creep up by
+    ``drift`` seconds per second so a camera clock running slower than ours
+    does not slowly inflate latency. A PTS jump backwards (reconnect, file
+    loop) resets the anchor.
+    """
+
+    def __init__(self, drift: float = 1e-4):
+        self.drift = float(drift)
+        self._offset: Optional[float] = None
+        self._last_pts: Optional[float] = None
+        self._last_received = 0.0
+
+    def capture_time(self, pts_ms: Optional[float], received: float) -> float:
+        if pts_ms is None or pts_ms <= 0:
+            return received
+        pts = pts_ms / 1000.0
+        offset = received - pts
+        if self._offset is None or self._last_pts is None or pts < self._last_pts:
+            self._offset = offset
+        else:
+            creep = (received - self._last_received) * self.drift
+            self._offset = min(offset, self._offset + creep)
+        self._last_pts = pts
+        self._last_received = received
+        return self._offset + pts
@@ -0,0 +1,207 @@
+"""Host several camera pipelines on one shared detector.
+
+Each camera keeps its own ``Pipeline`` (PresenceState, RatePolicy, AlertPolicy,
+FrameCaptureStep, ...). A capture thread per camera runs that pipeline's
+capture steps into a one-slot ``drop_oldest`` queue, and a single scheduler
+loop picks the next ready camera and runs its detection and side-effect steps.
+The detector is therefore only ever called from one thread, and time that one
+camera would spend sleeping in RateStep is used to serve the others.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .pipeline import Ctx, Pipeline
+from .ports import Frame, Telemetry, detect_frames
+from .stages import DROP_OLDEST, StageQueue
+from .state import PresenceState
+from .tiling import TiledDetector
+
+ROUND_ROBIN = "round_robin"
+PRIORITY = "priority"
+SCHEDULES = (ROUND_ROBIN, PRIORITY)
+
+
+class CameraTelemetry(Telemetry):
+    """Adds a ``camera=<name>`` tag to every metric of one camera pipeline."""
+
+    def __init__(self, inner: Telemetry, camera: str):
+        self._inner = inner
+        self._camera = camera
+
+    def incr(self, name: str, value: int = 1, **tags):
+        self._inner.incr(name, value, camera=self._camera, **tags)
+
+    def gauge(self, name: str, value: float, **tags):
+        self._inner.gauge(name, value, camera=self._camera, **tags)
+
+    def time_ms(self, name: str, value: float, **tags):
+        self._inner.time_ms(name, value, camera=self._camera, **tags)
+
+
+def _scaled(fn: Callable[[float], None], factor: float, ms: float) -> None:
+    fn(ms * factor)
+
+
+@dataclass
+class _CameraSlot:
+    name: str
+    pipeline: Pipeline
+    queue: StageQueue
+    state: PresenceState = field(default_factory=PresenceState)
+    served: int = 0
+
+
+@dataclass
+class MultiCameraHost:
+    """Round-robin or priority (present cameras first) scheduler over N pipelines.
+
+    With ``batch_size > 1`` up to that many ready cameras are detected in one
+    ``detect_batch`` call on the shared detector.
+    """
+
+    pipelines: Dict[str, Pipeline]
+    telemetry: Telemetry
+    schedule: str = ROUND_ROBIN
+    batch_size: int = 1
+
+    def __post_init__(self):
+        if self.schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule {self.schedule!r}; expected one of {SCHEDULES}")
+        self._ready = threading.Event()
+        self._slots: List[_CameraSlot] = [
+            _CameraSlot(
+                name=name,
+                pipeline=pipe,
+                queue=StageQueue(
+                    f"camera_{name}", 1, DROP_OLDEST, pipe.telemetry, notify=self._ready
+                ),
+            )
+            for name, pipe in self.pipelines.items()
+        ]
+        self._next = 0
+        # The detector is shared: an adaptive rate policy should budget its
+        # camera's share, so report latency as if every camera paid for all.
+        for slot in self._slots:
+            step = slot.pipeline.detect_step
+            if step.on_latency is not None:
+                step.on_latency = partial(_scaled, step.on_latency, float(len(self._slots)))
+
+    def _pick_many(self, limit: int) -> List[Tuple[_CameraSlot, Ctx]]:
+        """Take up to *limit* contexts, at most one per camera, in schedule order."""
+        picked: List[Tuple[_CameraSlot, Ctx]] = []
+        for _ in range(min(limit, len(self._slots))):
+            item = self._pick(exclude={id(s) for s, _ in picked})
+            if item is None:
+                break
+            picked.append(item)
+        return picked
+
+    def _detect(self, picked: List[Tuple[_CameraSlot, Ctx]]) -> List[Tuple[_CameraSlot, Ctx]]:
+        # motion-gated and interpolated frames need no detector pass; batch the rest
+        skip = [ctx.skip_detect or slot.pipeline.detect_step.interpolates() for slot, ctx in picked]
+        gated = [(slot, slot.pipeline.detect_step.run(ctx)) for (slot, ctx), s in zip(picked, skip) if s]
+        picked = [(slot, ctx) for (slot, ctx), s in zip(picked, skip) if not s]
+        if len(picked) <= 1:
+            return gated + [(slot, slot.pipeline.detect_step.run(ctx)) for slot, ctx in picked]
+        detector = picked[0][0].pipeline.detector
+        # tiled cameras contribute all their tiles to the same batch
+        frames: List[Frame] = []
+        spans: List[Tuple[int, int]] = []
+        for slot, ctx in picked:
+            det = slot.pipeline.detect_step.det
+            parts = det.split(ctx.frame) if isinstance(det, TiledDetector) else [ctx.frame]
+            spans.append((len(frames), len(parts)))
+            frames.extend(parts)
+        for slot, ctx in picked:
+            slot.pipeline.detect_step.observe_age(ctx)
+        t0 = time.perf_counter()
+        try:
+            results = detect_frames(detector, frames)
+        except Exception as e:
+            return gated + [(slot, slot.pipeline.detect_step.fail(ctx, e)) for slot, ctx in picked]
+        batch_ms = (time.perf_counter() - t0) * 1000.0
+        self.telemetry.time_ms("detect_batch_ms", batch_ms)
+        for slot, _ in picked:
+            if slot.pipeline.detect_step.on_latency is not None:
+                slot.pipeline.detect_step.on_latency(batch_ms / len(picked))
+        self.telemetry.gauge("detect_batch_size", float(len(picked)))
+        out = list(gated)
+        for (slot, ctx), (start, n) in zip(picked, spans):
+            det = slot.pipeline.detect_step.det
+            if isinstance(det, TiledDetector):
+                dets = det.merge(ctx.frame, results[start:start + n])
+            else:
+                dets = results[start]
+            out.append((slot, slot.pipeline.detect_step.apply(ctx, dets)))
+        return out
+
+    def _pick(self, exclude: Set[int] = frozenset()) -> Optional[Tuple[_CameraSlot, Ctx]]:
+        """Take one queued context, honouring the schedule. None if nothing is ready."""
+        n = len(self._slots)
+        order = [self._slots[(self._next + i) % n] for i in range(n)]
+        if self.schedule == PRIORITY:
+            # stable sort keeps round-robin order within each priority class
+            order.sort(key=lambda s: not s.state.present)
+        for slot in order:
+            if id(slot) in exclude:
+                continue
+            ctx = slot.queue.get(timeout=0)
+            if ctx is not None:
+                self._next = (self._slots.index(slot) + 1) % n
+                return slot, ctx
+        return None
+
+    def iter_frames(self) -> Iterator[Tuple[str, Ctx]]:
+        """Yield ``(camera_name, ctx)`` after each scheduled detection pass."""
+        stop = threading.Event()
+        errors: list[BaseException] = []
+
+        def capture(slot: _CameraSlot):
+            try:
+                slot.pipeline.capture_loop(slot.queue, stop, slot.state)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                self._ready.set()
+
+        threads = [
+            threading.Thread(target=capture, args=(slot,), name=f"capture-{slot.name}", daemon=True)
+            for slot in self._slots
+        ]
+        for t in threads:
+            t.start()
+        try:
+            while not stop.is_set():
+                self._ready.clear()
+                picked = self._pick_many(self.batch_size)
+                if not picked:
+                    self._ready.wait(timeout=0.1)
+                    continue
+                t0 = time.perf_counter()
+                for slot, ctx in self._detect(picked):
+                    for step in slot.pipeline.detect_steps:
+                        if step is not slot.pipeline.detect_step:
+                            ctx = step.run(ctx)
+                    for step in slot.pipeline.effect_steps:
+                        ctx = step.run(ctx)
+                    slot.served += 1
+                    self.telemetry.time_ms(
+                        "multi_cam_pass_ms", (time.perf_counter() - t0) * 1000.0, camera=slot.name
+                    )
+                    self.telemetry.incr("multi_cam_frames", camera=slot.name)
+                    yield slot.name, ctx
+            if errors:
+                raise errors[0]
+        finally:
+            stop.set()
+            for t in threads:
+                t.join(timeout=5)
+
+    def run(self):
+        for _ in self.iter_frames():
+            pass
@@ -0,0 +1,23 @@
+"""Difference hash (dHash) for cheap near-duplicate frame detection.
+
+The image is shrunk to a ``(size + 1) x size`` grayscale thumbnail and each
+bit records whether a pixel is brighter than its right neighbour. Frames that
+look the same to a person land within a few bits of each other even across
+JPEG noise and small lighting changes; compare them with :func:`hamming`.
+"""
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+
+def dhash(image: np.ndarray, size: int = 8) -> int:
+    """``size * size``-bit difference hash of a BGR or grayscale image."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
@@ -1,24 +1,41 @@
 from __future__ import annotations
 import logging
 from dataclasses import dataclass, field
-from typing import Optional, Sequence, Protocol, Set, TYPE_CHECKING
+from typing import Callable, List, Optional, Sequence, Protocol, Set, Tuple, TYPE_CHECKING, Union
+import dataclasses
+import functools
 import os
+import threading
 import time
 import cv2
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
-from .ports import Detection, Frame, Detector, ITracker, Camera, AlertSink, EventBus, Telemetry
+from .ports import (
+    Detection, DetectionBatch, Frame, Detector, ITracker, Camera, AlertSink, EventBus, Telemetry,
+    best_conf, class_ids, filter_classes, track_ids,
+)
 from .state import PresenceState
-from .rate_policy import RatePolicy, RateTarget, FullSpeedRatePolicy
+from .rate_policy import AdaptiveRatePolicy, RatePolicy, RateTarget, FullSpeedRatePolicy
 from .presence_policy import PresencePolicy
 from .alert_policy import AlertPolicy
-from .clock import Clock
+from .clock import Clock, timer_for
 from .config import Config
+from .stages import StageQueue, DROP_OLDEST
+from .zones import ZoneMask
+from .phash import dhash, hamming
+from .pyramid import THUMB_WIDTH
+from .latency import LatencyTrace, record_trace, wall_now
+from .tiling import TiledDetector, parse_regions
+from .flow import BoxFlow
 
 if TYPE_CHECKING:
     from .alert_history import AlertHistoryStore
+    from .detection_log import DetectionLog
+    from .frame_ring import FrameRing
     from .frame_store import FrameStore
+    from .side_effects import InlineExecutor, KeyedWorkerPool
 
 # ------------------------------
 # Context passed through steps
@@ -32,8 +49,11 @@ class Ctx:
 
     # Time/Rate
     now: float = 0.0
-    target: RateTarget = RateTarget(fps=0.0, vid_stride=1)
+    target: RateTarget = field(default_factory=lambda: RateTarget(fps=0.0, vid_stride=1))
     frame_index: int = 0  # for stride
+    skip_detect: bool = False  # MotionGateStep: reuse the previous detections
+    detected: bool = False  # the detector ran on this frame (dets not reused or interpolated)
+    trace: Optional[LatencyTrace] = None  # glass-to-alert stamps of ctx.frame
 
     # Presence
     state: PresenceState = field(default_factory=PresenceState)
@@ -59,11 +79,14 @@ def _build_alert_message(
     best: float,
     trigger_class_names: Set[str],
     context_class_names: Set[str],
+    camera_name: str = "",
 ) -> str:
     noun = "object" if count == 1 else "objects"
     classes = ", ".join(sorted(trigger_class_names)) if trigger_class_names else "unknown"
-    msg = (
-        "Alert detected\n"
+    msg = "Alert detected\n"
+    if camera_name:
+        msg += f"- Camera: {camera_name}\n"
+    msg += (
         f"- Triggered: {count} {noun}\n"
         f"- Best confidence: {best:.2f}\n"
         f"- Triggered classes: {classes}"
@@ -84,7 +107,12 @@ def _save_snapshot(
 ):
     from .annotate import draw_detections
 
-    img = frame.image.copy()
+    img = frame.full_image()
+    if img is frame.image:
+        img = img.copy()
+    elif dets:
+        # DECODE_DUAL: the detector saw the scaled frame; draw on the full-resolution one
+        dets = DetectionBatch.from_detections(dets).scaled(img.shape[1] / frame.w, img.shape[0] / frame.h)
     draw_detections(
         img,
         dets,
@@ -103,8 +131,16 @@ class RateStep(PipelineStep):
     clock: Clock
     rate: RatePolicy
     telemetry: Telemetry
+    _last_end: float = field(default=0.0, init=False, repr=False)
+
+    def _timer(self) -> float:
+        return timer_for(self.clock)()  # includes simulated sleeps under FastForwardClock
 
     def run(self, ctx: Ctx) -> Ctx:
+        # busy time of the previous pass (everything outside this step), for adaptive policies
+        observe_loop = getattr(self.rate, "observe_loop", None)
+        if observe_loop is not None and self._last_end > 0:
+            observe_loop((self._timer() - self._last_end) * 1000.0)
         # decide target
         ctx.target = self.rate.decide(ctx.state, ctx.now)
         # soft sleep for FPS
@@ -113,17 +149,133 @@ class RateStep(PipelineStep):
             now = self.clock.now()
             dt = now - ctx.now
             if dt < min_dt:
-                t0 = time.perf_counter()
+                t0 = self._timer()
                 self.clock.sleep(min_dt - dt)
-                sleep_ms = (time.perf_counter() - t0) * 1000.0
+                sleep_ms = (self._timer() - t0) * 1000.0
                 self.telemetry.time_ms("rate_sleep_ms", sleep_ms)
         ctx.now = self.clock.now()
+        self._last_end = self._timer()
+        return ctx
+
+@dataclass
+class ArrivalRateStep(RateStep):
+    """SCHEDULER_MODE=arrival: pace the loop on frame arrivals instead of sleeping.
+
+    RateStep sleeps out ``1 / fps`` and then reads whatever the camera has,
+    often a frame that has been waiting for most of a frame interval. This
+    step blocks on the camera's frame sequence (``cam.wait_for``) and returns
+    right after the arrival closest to the next deadline, so ReadStep gets a
+    frame that is just decoded. Deadlines advance by ``1 / fps`` from the
+    previous one, not from the read, so the average rate stays on target even
+    when it is not a multiple of the camera's. Needs a latest-frame camera
+    (ThreadedCamera, ShmCamera).
+    """
+    cam: Camera = None
+    _interval: float = field(default=0.0, init=False, repr=False)  # EMA of the camera frame interval
+    _deadline: Optional[float] = field(default=None, init=False, repr=False)
+
+    def run(self, ctx: Ctx) -> Ctx:
+        observe_loop = getattr(self.rate, "observe_loop", None)
+        if observe_loop is not None and self._last_end > 0:
+            observe_loop((self._timer() - self._last_end) * 1000.0)
+        ctx.target = self.rate.decide(ctx.state, ctx.now)
+        if ctx.target.fps > 0:
+            period = 1.0 / ctx.target.fps
+            now = self.clock.now()
+            # a loop running behind does not build up debt it would then race through
+            self._deadline = now + period if self._deadline is None else max(self._deadline + period, now)
+            t0 = self._timer()
+            self._wait(self._deadline)
+            self.telemetry.time_ms("rate_wait_ms", (self._timer() - t0) * 1000.0)
+        else:
+            self._deadline = None
+        ctx.now = self.clock.now()
+        self._last_end = self._timer()
+        return ctx
+
+    def _wait(self, deadline: float) -> None:
+        after = self.cam.seq
+        prev = None
+        while True:
+            half = self._interval / 2
+            remaining = deadline + half - self.clock.now()
+            if remaining <= 0:
+                return
+            seq, _ = self.cam.wait_for(after, timeout=remaining)
+            if seq <= after:
+                return  # camera stalled: read the newest frame there is
+            now = self.clock.now()
+            if prev is not None and seq == after + 1:
+                dt = now - prev
+                self._interval = dt if self._interval <= 0 else 0.8 * self._interval + 0.2 * dt
+            prev, after = now, seq
+            if deadline - now <= self._interval / 2:
+                return  # the next frame would land further from the deadline than this one
+
+
+@dataclass
+class DecodeModeStep(PipelineStep):
+    """IDLE_DECODE=keyframe: decode only keyframes while nothing has been seen for a while.
+
+    Switches the camera to keyframe-only decoding once presence has been off for
+    ``idle_after_sec`` and straight back to full decoding when presence arms.
+    Switching reconnects the stream, so the long idle delay is what keeps the
+    mode from flapping. While keyframe-only, the stride is forced to 1: the
+    stream is already down to one frame per GOP, and grab() skipping some of
+    those would stretch the gaps further. If the reconnect fails, the camera
+    goes back to full decoding and keyframe mode waits another idle period.
+    """
+    cam: Camera
+    telemetry: Telemetry
+    idle_after_sec: float = 30.0
+    _last_active: Optional[float] = field(default=None, init=False, repr=False)
+    _unsupported: bool = field(default=False, init=False, repr=False)
+
+    def run(self, ctx: Ctx) -> Ctx:
+        if self._unsupported:
+            return ctx
+        if ctx.state.present or self._last_active is None:
+            self._last_active = ctx.now
+        idle = ctx.now - self._last_active >= self.idle_after_sec
+        want = "keyframe" if idle else "full"
+        if want != self.cam.decode_mode:
+            try:
+                switched = self.cam.set_decode_mode(want)
+            except Exception as e:
+                return self.fail(ctx, want, e)
+            if switched:
+                self.telemetry.incr("decode_mode_switches")
+            elif want == "keyframe":
+                logger.warning(
+                    "IDLE_DECODE=keyframe needs the GStreamer RTSP pipeline (USE_GSTREAMER=1); decoding every frame"
+                )
+                self._unsupported = True
+                return ctx
+        keyframes = self.cam.decode_mode == "keyframe"
+        self.telemetry.gauge("decode_keyframe_only", 1.0 if keyframes else 0.0)
+        if keyframes and ctx.target.vid_stride > 1:
+            ctx.target = RateTarget(ctx.target.fps, 1)
         return ctx
 
+    def fail(self, ctx: Ctx, want: str, e: Exception) -> Ctx:
+        """The reconnect for *want* failed: reopen in full decoding, retry keyframes after another idle period."""
+        self.telemetry.incr("decode_mode_errors")
+        logger.warning("Switching the camera to %s decoding failed (%s); decoding every frame", want, e)
+        if self.cam.decode_mode != "full":
+            try:
+                self.cam.set_decode_mode("full")
+            except Exception:
+                logger.warning("Reopening the camera for full decoding failed", exc_info=True)
+        self._last_active = ctx.now
+        self.telemetry.gauge("decode_keyframe_only", 0.0)
+        return ctx
+
+
 @dataclass
 class ReadStep(PipelineStep):
     cam: Camera
     telemetry: Telemetry
+    _dropped: int = field(default=0, init=False, repr=False)
 
     def run(self, ctx: Ctx) -> Ctx:
         ctx.frame_index += 1
@@ -133,6 +285,7 @@ class ReadStep(PipelineStep):
         if ctx.target.vid_stride > 1 and (ctx.frame_index % ctx.target.vid_stride != 0):
             self.cam.grab()
             ctx.frame = None
+            ctx.trace = None
             ctx.dets = ()
             return ctx
 
@@ -144,49 +297,206 @@ class ReadStep(PipelineStep):
             return ctx
         ctx.frame = frame
         ctx.now = frame.t
+        ctx.trace = LatencyTrace(capture_t=frame.capture_t)
         self.telemetry.incr("frames")
+        # latest-frame cameras (ThreadedCamera, ShmCamera) skip frames decoded between reads
+        dropped = getattr(self.cam, "dropped", None)
+        if dropped is not None and dropped != self._dropped:
+            self.telemetry.incr("camera_dropped", dropped - self._dropped)
+            self._dropped = dropped
+        pool = getattr(self.cam, "pool", None)
+        if pool is not None:
+            hits, misses = pool.take_stats()
+            if hits:
+                self.telemetry.incr("frame_pool_hits", hits)
+            if misses:
+                self.telemetry.incr("frame_pool_misses", misses)
+            self.telemetry.gauge("frame_pool_high_water", float(pool.high_water))
+        return ctx
+
+@dataclass
+class MotionGateStep(PipelineStep):
+    """Mark frames that barely changed since the last detected frame as skippable.
+
+    Compares a small grayscale thumbnail (``width`` px wide) against the one of
+    the last frame sent to the detector: the score is the fraction of pixels
+    whose gray level moved by more than ``pixel_delta``. Below ``threshold``
+    DetectStep reuses the previous detections. Comparing against the last
+    *detected* frame (not the previous one) lets slow changes accumulate, and
+    ``force_sec`` still runs the model periodically so stationary objects are
+    seen.
+    """
+    telemetry: Telemetry
+    threshold: float = 0.005
+    pixel_delta: int = 15
+    force_sec: float = 5.0
+    width: int = 160
+    _ref: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _ref_t: float = field(default=0.0, init=False, repr=False)
+    _skip_rate: float = field(default=0.0, init=False, repr=False)
+
+    def run(self, ctx: Ctx) -> Ctx:
+        if ctx.frame is None:
+            return ctx
+        thumb = ctx.frame.scaled(max(8, self.width), gray=True)
+        score = 1.0
+        if self._ref is not None and self._ref.shape == thumb.shape:
+            changed = cv2.absdiff(thumb, self._ref) > self.pixel_delta
+            score = float(np.count_nonzero(changed)) / changed.size
+        forced = self.force_sec > 0 and (ctx.now - self._ref_t) >= self.force_sec
+        ctx.skip_detect = score < self.threshold and not forced
+        if not ctx.skip_detect:
+            self._ref, self._ref_t = thumb, ctx.now
+        self._skip_rate += 0.05 * ((1.0 if ctx.skip_detect else 0.0) - self._skip_rate)
+        self.telemetry.incr("motion_gate_skipped" if ctx.skip_detect else "motion_gate_passed")
+        self.telemetry.gauge("motion_score", score)
+        self.telemetry.gauge("motion_skip_rate", self._skip_rate)
         return ctx
 
 @dataclass
 class DetectStep(PipelineStep):
+    """Run the detector (and tracker) on the frame.
+
+    With ``every > 1`` and a tracker that can ``predict()``, the detector runs
+    only on every k-th frame while confirmed tracks exist; frames in between
+    get the tracks' predicted boxes (refined by ``flow`` if set). k is
+    ``every`` for slow objects and shrinks so the fastest track moves at most
+    ``max_shift`` box sizes between detector passes (0 = fixed k).
+    """
     det: Detector
     tracker: Optional[ITracker]
     conf_thresh: float
     telemetry: Telemetry
+    on_latency: Optional[Callable[[float], None]] = None  # detect ms per frame (adaptive rate)
+    every: int = 1
+    max_shift: float = 0.2
+    flow: Optional[BoxFlow] = None
+    clock: Optional[Clock] = None  # times detect_ms on this clock (simulated latency in replays)
+    _last_dets: Sequence[Detection] = field(default=(), init=False, repr=False)
+    _k: int = field(default=1, init=False, repr=False)
+    _since: int = field(default=0, init=False, repr=False)  # interpolated frames since the detector ran
+
+    def _timer(self) -> float:
+        return timer_for(self.clock)()
 
     def run(self, ctx: Ctx) -> Ctx:
+        ctx.detected = False
         if ctx.frame is None:
             return ctx
+        if ctx.skip_detect:
+            ctx.dets = self._last_dets
+            if ctx.trace is not None:
+                ctx.trace.mark("detect")
+            return ctx
+        if self.interpolates():
+            return self.interpolate(ctx)
 
+        self.observe_age(ctx)
         try:
-            t0 = time.perf_counter()
+            t0 = self._timer()
             dets = self.det.detect(ctx.frame)
-            self.telemetry.time_ms("detect_ms", (time.perf_counter() - t0) * 1000.0)
-            if self.tracker:
-                t1 = time.perf_counter()
+            detect_ms = (self._timer() - t0) * 1000.0
+            self.telemetry.time_ms("detect_ms", detect_ms)
+            if self.on_latency is not None:
+                self.on_latency(detect_ms)
+        except Exception as e:
+            return self.fail(ctx, e)
+        return self.apply(ctx, dets)
+
+    def apply(self, ctx: Ctx, dets: Sequence[Detection]) -> Ctx:
+        """Finish a pass with detections computed elsewhere (e.g. one detect_batch call)."""
+        try:
+            if self.tracker is not None:
+                t1 = self._timer()
                 dets = self.tracker.update(ctx.frame, dets)
-                self.telemetry.time_ms("track_ms", (time.perf_counter() - t1) * 1000.0)
+                self.telemetry.time_ms("track_ms", (self._timer() - t1) * 1000.0)
+            # after tracking: a detector shared by several cameras runs at the lowest of their thresholds
+            dets = filter_classes(dets, None, self.conf_thresh)
             ctx.dets = dets
+            ctx.detected = True
+            self._last_dets = dets
+            if self.every > 1:
+                self._plan(ctx, dets)
         except Exception as e:
-            self.telemetry.incr("detect_errors")
-            self.telemetry.gauge("last_detect_exc", 1.0, msg=str(e))
-            ctx.dets = ()
+            return self.fail(ctx, e)
+        if ctx.trace is not None:
+            ctx.trace.mark("detect")
+        return ctx
+
+    def observe_age(self, ctx: Ctx) -> None:
+        """Report how old the frame is as the detector starts on it (capture → now)."""
+        if ctx.trace is not None:
+            age_ms = (wall_now() - ctx.trace.stamps["capture"]) * 1000.0
+            self.telemetry.time_ms("frame_age_ms", max(0.0, age_ms))
+
+    def interpolates(self) -> bool:
+        """True if the next frame gets predicted boxes instead of a detector pass."""
+        return self._since + 1 < self._k
+
+    def _plan(self, ctx: Ctx, dets: Sequence[Detection]) -> None:
+        """After a detector pass: pick k from the fastest track and reset the countdown."""
+        self._since = 0
+        speed = getattr(self.tracker, "speed", None)
+        v = speed() if speed is not None and hasattr(self.tracker, "predict") else None
+        if v is None:
+            self._k = 1  # nothing tracked: new objects must be seen by the detector
+        elif self.max_shift > 0 and v > 0:
+            self._k = max(1, min(self.every, int(self.max_shift / v)))
+        else:
+            self._k = self.every
+        self.telemetry.gauge("detect_every", float(self._k))
+        if self.flow is not None:
+            self.flow.observe(ctx.frame, DetectionBatch.from_detections(dets))
+
+    def interpolate(self, ctx: Ctx) -> Ctx:
+        """Predicted (optionally flow-refined) track boxes instead of a detector pass."""
+        try:
+            t0 = self._timer()
+            dets = self.tracker.predict(ctx.frame)
+            if self.flow is not None:
+                dets = self.flow.refine(ctx.frame, dets)
+                self.flow.observe(ctx.frame, dets)
+            dets = filter_classes(dets, None, self.conf_thresh)
+            self.telemetry.time_ms("interpolate_ms", (self._timer() - t0) * 1000.0)
+        except Exception as e:
+            self._k = 1
+            return self.fail(ctx, e)
+        self._since += 1
+        self.telemetry.incr("detect_interpolated")
+        ctx.dets = dets
+        self._last_dets = dets
+        if ctx.trace is not None:
+            ctx.trace.mark("detect")
+        return ctx
+
+    def fail(self, ctx: Ctx, e: Exception) -> Ctx:
+        self.telemetry.incr("detect_errors")
+        self.telemetry.gauge("last_detect_exc", 1.0, msg=str(e))
+        ctx.dets = ()
+        self._last_dets = ()
         return ctx
 
 @dataclass
 class TriggerFilterStep(PipelineStep):
+    """Keep trigger-class detections, and with *zones* only those whose anchor
+    point lies in the allowed area (see ``zones.py``)."""
     trigger_ids: Set[int]
     telemetry: Telemetry
+    zones: Optional[ZoneMask] = None
 
     def run(self, ctx: Ctx) -> Ctx:
         if not ctx.dets:
             ctx.trigger_dets = ()
             return ctx
-        trig = [d for d in ctx.dets if (d.cls_id in self.trigger_ids)]
+        trig = filter_classes(ctx.dets, self.trigger_ids)
+        if len(trig) and self.zones is not None and ctx.frame is not None:
+            n = len(trig)
+            trig = self.zones.filter(trig, ctx.frame.w, ctx.frame.h)
+            if len(trig) < n:
+                self.telemetry.incr("zone_filtered", n - len(trig))
         ctx.trigger_dets = trig
-        if trig:
-            best = max(d.conf for d in trig)
-            self.telemetry.gauge("trigger_best_conf", float(best))
+        if len(trig):
+            self.telemetry.gauge("trigger_best_conf", best_conf(trig))
         return ctx
 
 @dataclass
@@ -197,10 +507,22 @@ class PresenceStep(PipelineStep):
         ctx.state, ctx.became_present, ctx.became_idle = self.policy.update(
             ctx.state, ctx.now, ctx.trigger_dets
         )
+        if ctx.became_present and ctx.trace is not None:
+            ctx.trace.mark("presence")
         return ctx
 
 @dataclass
 class AlertStep(PipelineStep):
+    """Accumulate trigger frames into alert windows and deliver them.
+
+    Snapshot/raw-frame writes, the history insert and the sink send are handed
+    to *executor* when one is set (see ``side_effects.py``), keyed by alert
+    window so a window's snapshots are always written before its send. The
+    loop itself only updates AlertPolicy and enqueues work.
+
+    The trace of the frame that opened a window travels with it and is stamped
+    at flush, history insert and send (``latency.py``).
+    """
     alert: AlertPolicy
     sink: AlertSink
     event_bus: Optional[EventBus]
@@ -215,55 +537,128 @@ class AlertStep(PipelineStep):
     history: Optional["AlertHistoryStore"] = None
     save_raw_frames: bool = False
     raw_frames_dir: str = ""
+    camera_name: str = ""
+    executor: Union["KeyedWorkerPool", "InlineExecutor", None] = None
+    _window: int = field(default=0, init=False, repr=False)
+    _window_trace: Optional[LatencyTrace] = field(default=None, init=False, repr=False)
+
+    def _dispatch(self, key, fn, *args, block: bool = True) -> bool:
+        if self.executor is None:
+            return fn(*args) is not False
+        return self.executor.submit(key, fn, *args, block=block)
+
+    def _write_snapshot(self, img_path: str, frame: Frame, dets: Sequence[Detection]) -> bool:
+        t_snap = time.perf_counter()
+        try:
+            _save_snapshot(
+                img_path, frame, dets, self.draw_ids, self.conf_thresh,
+                class_names_by_id=self.class_names_by_id,
+                tracker_on=self.tracker_on,
+            )
+            ok = True
+        except Exception:
+            ok = False
+        self.telemetry.time_ms("alert_snapshot_ms", (time.perf_counter() - t_snap) * 1000.0)
+        return ok
+
+    def _write_raw(self, raw_path: str, frame: Frame) -> None:
+        t_raw = time.perf_counter()
+        try:
+            cv2.imwrite(raw_path, frame.full_image())
+        except Exception:
+            pass
+        self.telemetry.time_ms("alert_raw_frame_ms", (time.perf_counter() - t_raw) * 1000.0)
+
+    def _deliver(
+        self,
+        now: float,
+        count: int,
+        best: float,
+        img_path: Optional[str],
+        frame_classes: Set[str],
+        context_classes: Set[str],
+        trace: Optional[LatencyTrace] = None,
+    ) -> None:
+        if img_path is not None and not os.path.exists(img_path):
+            # the window's snapshot writes ran before this (same key); this one failed
+            img_path = None
+        if self.history:
+            t_hist = time.perf_counter()
+            try:
+                self.history.insert_alert(
+                    ts=now,
+                    count=count,
+                    best_conf=best,
+                    image_path=img_path,
+                    trigger_classes=frame_classes,
+                    context_classes=context_classes,
+                )
+            except Exception as e:
+                self.telemetry.incr("alert_history_errors")
+                self.telemetry.gauge("last_alert_history_exc", 1.0, msg=str(e))
+            self.telemetry.time_ms(
+                "alert_history_ms", (time.perf_counter() - t_hist) * 1000.0
+            )
+            if trace is not None:
+                trace.mark("history")
+
+        # send
+        t_send = time.perf_counter()
+        try:
+            msg = _build_alert_message(
+                count, best, frame_classes, context_classes, camera_name=self.camera_name
+            )
+            self.sink.send(msg, image_path=img_path)
+            if trace is not None:
+                trace.mark("sent")
+                record_trace(self.telemetry, trace)
+            if self.event_bus:
+                from .events import AlertIssued
+                self.event_bus.publish("alerts", AlertIssued(
+                    count=count, best_conf=best, image_path=img_path,
+                    timings=dict(trace.stamps) if trace is not None else None,
+                ))
+        except Exception as e:
+            self.telemetry.incr("alert_errors")
+            self.telemetry.gauge("last_alert_exc", 1.0, msg=str(e))
+        finally:
+            self.telemetry.time_ms("alert_send_ms", (time.perf_counter() - t_send) * 1000.0)
 
     def run(self, ctx: Ctx) -> Ctx:
         t_alert0 = time.perf_counter()
+        window_key = ("alert", self._window)
         # accumulate alerts whenever we see triggers (presence policy still tracks state separately)
         if ctx.trigger_dets:
-            ids = [d.track_id for d in ctx.trigger_dets if d.track_id is not None] or [-1]
-            best = max(d.conf for d in ctx.trigger_dets) if ctx.trigger_dets else 0.0
+            ids = track_ids(ctx.trigger_dets) or [-1]
+            best = best_conf(ctx.trigger_dets)
             frame_count = len(ctx.trigger_dets)
             frame_best = best
             frame_classes = {
-                self.class_names_by_id.get(d.cls_id, f"class_{d.cls_id}") for d in ctx.trigger_dets
+                self.class_names_by_id.get(k, f"class_{k}") for k in class_ids(ctx.trigger_dets)
             }
+            context_dets = filter_classes(ctx.dets, self.draw_ids or None, min_conf=self.conf_thresh)
             frame_context_classes = {
-                self.class_names_by_id.get(d.cls_id, f"class_{d.cls_id}")
-                for d in ctx.dets
-                if d.conf >= self.conf_thresh and (d.cls_id in self.draw_ids if self.draw_ids else True)
+                self.class_names_by_id.get(k, f"class_{k}") for k in class_ids(context_dets)
             }
 
-            # take a snapshot when we have trigger detections (if drawing is enabled)
+            # take a snapshot when we have trigger detections (if drawing is enabled);
+            # a snapshot dropped by a full queue leaves the alert text-only
             img_path = None
             if ctx.frame is not None and self.draw:
                 os.makedirs(self.save_dir, exist_ok=True)
                 img_path = os.path.join(self.save_dir, f"snapshot_{int(ctx.now*1000)}.jpg")
-                t_snap = time.perf_counter()
-                try:
-                    _save_snapshot(
-                        img_path, ctx.frame, ctx.dets, self.draw_ids, self.conf_thresh,
-                        class_names_by_id=self.class_names_by_id,
-                        tracker_on=self.tracker_on,
-                    )
-                except Exception:
+                if not self._dispatch(
+                    window_key, self._write_snapshot, img_path, ctx.frame, ctx.dets, block=False
+                ):
                     img_path = None
-                self.telemetry.time_ms(
-                    "alert_snapshot_ms", (time.perf_counter() - t_snap) * 1000.0
-                )
 
             if ctx.frame is not None and self.save_raw_frames:
                 os.makedirs(self.raw_frames_dir, exist_ok=True)
                 raw_path = os.path.join(self.raw_frames_dir, f"frame_{int(ctx.now*1000)}.jpg")
-                t_raw = time.perf_counter()
-                try:
-                    cv2.imwrite(raw_path, ctx.frame.image)
-                except Exception:
-                    pass
-                self.telemetry.time_ms(
-                    "alert_raw_frame_ms", (time.perf_counter() - t_raw) * 1000.0
-                )
+                self._dispatch(("raw",), self._write_raw, raw_path, ctx.frame, block=False)
 
             t_add = time.perf_counter()
+            opens_window = not self.alert.pending_ids
             self.alert.add(
                 ids,
                 best_conf=best,
@@ -275,48 +670,30 @@ class AlertStep(PipelineStep):
                 frame_class_names=frame_classes,
                 frame_context_class_names=frame_context_classes,
             )
+            if opens_window and self.alert.pending_ids and ctx.trace is not None:
+                ctx.trace.mark("armed")
+                self._window_trace = ctx.trace
             self.telemetry.time_ms("alert_add_ms", (time.perf_counter() - t_add) * 1000.0)
 
         # if due, flush window (even if scene is now empty)
         if self.alert.due(ctx.now):
             t_flush = time.perf_counter()
             count, best, img_path, frame_classes, context_classes = self.alert.flush(ctx.now)
+            trace, self._window_trace = self._window_trace, None
+            if trace is not None:
+                trace.mark("flush")
             self.telemetry.time_ms("alert_flush_ms", (time.perf_counter() - t_flush) * 1000.0)
             ctx.alert_count = count
             ctx.alert_best_conf = best
             ctx.snapshot_path = img_path
 
-            if self.history:
-                t_hist = time.perf_counter()
-                try:
-                    self.history.insert_alert(
-                        ts=ctx.now,
-                        count=count,
-                        best_conf=best,
-                        image_path=img_path,
-                        trigger_classes=frame_classes,
-                        context_classes=context_classes,
-                    )
-                except Exception as e:
-                    self.telemetry.incr("alert_history_errors")
-                    self.telemetry.gauge("last_alert_history_exc", 1.0, msg=str(e))
-                self.telemetry.time_ms(
-                    "alert_history_ms", (time.perf_counter() - t_hist) * 1000.0
-                )
-
-            # send
-            t_send = time.perf_counter()
-            try:
-                msg = _build_alert_message(count, best, frame_classes, context_classes)
-                self.sink.send(msg, image_path=img_path)
-                if self.event_bus:
-                    from .events import AlertIssued
-                    self.event_bus.publish("alerts", AlertIssued(count=count, best_conf=best, image_path=img_path))
-            except Exception as e:
-                self.telemetry.incr("alert_errors")
-                self.telemetry.gauge("last_alert_exc", 1.0, msg=str(e))
-            finally:
-                self.telemetry.time_ms("alert_send_ms", (time.perf_counter() - t_send) * 1000.0)
+            # history + send run after this window's snapshots (same key); never dropped
+            self._dispatch(
+                window_key, self._deliver,
+                ctx.now, count, best, img_path, frame_classes, context_classes, trace,
+                block=True,
+            )
+            self._window += 1
 
         # publish presence transitions as events
         if self.event_bus and (ctx.became_present or ctx.became_idle):
@@ -350,42 +727,148 @@ class FrameCaptureStep(PipelineStep):
     Does nothing when idle. Stays active for cooldown_sec after the last
     detection so we capture the tail of an event.
     Runs after TriggerFilterStep so ctx.trigger_dets is already populated.
+
+    With ``dedup`` a candidate whose dHash is within ``dedup_distance`` bits of
+    the last saved frame, with the same trigger classes and count, is not
+    written; it is added to that frame's ``repeat_count`` in the index instead.
+
+    With a ``preroll`` ring (filled by the camera), the frames buffered before
+    the first trigger of an event are saved too, so the lead-up is kept. Only
+    the ring snapshot is taken on the loop; decoding and writing them run on
+    *executor* when one is set.
     """
     frame_store: "FrameStore"
     class_names_by_id: dict[int, str]
     active_fps: float = 2.0
     cooldown_sec: float = 10.0
+    source: str = ""
+    dedup: bool = False
+    dedup_distance: int = 6
+    telemetry: Optional[Telemetry] = None
+    preroll: Optional["FrameRing"] = None
+    executor: Union["KeyedWorkerPool", "InlineExecutor", None] = None
     _last_detection_t: float = field(default=0.0, init=False, repr=False)
     _last_save_t: float = field(default=0.0, init=False, repr=False)
+    _last_saved: Optional[tuple] = field(default=None, init=False, repr=False)
+    _pending_repeats: int = field(default=0, init=False, repr=False)
+
+    # skipped duplicates are written to the index in batches of this size
+    REPEAT_FLUSH = 20
 
     def run(self, ctx: Ctx) -> Ctx:
         if ctx.frame is None:
             return ctx
 
+        if self.preroll is not None and self.telemetry is not None:
+            self.telemetry.gauge("preroll_bytes", float(self.preroll.nbytes))
         if ctx.trigger_dets:
+            if self.preroll is not None and (
+                not self._last_detection_t or (ctx.now - self._last_detection_t) >= self.cooldown_sec
+            ):
+                self._save_preroll(ctx.now)
             self._last_detection_t = ctx.now
 
         in_active_window = (ctx.now - self._last_detection_t) < self.cooldown_sec
         if not in_active_window:
+            if self._last_saved is not None:
+                self.flush()
+                self._last_saved = None
             return ctx
 
         min_interval = 1.0 / self.active_fps if self.active_fps > 0 else 0.5
         if (ctx.now - self._last_save_t) < min_interval:
             return ctx
 
+        frame_hash = sig = None
+        if self.dedup:
+            frame_hash = dhash(ctx.frame.scaled(THUMB_WIDTH, gray=True))
+            sig = (len(ctx.trigger_dets), tuple(sorted(class_ids(ctx.trigger_dets))))
+            last = self._last_saved
+            if last is not None and last[3] == sig and hamming(last[2], frame_hash) <= self.dedup_distance:
+                self._last_save_t = ctx.now
+                self._pending_repeats += 1
+                if self.telemetry is not None:
+                    self.telemetry.incr("capture_deduped")
+                if self._pending_repeats >= self.REPEAT_FLUSH:
+                    self.flush()
+                return ctx
+
         try:
-            self.frame_store.save_frame(
+            self.flush()
+            path = self.frame_store.save_frame(
                 image=ctx.frame.image,
                 ts=ctx.now,
                 detections=ctx.trigger_dets or None,
                 class_names_by_id=self.class_names_by_id,
+                source=self.source,
             )
             self._last_save_t = ctx.now
+            if self.dedup:
+                self._last_saved = (path, ctx.now, frame_hash, sig)
         except Exception:
             logger.warning("FrameCaptureStep: failed to save frame", exc_info=True)
 
         return ctx
 
+    def _save_preroll(self, now: float) -> None:
+        """An event starts: write the ring's frames from before *now*, oldest first."""
+        frames = self.preroll.snapshot(before=now)
+        if not frames:
+            return
+        if self.executor is None:
+            self._write_preroll(frames)
+        else:
+            self.executor.submit(("preroll", self.source), self._write_preroll, frames, block=False)
+
+    def _write_preroll(self, frames: List[Tuple[float, np.ndarray]]) -> None:
+        saved = 0
+        for t, data in frames:
+            try:
+                self.frame_store.save_frame(
+                    image=self.preroll.decode(data), ts=t, detections=None,
+                    class_names_by_id=self.class_names_by_id, source=self.source,
+                )
+                saved += 1
+            except Exception:
+                logger.warning("FrameCaptureStep: failed to save pre-roll frame", exc_info=True)
+                break
+        if saved and self.telemetry is not None:
+            self.telemetry.incr("preroll_saved", saved)
+
+    def flush(self) -> None:
+        """Write pending duplicate counts to the frame index."""
+        if not self._pending_repeats or self._last_saved is None:
+            return
+        path, ts = self._last_saved[:2]
+        count, self._pending_repeats = self._pending_repeats, 0
+        try:
+            self.frame_store.add_repeats(path, ts, count)
+        except Exception:
+            logger.warning("FrameCaptureStep: failed to record %d repeats", count, exc_info=True)
+
+
+@dataclass
+class DetectionLogStep(PipelineStep):
+    """Append the detector's output for each newly read frame to the binary detection log.
+
+    Frames the detector skipped (motion gate, DETECT_EVERY interpolation) are
+    not logged: their boxes were reused or predicted, not detected.
+    """
+    log: "DetectionLog"
+    telemetry: Telemetry
+    _last_index: int = field(default=-1, init=False, repr=False)
+
+    def run(self, ctx: Ctx) -> Ctx:
+        if ctx.frame is None or ctx.frame.index == self._last_index:
+            return ctx
+        self._last_index = ctx.frame.index
+        try:
+            self.log.append(ctx.frame.t, ctx.frame.index, ctx.dets if ctx.detected else ())
+        except Exception:
+            self.telemetry.incr("detection_log_errors")
+            logger.warning("DetectionLogStep: append failed", exc_info=True)
+        return ctx
+
 
 @dataclass
 class TelemetryStep(PipelineStep):
@@ -417,6 +900,8 @@ class Pipeline:
     alert_history: Optional["AlertHistoryStore"] = None
     frame_store: Optional["FrameStore"] = None
     preview_detector_only: bool = False
+    camera_name: str = ""
+    preroll: Optional["FrameRing"] = None  # shared with the camera, see frame_ring.py
 
     def __post_init__(self):
         if self.preview_detector_only:
@@ -448,9 +933,25 @@ class Pipeline:
         if not self.preview_detector_only:
             os.makedirs(self.cfg.save_dir, exist_ok=True)
 
-        eff_rate: RatePolicy | FullSpeedRatePolicy = (
+        self._alert_executor: Union["KeyedWorkerPool", "InlineExecutor", None] = None
+        if not self.preview_detector_only:
+            from .side_effects import build_executor
+
+            self._alert_executor = build_executor(
+                self.cfg.alert_workers, self.cfg.alert_queue_size, self.telemetry, name="alert"
+            )
+
+        eff_rate: RatePolicy | FullSpeedRatePolicy | AdaptiveRatePolicy = (
             FullSpeedRatePolicy() if self.preview_detector_only else self.rate
         )
+        if self.cfg.rate_adaptive and not self.preview_detector_only:
+            eff_rate = AdaptiveRatePolicy(
+                base=self.rate,
+                telemetry=self.telemetry,
+                target_util=self.cfg.rate_target_util,
+                latency_budget_ms=self.cfg.rate_latency_budget_ms,
+                max_load=self.cfg.rate_max_load,
+            )
         alert_step: PipelineStep = (
             NoOpAlertStep()
             if self.preview_detector_only
@@ -469,51 +970,241 @@ class Pipeline:
                 history=self.alert_history,
                 save_raw_frames=self.cfg.save_raw_frames,
                 raw_frames_dir=self.cfg.raw_frames_dir,
+                camera_name=self.camera_name,
+                executor=self._alert_executor,
             )
         )
 
-        frame_capture_step: Optional[PipelineStep] = None
+        frame_capture_step: Optional[FrameCaptureStep] = None
         if self.frame_store is not None and not self.preview_detector_only:
             frame_capture_step = FrameCaptureStep(
                 frame_store=self.frame_store,
                 class_names_by_id={v: k for k, v in self._name2id.items()},
                 active_fps=self.cfg.capture_active_fps,
                 cooldown_sec=self.cfg.capture_cooldown_sec,
+                source=self.camera_name,
+                dedup=self.cfg.capture_dedup,
+                dedup_distance=self.cfg.capture_dedup_distance,
+                telemetry=self.telemetry,
+                preroll=self.preroll,
+                executor=self._alert_executor,
+            )
+        self.frame_capture_step = frame_capture_step
+
+        self.detection_log: Optional["DetectionLog"] = None
+        detection_log_step: Optional[PipelineStep] = None
+        if self.cfg.detection_log_dir and not self.preview_detector_only:
+            from .detection_log import DetectionLog
+
+            self.detection_log = DetectionLog(
+                self.cfg.detection_log_dir, source=self.camera_name,
+                retention_days=self.cfg.detection_log_retention_days,
             )
+            detection_log_step = DetectionLogStep(log=self.detection_log, telemetry=self.telemetry)
 
         # wire steps
-        steps: list[PipelineStep] = [
-            RateStep(clock=self.clock, rate=eff_rate, telemetry=self.telemetry),
-            ReadStep(cam=self.camera, telemetry=self.telemetry),
-            DetectStep(
-                det=self.detector,
-                tracker=self.tracker,
-                conf_thresh=self.cfg.conf_thresh,
+        if self.cfg.scheduler_mode == "arrival" and hasattr(self.camera, "wait_for"):
+            rate_step = ArrivalRateStep(
+                clock=self.clock, rate=eff_rate, telemetry=self.telemetry, cam=self.camera
+            )
+        else:
+            if self.cfg.scheduler_mode == "arrival":
+                logger.warning("SCHEDULER_MODE=arrival needs a latest-frame camera; sleeping instead")
+            rate_step = RateStep(clock=self.clock, rate=eff_rate, telemetry=self.telemetry)
+        read_step = ReadStep(cam=self.camera, telemetry=self.telemetry)
+        decode_step: Optional[PipelineStep] = None
+        if self.cfg.idle_decode == "keyframe":
+            if hasattr(self.camera, "set_decode_mode"):
+                decode_step = DecodeModeStep(
+                    cam=self.camera, telemetry=self.telemetry, idle_after_sec=self.cfg.idle_decode_after_sec
+                )
+            else:
+                logger.warning("IDLE_DECODE=keyframe is not supported by %s", type(self.camera).__name__)
+        gate_step: Optional[PipelineStep] = None
+        if self.cfg.motion_gate:
+            gate_step = MotionGateStep(
                 telemetry=self.telemetry,
-            ),
-            TriggerFilterStep(trigger_ids=self._trigger_ids, telemetry=self.telemetry),
-        ]
+                threshold=self.cfg.motion_threshold,
+                pixel_delta=self.cfg.motion_pixel_delta,
+                force_sec=self.cfg.motion_force_sec,
+                width=self.cfg.motion_width,
+            )
+        detector = self.detector
+        if self.cfg.tile_size > 0:
+            tile = functools.partial(
+                TiledDetector,
+                tile_size=self.cfg.tile_size,
+                overlap=self.cfg.tile_overlap,
+                regions=parse_regions(self.cfg.tile_regions),
+                full_frame=self.cfg.tile_full_frame,
+                merge_thresh=self.cfg.tile_merge_thresh,
+            )
+            # wrappers that must see whole frames (DETECT_RECORD_PATH) stay outside the tiles
+            wrap_inner = getattr(detector, "wrap_inner", None)
+            detector = wrap_inner(tile) if wrap_inner is not None else tile(detector)
+            if self.cfg.tracker_on and self.tracker is None:
+                logger.warning("TILE_SIZE: tiles are detected without the Ultralytics tracker (no track ids)")
+        detect_step = DetectStep(
+            det=detector,
+            tracker=self.tracker,
+            conf_thresh=self.cfg.conf_thresh,
+            telemetry=self.telemetry,
+            on_latency=getattr(eff_rate, "observe_detect", None),
+            every=self.cfg.detect_every,
+            max_shift=self.cfg.detect_max_shift,
+            flow=BoxFlow() if self.cfg.detect_flow else None,
+            clock=self.clock,
+        )
+        if self.cfg.detect_every > 1 and not hasattr(self.tracker, "predict"):
+            logger.warning("DETECT_EVERY needs TRACKER_BACKEND=sort; the detector runs on every frame")
+        zones = None
+        if self.cfg.zone_include or self.cfg.zone_exclude:
+            zones = ZoneMask.from_spec(self.cfg.zone_include, self.cfg.zone_exclude, self.cfg.zone_anchor)
+        trigger_step = TriggerFilterStep(
+            trigger_ids=self._trigger_ids, telemetry=self.telemetry, zones=zones
+        )
+        presence_step = PresenceStep(policy=self.presence)
+        telemetry_step = TelemetryStep(telemetry=self.telemetry)
+
+        capture: list[PipelineStep] = [rate_step] + ([decode_step] if decode_step is not None else []) + [read_step]
+        steps: list[PipelineStep] = list(capture)
+        if gate_step is not None:
+            steps.append(gate_step)
+        steps.append(detect_step)
+        if detection_log_step is not None:
+            steps.append(detection_log_step)
+        steps.append(trigger_step)
         if frame_capture_step is not None:
             steps.append(frame_capture_step)
-        steps.extend([
-            PresenceStep(policy=self.presence),
-            alert_step,
-            TelemetryStep(telemetry=self.telemetry),
-        ])
+        steps.extend([presence_step, alert_step, telemetry_step])
         self.steps = steps
 
+        self.detect_step = detect_step
+        # Stage groups for PIPELINE_MODE=staged (same step instances, one thread each).
+        self.capture_steps: list[PipelineStep] = capture + (
+            [gate_step] if gate_step is not None else []
+        )
+        self.detect_steps: list[PipelineStep] = [
+            step for step in (detect_step, detection_log_step, trigger_step, presence_step)
+            if step is not None
+        ]
+        self.effect_steps: list[PipelineStep] = (
+            [frame_capture_step] if frame_capture_step is not None else []
+        ) + [alert_step, telemetry_step]
+
     def iter_frames(self):
         """Yield context after each full pipeline pass (for preview / tooling)."""
+        if self.cfg.pipeline_mode == "staged":
+            yield from self._iter_frames_staged()
+            return
         ctx = Ctx(now=self.clock.now())
         while True:
-            loop_t0 = time.perf_counter()
+            loop_t0 = timer_for(self.clock)()
             for step in self.steps:
                 ctx = step.run(ctx)
             self.telemetry.time_ms(
-                "pipeline_loop_ms", (time.perf_counter() - loop_t0) * 1000.0
+                "pipeline_loop_ms", (timer_for(self.clock)() - loop_t0) * 1000.0
             )
             yield ctx
 
+    def capture_loop(self, out_q: StageQueue, stop: threading.Event, state: PresenceState) -> None:
+        """Run the capture steps until *stop*, forwarding each read frame to *out_q*.
+
+        *state* is the live presence state RateStep decides on; whoever runs the
+        detection steps for these contexts keeps it up to date.
+        """
+        now = self.clock.now()
+        frame_index = 0
+        while not stop.is_set():
+            ctx = Ctx(now=now, frame_index=frame_index, state=state)
+            t0 = timer_for(self.clock)()
+            for step in self.capture_steps:
+                ctx = step.run(ctx)
+            now, frame_index = ctx.now, ctx.frame_index
+            if ctx.frame is None:
+                continue
+            self.telemetry.time_ms("stage_capture_ms", (timer_for(self.clock)() - t0) * 1000.0)
+            out_q.put(ctx, stop)
+
+    def _iter_frames_staged(self):
+        """Run capture, detection and side effects on separate threads.
+
+        Stages are connected by bounded queues (see ``stages.py``). Only passes
+        that actually read a frame are forwarded; stride-skip passes stay in the
+        capture thread. The presence state is shared with RateStep, and each
+        context gets a snapshot of it before reaching the side-effect stage.
+        """
+        size = self.cfg.stage_queue_size
+        detect_q = StageQueue("detect", size, self.cfg.stage_frame_policy, self.telemetry)
+        effect_q = StageQueue("effects", size, self.cfg.stage_effects_policy, self.telemetry)
+        out_q = StageQueue("output", size, DROP_OLDEST, self.telemetry)
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        state = PresenceState()
+
+        def guarded(fn):
+            def _run():
+                try:
+                    fn()
+                except BaseException as e:  # surface to the consumer, then stop all stages
+                    errors.append(e)
+                    stop.set()
+            return _run
+
+        def detect_loop():
+            while not stop.is_set():
+                ctx = detect_q.get(timeout=0.1)
+                if ctx is None:
+                    continue
+                t0 = timer_for(self.clock)()
+                for step in self.detect_steps:
+                    ctx = step.run(ctx)
+                ctx.state = dataclasses.replace(ctx.state)
+                self.telemetry.time_ms("stage_detect_ms", (timer_for(self.clock)() - t0) * 1000.0)
+                effect_q.put(ctx, stop)
+
+        def effects_loop():
+            while not stop.is_set():
+                ctx = effect_q.get(timeout=0.1)
+                if ctx is None:
+                    continue
+                t0 = timer_for(self.clock)()
+                for step in self.effect_steps:
+                    ctx = step.run(ctx)
+                self.telemetry.time_ms("stage_effects_ms", (timer_for(self.clock)() - t0) * 1000.0)
+                out_q.put(ctx, stop)
+
+        threads = [
+            threading.Thread(target=guarded(fn), name=f"pipeline-{name}", daemon=True)
+            for name, fn in (
+                ("capture", lambda: self.capture_loop(detect_q, stop, state)),
+                ("detect", detect_loop),
+                ("effects", effects_loop),
+            )
+        ]
+        for t in threads:
+            t.start()
+        try:
+            while not stop.is_set():
+                ctx = out_q.get(timeout=0.1)
+                if ctx is not None:
+                    yield ctx
+            if errors:
+                raise errors[0]
+        finally:
+            stop.set()
+            for t in threads:
+                t.join(timeout=5)
+
     def run(self):
         for _ in self.iter_frames():
             pass
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Let queued alert side effects (snapshots, history, sends) finish."""
+        if self._alert_executor is not None:
+            self._alert_executor.close(timeout=timeout)
+        if self.frame_capture_step is not None:
+            self.frame_capture_step.flush()
+        if self.detection_log is not None:
+            self.detection_log.close()
@@ -1,6 +1,11 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Protocol, Iterable, Sequence, Optional, Tuple, runtime_checkable, Any
+from collections.abc import Sequence as _SequenceABC
+from dataclasses import dataclass, field
+from typing import Callable, Protocol, Iterable, Iterator, List, Sequence, Optional, Set, Tuple, runtime_checkable, Any
+
+import numpy as np
+
+from .pyramid import Pyramid
 
 # ---------- Basic types ----------
 @dataclass
@@ -10,6 +15,104 @@ class Detection:
     cls_id: int
     track_id: Optional[int] = None
 
+
+class DetectionBatch(_SequenceABC):
+    """Detections of one frame as parallel NumPy columns.
+
+    Behaves like a read-only ``Sequence[Detection]`` (iteration and indexing
+    build ``Detection`` objects on demand), while ``select`` / ``with_classes``
+    / ``best_conf`` / ``class_ids`` work on whole columns. ``track_id`` uses
+    -1 for untracked boxes.
+    """
+
+    __slots__ = ("xyxy", "conf", "cls_id", "track_id")
+
+    def __init__(self, xyxy, conf, cls_id, track_id=None):
+        self.xyxy = np.asarray(xyxy).astype(np.int32, copy=False).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32).reshape(-1)
+        self.cls_id = np.asarray(cls_id).astype(np.int64, copy=False).reshape(-1)
+        n = len(self.xyxy)
+        self.track_id = (
+            np.full(n, -1, dtype=np.int64) if track_id is None
+            else np.asarray(track_id).astype(np.int64, copy=False).reshape(-1)
+        )
+
+    @classmethod
+    def empty(cls) -> "DetectionBatch":
+        return cls(np.zeros((0, 4)), np.zeros(0), np.zeros(0))
+
+    @classmethod
+    def from_detections(cls, dets: Sequence[Detection]) -> "DetectionBatch":
+        if isinstance(dets, DetectionBatch):
+            return dets
+        if not dets:
+            return cls.empty()
+        return cls(
+            [d.xyxy for d in dets],
+            [d.conf for d in dets],
+            [d.cls_id for d in dets],
+            [-1 if d.track_id is None else d.track_id for d in dets],
+        )
+
+    def __len__(self) -> int:
+        return len(self.cls_id)
+
+    def _row(self, i: int) -> Detection:
+        tid = int(self.track_id[i])
+        return Detection(
+            xyxy=tuple(self.xyxy[i].tolist()),
+            conf=float(self.conf[i]),
+            cls_id=int(self.cls_id[i]),
+            track_id=None if tid < 0 else tid,
+        )
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            n = len(self)
+            if not -n <= key < n:
+                raise IndexError(key)
+            return self._row(int(key) % n)
+        return self.select(key)
+
+    def __iter__(self) -> Iterator[Detection]:
+        boxes, confs = self.xyxy.tolist(), self.conf.tolist()
+        for b, c, k, t in zip(boxes, confs, self.cls_id.tolist(), self.track_id.tolist()):
+            yield Detection(xyxy=tuple(b), conf=c, cls_id=k, track_id=None if t < 0 else t)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, _SequenceABC) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DetectionBatch({list(self)!r})"
+
+    def select(self, key) -> "DetectionBatch":
+        """Rows picked by a boolean mask, index array or slice."""
+        return DetectionBatch(self.xyxy[key], self.conf[key], self.cls_id[key], self.track_id[key])
+
+    def scaled(self, sx: float, sy: float) -> "DetectionBatch":
+        """Boxes mapped to an image ``sx`` / ``sy`` times the size (e.g. the full-resolution frame)."""
+        xyxy = np.rint(self.xyxy * np.array([sx, sy, sx, sy]))
+        return DetectionBatch(xyxy, self.conf, self.cls_id, self.track_id)
+
+    def with_classes(self, ids: Iterable[int], min_conf: float = 0.0) -> "DetectionBatch":
+        mask = np.isin(self.cls_id, np.fromiter(ids, dtype=np.int64))
+        if min_conf > 0:
+            mask &= self.conf >= min_conf
+        return self.select(mask)
+
+    def best_conf(self) -> float:
+        return float(self.conf.max()) if len(self) else 0.0
+
+    def class_ids(self) -> Set[int]:
+        return set(np.unique(self.cls_id).tolist())
+
+    def track_ids(self) -> List[int]:
+        return self.track_id[self.track_id >= 0].tolist()
+
 @dataclass
 class Frame:
     image: Any  # np.ndarray
@@ -17,6 +120,22 @@ class Frame:
     index: int
     w: int
     h: int
+    capture_t: Optional[float] = None  # wall time the frame existed (stream PTS), see latency.py
+    # DECODE_DUAL: builds the source-resolution BGR image; ``image`` is a scaled copy
+    full: Optional[Callable[[], Any]] = None
+    _pyramid: Pyramid = field(default_factory=Pyramid, init=False, repr=False, compare=False)
+
+    def full_image(self) -> Any:
+        """The frame at source resolution (``image`` unless the camera scaled it)."""
+        return self.image if self.full is None else self.full()
+
+    def scaled(self, width: int, gray: bool = False) -> Any:
+        """``image`` downscaled to *width* (aspect kept), memoized per frame; see pyramid.py."""
+        return self._pyramid.get(self.image, width, gray)
+
+    def cached_scaled(self, width: int, gray: bool = False) -> Any:
+        """``scaled(width, gray)`` if another consumer already computed it, else None."""
+        return self._pyramid.peek(width, gray)
 
 # ---------- Ports / Interfaces ----------
 @runtime_checkable
@@ -30,6 +149,10 @@ class Camera(Protocol):
 class Detector(Protocol):
     def detect(self, frame: Frame) -> Sequence[Detection]: ...
 
+    def detect_batch(self, frames: Sequence[Frame]) -> List[Sequence[Detection]]:
+        """One result list per frame. Default: single-frame detect() in a loop."""
+        return [self.detect(f) for f in frames]
+
 @runtime_checkable
 class ITracker(Protocol):
     def update(self, frame: Frame, dets: Sequence[Detection]) -> Sequence[Detection]: ...
@@ -47,3 +170,40 @@ class Telemetry(Protocol):
     def incr(self, name: str, value: int = 1, **tags): ...
     def gauge(self, name: str, value: float, **tags): ...
     def time_ms(self, name: str, value: float, **tags): ...
+
+# ---------- Helpers ----------
+# Work on any Sequence[Detection]; DetectionBatch inputs take the vectorized path.
+def filter_classes(
+    dets: Sequence[Detection], ids: Optional[Set[int]], min_conf: float = 0.0
+) -> Sequence[Detection]:
+    """Detections whose class is in *ids* (None = any class) and conf >= *min_conf*."""
+    if isinstance(dets, DetectionBatch):
+        if ids is None:
+            return dets.select(dets.conf >= min_conf) if min_conf > 0 else dets
+        return dets.with_classes(ids, min_conf)
+    return [d for d in dets if (ids is None or d.cls_id in ids) and d.conf >= min_conf]
+
+
+def best_conf(dets: Sequence[Detection]) -> float:
+    if isinstance(dets, DetectionBatch):
+        return dets.best_conf()
+    return max((d.conf for d in dets), default=0.0)
+
+
+def class_ids(dets: Sequence[Detection]) -> Set[int]:
+    if isinstance(dets, DetectionBatch):
+        return dets.class_ids()
+    return {d.cls_id for d in dets}
+
+
+def track_ids(dets: Sequence[Detection]) -> List[int]:
+    if isinstance(dets, DetectionBatch):
+        return dets.track_ids()
+    return [d.track_id for d in dets if d.track_id is not None]
+
+def detect_frames(det: Detector, frames: Sequence[Frame]) -> List[Sequence[Detection]]:
+    """Batch-detect when the detector supports it, else fall back to per-frame detect()."""
+    batch = getattr(det, "detect_batch", None)
+    if batch is not None:
+        return list(batch(frames))
+    return [det.detect(f) for f in frames]
@@ -0,0 +1,68 @@
+"""Downscaled variants of a frame, computed on first use and shared (``Frame.scaled``).
+
+Several consumers shrink the same frame: the detector letterbox, the motion
+gate and capture dedup thumbnails, optical flow and the pre-roll ring. Each
+asks ``frame.scaled(width)`` or
+``frame.scaled(width, gray=True)`` instead of calling ``cv2.resize``
+itself, and every size is computed at most once per frame. A new level is
+resized from the smallest level already computed that is at least as wide,
+so a 320 px level after a 640 px one costs a quarter of resizing the source.
+
+Heights follow ``scaled_size`` so a level matches what the consumers
+computed on their own before. Levels are plain arrays owned by the frame
+and dropped with it.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+THUMB_WIDTH = 160  # grayscale thumbnail shared by the motion gate and capture dedup
+
+
+def scaled_size(w: int, h: int, width: int) -> Tuple[int, int]:
+    """``(width, height)`` of a *w* x *h* image scaled to *width*, aspect kept."""
+    return width, max(1, round(h * width / w))
+
+
+class Pyramid:
+    __slots__ = ("_levels", "_lock")
+
+    def __init__(self):
+        self._levels: Dict[Tuple[int, bool], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def peek(self, width: int, gray: bool = False) -> Optional[np.ndarray]:
+        """The level for *width* if some consumer already computed it, else None."""
+        with self._lock:
+            return self._levels.get((int(width), gray))
+
+    def get(self, image: np.ndarray, width: int, gray: bool = False) -> np.ndarray:
+        """*image* scaled down to *width* (never up), BGR or single-channel gray."""
+        with self._lock:
+            return self._get(image, min(max(1, int(width)), image.shape[1]), gray)
+
+    def _get(self, image: np.ndarray, width: int, gray: bool) -> np.ndarray:
+        if width == image.shape[1] and not gray:
+            return image
+        level = self._levels.get((width, gray))
+        if level is not None:
+            return level
+        if gray:
+            base = self._get(image, width, False)
+            level = cv2.cvtColor(base, cv2.COLOR_BGR2GRAY) if base.ndim == 3 else base
+        else:
+            src = image
+            for (w, g), lvl in self._levels.items():
+                if not g and width < w < src.shape[1]:
+                    src = lvl
+            h, w = image.shape[:2]
+            level = cv2.resize(src, scaled_size(w, h, width), interpolation=cv2.INTER_AREA)
+        self._levels[(width, gray)] = level
+        return level
@@ -1,4 +1,9 @@
-from dataclasses import dataclass
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .ports import Telemetry
 from .state import PresenceState
 
 @dataclass
@@ -33,3 +38,96 @@ class FullSpeedRatePolicy:
 
     def decide(self, state: PresenceState, now: float) -> RateTarget:
         return RateTarget(0.0, 1)
+
+
+# Jetson exposes GPU utilization (0..1000) here; which path exists depends on the L4T release.
+_GPU_LOAD_PATHS = ("/sys/devices/gpu.0/load", "/sys/devices/platform/gpu.0/load")
+
+
+def system_load() -> Optional[float]:
+    """Max of normalized 1-min CPU load average and Jetson GPU load (0..1+), None if unknown."""
+    loads = []
+    try:
+        loads.append(os.getloadavg()[0] / max(1, os.cpu_count() or 1))
+    except (AttributeError, OSError):
+        pass
+    for path in _GPU_LOAD_PATHS:
+        try:
+            with open(path) as fh:
+                loads.append(int(fh.read().strip()) / 1000.0)
+            break
+        except (OSError, ValueError):
+            continue
+    return max(loads) if loads else None
+
+
+@dataclass
+class AdaptiveRatePolicy:
+    """Caps the rate chosen by *base* so detection keeps up with measured latency.
+
+    The detector is fed ``fps / vid_stride`` frames per second; with an EMA of
+    detect_ms that rate may use at most ``target_util`` of the detector's time.
+    A ``latency_budget_ms`` tightens the cap when the loop's busy time (outside
+    the rate sleep) exceeds it, and ``max_load`` does the same when
+    ``load_probe()`` (CPU / GPU load, 0..1) is above it. Below ``min_fps`` the
+    policy skips frames with a larger stride instead of slowing the loop further.
+    """
+    base: RatePolicy
+    telemetry: Optional[Telemetry] = None
+    target_util: float = 0.7
+    latency_budget_ms: float = 0.0  # 0 = off
+    max_load: float = 0.0  # 0 = don't probe
+    load_probe: Callable[[], Optional[float]] = system_load
+    load_interval_sec: float = 2.0
+    alpha: float = 0.2
+    min_fps: float = 1.0
+    max_stride: int = 8
+    detect_ema_ms: float = field(default=0.0, init=False)
+    loop_ema_ms: float = field(default=0.0, init=False)
+    load: Optional[float] = field(default=None, init=False)
+    _load_t: float = field(default=-1e9, init=False, repr=False)
+
+    def _ema(self, prev: float, value: float) -> float:
+        return value if prev <= 0 else prev + self.alpha * (value - prev)
+
+    def observe_detect(self, ms: float) -> None:
+        self.detect_ema_ms = self._ema(self.detect_ema_ms, ms)
+
+    def observe_loop(self, ms: float) -> None:
+        self.loop_ema_ms = self._ema(self.loop_ema_ms, ms)
+
+    def _detect_rate_cap(self, now: float) -> float:
+        """Max detections/sec, inf while nothing is measured."""
+        if self.detect_ema_ms <= 0:
+            return math.inf
+        cap = self.target_util * 1000.0 / self.detect_ema_ms
+        if self.latency_budget_ms > 0 and self.loop_ema_ms > self.latency_budget_ms:
+            cap *= self.latency_budget_ms / self.loop_ema_ms
+        if self.max_load > 0:
+            if now - self._load_t >= self.load_interval_sec:
+                self.load, self._load_t = self.load_probe(), now
+            if self.load is not None and self.load > self.max_load:
+                cap *= self.max_load / self.load
+        return cap
+
+    def decide(self, state: PresenceState, now: float) -> RateTarget:
+        want = self.base.decide(state, now)
+        cap = self._detect_rate_cap(now)
+        fps, stride = want.fps, max(1, want.vid_stride)
+        requested = (fps if fps > 0 else math.inf) / stride
+        throttled = requested > cap
+        if throttled:
+            fps = cap * stride
+            if fps < self.min_fps:
+                stride = min(self.max_stride, max(stride, math.ceil(self.min_fps / cap)))
+                fps = max(self.min_fps, cap * stride)
+            fps = round(fps, 2)
+        if self.telemetry is not None:
+            self.telemetry.gauge("rate_detect_ema_ms", self.detect_ema_ms)
+            self.telemetry.gauge("rate_loop_ema_ms", self.loop_ema_ms)
+            self.telemetry.gauge("rate_detect_cap", cap if math.isfinite(cap) else 0.0)
+            if self.load is not None:
+                self.telemetry.gauge("rate_load", self.load)
+            if throttled:
+                self.telemetry.incr("rate_throttled")
+        return RateTarget(fps, stride)
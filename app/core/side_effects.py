@@ -0,0 +1,99 @@
+"""Bounded worker pool for slow alert side effects (disk, SQLite, Telegram).
+
+Tasks are routed to a worker by key, so everything submitted under one key
+(e.g. the snapshots of an alert window and the send that references them)
+runs in submission order, while different keys can proceed in parallel.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Hashable, List, Optional
+
+from .ports import Telemetry
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class InlineExecutor:
+    """Runs tasks immediately on the caller's thread (ALERT_WORKERS=0).
+
+    ``submit`` returns False when the task itself returns False, so a caller
+    can react to a failed write the same way as to a dropped one.
+    """
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any, block: bool = True) -> bool:
+        return fn(*args) is not False
+
+    def close(self, timeout: float = 5.0) -> None:
+        pass
+
+
+class KeyedWorkerPool:
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        telemetry: Telemetry,
+        name: str = "side-effects",
+    ):
+        self._telemetry = telemetry
+        self._name = name
+        self._queues: List[queue.Queue] = [
+            queue.Queue(maxsize=max(1, int(queue_size))) for _ in range(max(1, int(workers)))
+        ]
+        self._threads: List[threading.Thread] = []
+        for i, q in enumerate(self._queues):
+            t = threading.Thread(target=self._work, args=(q,), name=f"{name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        self._closed = False
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any, block: bool = True) -> bool:
+        """Queue ``fn(*args)`` on the worker owning *key*.
+
+        With ``block=False`` the task is dropped (and counted) when that worker's
+        queue is full; with ``block=True`` the caller waits for room.
+        """
+        if self._closed:
+            return False
+        q = self._queues[hash(key) % len(self._queues)]
+        try:
+            q.put((fn, args), block=block)
+        except queue.Full:
+            self._telemetry.incr("side_effect_dropped", pool=self._name)
+            return False
+        self._telemetry.gauge(f"side_effect_queue_depth_{self._name}", float(q.qsize()))
+        return True
+
+    def _work(self, q: queue.Queue) -> None:
+        while True:
+            item = q.get()
+            if item is _STOP:
+                return
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception:
+                self._telemetry.incr("side_effect_errors", pool=self._name)
+                logger.warning("%s: task %r failed", self._name, fn, exc_info=True)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued work, then stop the workers."""
+        if self._closed:
+            return
+        self._closed = True
+        for q in self._queues:
+            q.put(_STOP)
+        for t in self._threads:
+            t.join(timeout=timeout)
+
+
+def build_executor(workers: int, queue_size: int, telemetry: Telemetry, name: str):
+    """KeyedWorkerPool for ``workers > 0``, otherwise synchronous execution."""
+    if workers <= 0:
+        return InlineExecutor()
+    return KeyedWorkerPool(workers, queue_size, telemetry, name=name)
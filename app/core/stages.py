@@ -0,0 +1,81 @@
+"""Bounded hand-off queues for the staged (multi-threaded) pipeline mode.
+
+Each queue has an explicit overflow policy:
+
+- ``drop_oldest``: never block the producer; evict the oldest queued item so
+  consumers always see the freshest work (camera frames, preview output).
+- ``block``: apply backpressure; the producer waits until there is room
+  (alert side effects must not be lost).
+
+Depth and drop counts are reported through the ``Telemetry`` port.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Optional
+
+from .ports import Telemetry
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+POLICIES = (DROP_OLDEST, BLOCK)
+
+
+class StageQueue:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        policy: str,
+        telemetry: Telemetry,
+        notify: Optional[threading.Event] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}; expected one of {POLICIES}")
+        self.name = name
+        self.policy = policy
+        self.dropped = 0
+        self._q: queue.Queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        self._telemetry = telemetry
+        self._notify = notify  # set after every successful put (wakes a multi-queue consumer)
+
+    def qsize(self) -> int:
+        return self._q.qsize()
+
+    def put(self, item: Any, stop: threading.Event, poll_sec: float = 0.1) -> bool:
+        """Enqueue *item* according to the policy. Returns False if stopped first."""
+        if self.policy == DROP_OLDEST:
+            while not stop.is_set():
+                try:
+                    self._q.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self._q.get_nowait()
+                        self.dropped += 1
+                        self._telemetry.incr("stage_queue_dropped", queue=self.name)
+                    except queue.Empty:
+                        pass
+            else:
+                return False
+        else:
+            while True:
+                if stop.is_set():
+                    return False
+                try:
+                    self._q.put(item, timeout=poll_sec)
+                    break
+                except queue.Full:
+                    continue
+        self._telemetry.gauge(f"stage_queue_depth_{self.name}", float(self._q.qsize()))
+        if self._notify is not None:
+            self._notify.set()
+        return True
+
+    def get(self, timeout: float) -> Optional[Any]:
+        """Dequeue one item, or None if nothing arrived within *timeout*."""
+        try:
+            return self._q.get(timeout=timeout)
+        except queue.Empty:
+            return None
@@ -0,0 +1,160 @@
+"""Tiled inference for high-resolution cameras.
+
+A 4K frame letterboxed to 640 px shrinks a distant person to a few pixels.
+``TiledDetector`` cuts the frame (or only selected regions of it) into
+overlapping ``tile_size`` squares, runs them through the wrapped detector as
+one ``detect_batch`` call, shifts the boxes back to frame pixels and merges
+duplicates across tiles with greedy non-maximum merging: boxes of one class
+that overlap a higher-confidence box by more than ``merge_thresh`` (measured
+as intersection over the *smaller* box, so a person cut in half by a tile
+edge still matches the whole one) are dropped and grow the kept box to their
+union. An optional downscaled full-frame pass keeps objects larger than a
+tile detectable.
+"""
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .boxes import IOS, nms
+from .ports import Detection, DetectionBatch, Detector, Frame, detect_frames
+
+Window = Tuple[int, int, int, int]  # x1, y1, x2, y2 in frame pixels
+
+
+def parse_regions(spec: str) -> List[Tuple[float, float, float, float]]:
+    """``"x1,y1,x2,y2|..."`` -> list of rectangles (pixels, or 0..1 normalized). Raises ValueError."""
+    out = []
+    for part in (spec or "").split("|"):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            vals = tuple(float(v) for v in part.split(","))
+        except ValueError:
+            raise ValueError(f"bad tile region {part!r}") from None
+        if len(vals) != 4 or vals[2] <= vals[0] or vals[3] <= vals[1]:
+            raise ValueError(f"bad tile region {part!r}: need x1,y1,x2,y2 with x2 > x1, y2 > y1")
+        out.append(vals)
+    return out
+
+
+def _spans(lo: int, hi: int, size: int, overlap: float, limit: int) -> List[Tuple[int, int]]:
+    """Start/end pairs of ``size``-long windows covering [lo, hi), kept inside [0, limit)."""
+    size = min(size, limit)
+    length = hi - lo
+    if length <= size:
+        start = min(max(0, (lo + hi - size) // 2), limit - size)
+        return [(start, start + size)]
+    step = size * (1.0 - overlap)
+    n = int(math.ceil((length - size) / step)) + 1
+    starts = np.linspace(lo, hi - size, n).round().astype(int)
+    return [(int(s), int(s) + size) for s in starts]
+
+
+def tile_windows(
+    w: int,
+    h: int,
+    tile_size: int,
+    overlap: float = 0.2,
+    regions: Sequence[Tuple[float, float, float, float]] = (),
+) -> List[Window]:
+    """Overlapping ``tile_size`` windows covering the frame, or only *regions* of it."""
+    rects = []
+    for x1, y1, x2, y2 in regions or [(0, 0, w, h)]:
+        if max(x1, y1, x2, y2) <= 1.0:
+            x1, x2, y1, y2 = x1 * w, x2 * w, y1 * h, y2 * h
+        rects.append((
+            max(0, int(x1)), max(0, int(y1)),
+            min(w, int(math.ceil(x2))), min(h, int(math.ceil(y2))),
+        ))
+    windows: List[Window] = []
+    for x1, y1, x2, y2 in rects:
+        for ty1, ty2 in _spans(y1, y2, tile_size, overlap, h):
+            for tx1, tx2 in _spans(x1, x2, tile_size, overlap, w):
+                win = (tx1, ty1, tx2, ty2)
+                if win not in windows:
+                    windows.append(win)
+    return windows
+
+
+class TiledDetector:
+    """Wrap a ``Detector`` so each frame is detected as a batch of tiles."""
+
+    def __init__(
+        self,
+        inner: Detector,
+        tile_size: int = 640,
+        overlap: float = 0.2,
+        regions: Sequence[Tuple[float, float, float, float]] = (),
+        full_frame: bool = True,
+        merge_thresh: float = 0.6,
+    ):
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError(f"tile overlap must be in [0, 1), got {overlap}")
+        self.inner = inner
+        self.tile_size = int(tile_size)
+        self.overlap = float(overlap)
+        self.regions = list(regions)
+        self.full_frame = full_frame
+        self.merge_thresh = float(merge_thresh)
+        self.labels = getattr(inner, "labels", None)
+        self._windows: Dict[Tuple[int, int], List[Window]] = {}
+
+    def windows(self, w: int, h: int) -> List[Window]:
+        win = self._windows.get((w, h))
+        if win is None:
+            win = tile_windows(w, h, self.tile_size, self.overlap, self.regions)
+            if self.full_frame and win == [(0, 0, w, h)]:
+                win = []  # frame fits in one tile: the full-frame pass covers it
+            self._windows[(w, h)] = win
+        return win
+
+    def split(self, frame: Frame) -> List[Frame]:
+        """Sub-frames to detect: the full frame (optional) then every tile, as views."""
+        parts = [frame] if self.full_frame else []
+        for x1, y1, x2, y2 in self.windows(frame.w, frame.h):
+            parts.append(Frame(
+                image=frame.image[y1:y2, x1:x2], t=frame.t, index=frame.index,
+                w=x2 - x1, h=y2 - y1, capture_t=frame.capture_t,
+            ))
+        return parts
+
+    def merge(self, frame: Frame, results: Sequence[Sequence[Detection]]) -> DetectionBatch:
+        """Shift per-part detections to frame pixels and merge duplicates across tiles."""
+        offsets = ([(0, 0)] if self.full_frame else []) + [
+            (x1, y1) for x1, y1, _, _ in self.windows(frame.w, frame.h)
+        ]
+        xyxy, conf, cls = [], [], []
+        for (dx, dy), dets in zip(offsets, results):
+            b = DetectionBatch.from_detections(dets)
+            if not len(b):
+                continue
+            xyxy.append(b.xyxy + np.array([dx, dy, dx, dy], dtype=np.int32))
+            conf.append(b.conf)
+            cls.append(b.cls_id)
+        if not xyxy:
+            return DetectionBatch.empty()
+        xyxy, conf, cls = np.concatenate(xyxy), np.concatenate(conf), np.concatenate(cls)
+        groups = nms(xyxy, conf, cls, self.merge_thresh, metric=IOS)
+        keep = np.array([g[0] for g in groups])
+        merged = np.stack([
+            np.concatenate((xyxy[g, :2].min(axis=0), xyxy[g, 2:].max(axis=0))) for g in groups
+        ])
+        return DetectionBatch(merged, conf[keep], cls[keep])
+
+    def detect(self, frame: Frame) -> DetectionBatch:
+        return self.merge(frame, detect_frames(self.inner, self.split(frame)))
+
+    def detect_batch(self, frames: Sequence[Frame]) -> List[DetectionBatch]:
+        """All tiles of all *frames* in one inner ``detect_batch`` call."""
+        parts: List[Frame] = []
+        spans = []
+        for f in frames:
+            p = self.split(f)
+            spans.append((len(parts), len(p)))
+            parts.extend(p)
+        results = detect_frames(self.inner, parts)
+        return [self.merge(f, results[s:s + n]) for f, (s, n) in zip(frames, spans)]
@@ -0,0 +1,93 @@
+"""Include / exclude polygons evaluated through a precomputed raster mask.
+
+Polygons are written ``x,y;x,y;x,y`` and separated by ``|``. A polygon whose
+coordinates are all within [0, 1] is read as normalized to the frame size,
+otherwise as pixels. The mask is rasterized once per frame size with
+``cv2.fillPoly``; each detection then costs one array lookup at its anchor
+point (bottom-center by default: where the object touches the ground).
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .ports import Detection, DetectionBatch
+
+ANCHOR_BOTTOM = "bottom"
+ANCHOR_CENTER = "center"
+
+
+def parse_polygons(spec: str) -> List[np.ndarray]:
+    """``"x,y;x,y;x,y|..."`` -> list of (N, 2) float arrays. Raises ValueError."""
+    polys = []
+    for part in (spec or "").split("|"):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            pts = [tuple(float(v) for v in p.split(",")) for p in part.split(";") if p.strip()]
+        except ValueError as e:
+            raise ValueError(f"bad zone polygon {part!r}: {e}") from None
+        if len(pts) < 3 or any(len(p) != 2 for p in pts):
+            raise ValueError(f"bad zone polygon {part!r}: need >= 3 'x,y' points")
+        polys.append(np.asarray(pts, dtype=np.float64))
+    return polys
+
+
+class ZoneMask:
+    def __init__(self, include: Sequence[np.ndarray] = (), exclude: Sequence[np.ndarray] = (),
+                 anchor: str = ANCHOR_BOTTOM):
+        if anchor not in (ANCHOR_BOTTOM, ANCHOR_CENTER):
+            raise ValueError(f"unknown zone anchor {anchor!r}")
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.anchor = anchor
+        self._masks: Dict[Tuple[int, int], np.ndarray] = {}
+
+    @classmethod
+    def from_spec(cls, include: str = "", exclude: str = "", anchor: str = ANCHOR_BOTTOM) -> "ZoneMask":
+        return cls(parse_polygons(include), parse_polygons(exclude), anchor)
+
+    @staticmethod
+    def _pixels(poly: np.ndarray, w: int, h: int) -> np.ndarray:
+        if poly.min() >= 0.0 and poly.max() <= 1.0:
+            poly = poly * (w - 1, h - 1)
+        return np.round(poly).astype(np.int32)
+
+    def mask(self, w: int, h: int) -> np.ndarray:
+        """uint8 (h, w) mask, 1 where detections count. Cached per frame size."""
+        m = self._masks.get((w, h))
+        if m is None:
+            if self.include:
+                m = np.zeros((h, w), dtype=np.uint8)
+                cv2.fillPoly(m, [self._pixels(p, w, h) for p in self.include], 1)
+            else:
+                m = np.ones((h, w), dtype=np.uint8)
+            if self.exclude:
+                cv2.fillPoly(m, [self._pixels(p, w, h) for p in self.exclude], 0)
+            self._masks[(w, h)] = m
+        return m
+
+    def anchors(self, dets: Sequence[Detection], w: int, h: int) -> Tuple[np.ndarray, np.ndarray]:
+        if isinstance(dets, DetectionBatch):
+            xyxy = dets.xyxy.astype(np.int64)
+        else:
+            xyxy = np.asarray([d.xyxy for d in dets], dtype=np.int64).reshape(-1, 4)
+        xs = (xyxy[:, 0] + xyxy[:, 2]) // 2
+        ys = xyxy[:, 3] if self.anchor == ANCHOR_BOTTOM else (xyxy[:, 1] + xyxy[:, 3]) // 2
+        return np.clip(xs, 0, w - 1), np.clip(ys, 0, h - 1)
+
+    def inside(self, dets: Sequence[Detection], w: int, h: int) -> np.ndarray:
+        """Boolean array: anchor point of each detection lies in the allowed area."""
+        if not dets:
+            return np.zeros(0, dtype=bool)
+        xs, ys = self.anchors(dets, w, h)
+        return self.mask(w, h)[ys, xs].astype(bool)
+
+    def filter(self, dets: Sequence[Detection], w: int, h: int) -> Sequence[Detection]:
+        keep = self.inside(dets, w, h)
+        if isinstance(dets, DetectionBatch):
+            return dets.select(keep)
+        return [d for d, k in zip(dets, keep) if k]
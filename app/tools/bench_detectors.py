@@ -0,0 +1,127 @@
+"""Compare detector backends and thread counts on the same clip.
+
+Each configuration (backend x thread count) runs over the first ``--frames``
+frames of the clip in turn, after ``--warmup`` untimed frames, so one
+configuration never competes with another for cores. Only ``detect()`` is
+timed; decoding the clip is not. Detections are compared with the first
+configuration (same class, IoU >= 0.5) to show whether a faster backend
+still finds the same objects.
+
+    python -m app.tools.bench_detectors --source clip.mp4 --model yolov8n.onnx --backends onnx,opencv --threads 1,4
+    python -m app.tools.bench_detectors --source synthetic --model yolov8s.onnx --backends onnx --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ..core.boxes import count_unmatched
+from ..core.config import Config
+from ..core.histogram import LatencyHistogram
+from ..core.ports import DetectionBatch, Detector, Frame
+from .bench_tiling import read_frames
+
+
+def run_detector_benchmark(
+    detectors: Dict[str, Callable[[], Detector]],
+    frames: Callable[[], Iterable[Frame]],
+    warmup: int = 5,
+) -> List[Dict[str, Any]]:
+    """One result dict per named detector factory, in order; *frames* yields the clip afresh."""
+    rows: List[Dict[str, Any]] = []
+    reference: Optional[List[DetectionBatch]] = None
+    for name, make in detectors.items():
+        det = make()
+        hist = LatencyHistogram()
+        results: List[DetectionBatch] = []
+        for i, frame in enumerate(frames()):
+            t0 = time.perf_counter()
+            dets = DetectionBatch.from_detections(det.detect(frame))
+            ms = (time.perf_counter() - t0) * 1000.0
+            if i < warmup:
+                continue
+            hist.record(ms)
+            results.append(dets)
+        n = len(results)
+        total = sum(len(d) for d in results)
+        row: Dict[str, Any] = {
+            "config": name,
+            "frames": n,
+            "ms_mean": hist.mean(),
+            "ms_p50": hist.percentile(50.0),
+            "ms_p95": hist.percentile(95.0),
+            "fps": 1000.0 / hist.mean() if hist.count and hist.mean() > 0 else 0.0,
+            "dets_per_frame": total / n if n else 0.0,
+            "agreement": 1.0,
+        }
+        if reference is None:
+            reference = results
+        elif total:
+            missing = sum(
+                count_unmatched(d.xyxy, d.cls_id, r.xyxy, r.cls_id) for d, r in zip(results, reference)
+            )
+            row["agreement"] = 1.0 - missing / total
+        rows.append(row)
+    return rows
+
+
+def _factories(
+    backends: Sequence[str], threads: Sequence[int], model: str, conf: float, imgsz: int, iou: float,
+) -> Dict[str, Callable[[], Detector]]:
+    from ..adapters.detector_factory import ULTRALYTICS, build_detector
+
+    out: Dict[str, Callable[[], Detector]] = {}
+    for backend in backends:
+        for n in threads if backend != ULTRALYTICS else [0]:
+            name = backend if backend == ULTRALYTICS else f"{backend}/t{n or 'auto'}"
+            out[name] = (
+                lambda b=backend, n=n: build_detector(b, model, conf=conf, imgsz=imgsz, threads=n, iou=iou)
+            )
+    return out
+
+
+def _print_report(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'config':<18}{'frames':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'fps':>8}{'dets':>8}{'agree':>8}")
+    for r in rows:
+        print(
+            f"{r['config']:<18}{r['frames']:>8}{r['ms_mean']:>9.1f}{r['ms_p50']:>9.1f}"
+            f"{r['ms_p95']:>9.1f}{r['fps']:>8.1f}{r['dets_per_frame']:>8.2f}{r['agreement']:>8.2f}"
+        )
+    print("(latency in ms per frame; agree = share of detections also found by the first config)")
+
+
+def main() -> int:
+    cfg = Config()
+    parser = argparse.ArgumentParser(description="Benchmark detector backends on one clip.")
+    parser.add_argument("--source", required=True, help="Video file (or 'synthetic').")
+    parser.add_argument("--model", default=cfg.engine, help="Model file, e.g. yolov8n.onnx (default YOLO_ENGINE).")
+    parser.add_argument("--backends", default="onnx,opencv", help="Comma-separated DETECTOR_BACKEND values.")
+    parser.add_argument("--threads", default=str(cfg.detector_threads), help="Comma-separated thread counts (0 = auto).")
+    parser.add_argument("--frames", type=int, default=200, help="Frames to time per configuration.")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed frames before timing.")
+    parser.add_argument("--imgsz", type=int, default=cfg.img_size)
+    parser.add_argument("--conf", type=float, default=cfg.conf_thresh)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    from ..app.run import resolve_path
+
+    detectors = _factories(
+        [b.strip() for b in args.backends.split(",") if b.strip()],
+        [int(t) for t in args.threads.split(",") if t.strip()],
+        resolve_path(args.model), args.conf, args.imgsz, cfg.detect_iou,
+    )
+    rows = run_detector_benchmark(
+        detectors, lambda: read_frames(args.source, args.frames + args.warmup), warmup=args.warmup,
+    )
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_report(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
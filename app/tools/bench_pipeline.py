@@ -0,0 +1,203 @@
+"""Throughput benchmark for the real Pipeline without a GPU or live camera.
+
+Drives ``Pipeline`` with a ReplayCamera (video file or synthetic frames) and a
+ReplayDetector (recorded or synthetic detections at a simulated latency). By
+default time runs on a FastForwardClock, so an hour of footage replays in
+seconds; ``--realtime`` uses the system clock instead.
+
+Pipeline settings (PIPELINE_MODE, BASE_FPS, ALERT_WORKERS, ...) come from the
+environment like the real app; outputs (snapshots, DB) go to a temp directory.
+
+    python -m app.tools.bench_pipeline --duration-sec 3600 --latency-ms 18
+    python -m app.tools.bench_pipeline --source clip.mp4 --detections clip.jsonl --json
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from ..adapters.camera_replay import SYNTHETIC, ReplayCamera
+from ..adapters.detector_replay import ReplayDetector, load_detection_script, synthetic_script
+from ..adapters.telemetry_histogram import HistogramTelemetry
+from ..core.alert_policy import AlertPolicy
+from ..core.clock import FastForwardClock, SystemClock
+from ..core.config import Config
+from ..core.pipeline import Pipeline
+from ..core.presence_policy import PresencePolicy
+from ..core.rate_policy import RatePolicy
+
+
+class CountingSink:
+    def __init__(self):
+        self.sent = 0
+
+    def send(self, text: str, image_path: Optional[str] = None) -> None:
+        self.sent += 1
+
+
+def run_benchmark(
+    cfg: Config,
+    source: str = SYNTHETIC,
+    detections: Optional[str] = None,
+    latency_ms: float = 15.0,
+    jitter_ms: float = 0.0,
+    fps: float = 0.0,
+    max_frames: int = 0,
+    duration_sec: float = 0.0,
+    realtime: bool = False,
+    speed: float = 0.0,
+    width: int = 1280,
+    height: int = 720,
+    capture_frames: bool = False,
+) -> Dict[str, Any]:
+    """Replay until the source ends, *max_frames* are read or *duration_sec* of
+    simulated time passed; return throughput, alert count and step percentiles."""
+    if not (max_frames or duration_sec or source != SYNTHETIC):
+        raise ValueError("synthetic source needs max_frames or duration_sec")
+    clock = SystemClock() if realtime else FastForwardClock(speed=speed)
+    tel = HistogramTelemetry(None, summary_sec=0)
+
+    if detections:
+        script, labels = load_detection_script(detections)
+    else:
+        script, labels = synthetic_script(width=width, height=height), None
+    det = ReplayDetector(script, latency_ms=latency_ms, jitter_ms=jitter_ms, clock=clock, labels=labels)
+    cam = ReplayCamera(source, clock=clock, fps=fps, max_frames=max_frames,
+                       width=width, height=height)
+
+    tmp = tempfile.TemporaryDirectory(prefix="bench-pipeline-")
+    cfg = dataclasses.replace(
+        cfg,
+        tile_size=0,  # scripts hold each frame's final detections
+        save_dir=os.path.join(tmp.name, "alerts"),
+        raw_frames_dir=os.path.join(tmp.name, "raw"),
+        alert_db_path=os.path.join(tmp.name, "alerts.db"),
+    )
+    frame_store = None
+    if capture_frames:
+        from ..core.frame_store import FrameStore
+
+        frame_store = FrameStore(os.path.join(tmp.name, "frames"))
+
+    sink = CountingSink()
+    pipe = Pipeline(
+        cfg=cfg,
+        clock=clock,
+        camera=cam,
+        detector=det,
+        tracker=None,
+        presence=PresencePolicy(min_frames=cfg.min_frames, min_persist_sec=cfg.min_persist_sec),
+        rate=RatePolicy(
+            base_fps=cfg.base_fps, high_fps=cfg.high_fps,
+            boost_arm_frames=cfg.boost_arm_frames, boost_min_sec=cfg.boost_min_sec,
+            cooldown_sec=cfg.cooldown_sec, base_stride=cfg.vid_stride,
+        ),
+        alerts=AlertPolicy(
+            window_sec=cfg.rate_window_sec, cooldown_sec=cfg.alert_cooldown_sec,
+            wall_clock=clock.now,
+        ),
+        sink=sink,
+        telemetry=tel,
+        frame_store=frame_store,
+    )
+
+    processed = 0
+    last_index = None
+    cam.open()
+    sim_t0 = clock.now()
+    wall_t0 = time.perf_counter()
+    try:
+        for ctx in pipe.iter_frames():
+            if ctx.frame is not None and ctx.frame.index != last_index:
+                last_index = ctx.frame.index
+                processed += 1
+            if cam.exhausted or (duration_sec and clock.now() - sim_t0 >= duration_sec):
+                break
+    finally:
+        pipe.close()
+        cam.close()
+        wall_sec = time.perf_counter() - wall_t0
+        tmp.cleanup()
+
+    sim_sec = clock.now() - sim_t0
+    return {
+        "mode": cfg.pipeline_mode,
+        "clock": "system" if realtime else "fast_forward",
+        "frames_read": cam.frames_read,
+        "frames_processed": processed,
+        "frames_dropped": cam.dropped,
+        "alerts": sink.sent,
+        "wall_sec": wall_sec,
+        "sim_sec": sim_sec,
+        "fps_wall": processed / wall_sec if wall_sec > 0 else 0.0,
+        "fps_sim": processed / sim_sec if sim_sec > 0 else 0.0,
+        "speedup": sim_sec / wall_sec if wall_sec > 0 else 0.0,
+        "steps": tel.totals.snapshot(),
+    }
+
+
+def _print_report(r: Dict[str, Any]) -> None:
+    print(
+        f"mode={r['mode']} clock={r['clock']}  frames read={r['frames_read']} "
+        f"processed={r['frames_processed']} dropped={r['frames_dropped']}  alerts={r['alerts']}"
+    )
+    print(
+        f"wall={r['wall_sec']:.2f}s sim={r['sim_sec']:.1f}s  fps(wall)={r['fps_wall']:.1f} "
+        f"fps(sim)={r['fps_sim']:.2f}  speedup={r['speedup']:.1f}x"
+    )
+    print(f"{'step':<28}{'n':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for name, s in r["steps"].items():
+        print(
+            f"{name:<28}{int(s['count']):>8}{s['mean']:>9.2f}{s['p50']:>9.2f}"
+            f"{s['p95']:>9.2f}{s['p99']:>9.2f}{s['max']:>9.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Pipeline throughput with replayed frames and detections.")
+    parser.add_argument("--source", default=SYNTHETIC, help="Video file, or 'synthetic' (default).")
+    parser.add_argument("--detections", help="JSONL detection script (default: synthetic person visits).")
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="Simulated inference latency per frame.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Std-dev of extra latency per call.")
+    parser.add_argument("--fps", type=float, default=0.0, help="Source frame rate (default: container fps, or 25).")
+    parser.add_argument("--frames", type=int, default=0, help="Stop after this many source frames.")
+    parser.add_argument("--duration-sec", type=float, default=0.0, help="Stop after this much simulated time.")
+    parser.add_argument("--size", default="1280x720", help="Synthetic frame size WxH.")
+    parser.add_argument("--realtime", action="store_true", help="Use the system clock instead of fast-forward.")
+    parser.add_argument("--speed", type=float, default=0.0, help="Fast-forward real-time factor (0 = as fast as possible).")
+    parser.add_argument("--capture-frames", action="store_true", help="Include FrameStore capture.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    if args.source == SYNTHETIC and not (args.frames or args.duration_sec):
+        args.duration_sec = 600.0
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    report = run_benchmark(
+        Config(),
+        source=args.source,
+        detections=args.detections,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fps=args.fps,
+        max_frames=args.frames,
+        duration_sec=args.duration_sec,
+        realtime=args.realtime,
+        speed=args.speed,
+        width=width,
+        height=height,
+        capture_frames=args.capture_frames,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
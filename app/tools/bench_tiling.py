@@ -0,0 +1,155 @@
+"""Compare full-frame and tiled inference on the same clip.
+
+Every frame of the clip is run through the detector once per configuration
+(full frame first, then each ``--tiles`` size), so all configurations see
+identical input. The report shows latency per frame, detections per frame,
+small detections (box height below ``--small-px``) and how many detections
+per frame each tiled run adds that the full-frame run did not find (same
+class, IoU < 0.5): the accuracy side of the trade-off.
+
+    python -m app.tools.bench_tiling --source yard_4k.mp4 --tiles 640,960 --frames 300
+    python -m app.tools.bench_tiling --source yard_4k.mp4 --tiles 640 --regions 0,0,1,0.4 --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..core.boxes import count_unmatched
+from ..core.config import Config
+from ..core.histogram import LatencyHistogram
+from ..core.ports import DetectionBatch, Detector, Frame
+from ..core.tiling import TiledDetector, parse_regions
+
+FULL_FRAME = "full_frame"
+
+
+def run_tiling_benchmark(
+    det: Detector,
+    frames: Iterable[Frame],
+    tile_sizes: Sequence[int],
+    overlap: float = 0.2,
+    regions: Sequence = (),
+    full_frame: bool = True,
+    merge_thresh: float = 0.6,
+    small_px: int = 32,
+) -> List[Dict[str, Any]]:
+    """One result dict per configuration, full-frame inference first."""
+    runners: Dict[str, Detector] = {FULL_FRAME: det}
+    for size in tile_sizes:
+        runners[f"tile_{size}"] = TiledDetector(
+            det, tile_size=size, overlap=overlap, regions=regions,
+            full_frame=full_frame, merge_thresh=merge_thresh,
+        )
+    hists = {name: LatencyHistogram() for name in runners}
+    totals = {name: {"dets": 0, "small": 0, "extra": 0, "tiles": 0} for name in runners}
+    n = 0
+    for frame in frames:
+        n += 1
+        ref: Optional[DetectionBatch] = None
+        for name, runner in runners.items():
+            t0 = time.perf_counter()
+            dets = DetectionBatch.from_detections(runner.detect(frame))
+            hists[name].record((time.perf_counter() - t0) * 1000.0)
+            tot = totals[name]
+            tot["dets"] += len(dets)
+            tot["small"] += int(((dets.xyxy[:, 3] - dets.xyxy[:, 1]) < small_px).sum())
+            if isinstance(runner, TiledDetector):
+                tot["tiles"] += len(runner.split(frame))
+                tot["extra"] += count_unmatched(dets.xyxy, dets.cls_id, ref.xyxy, ref.cls_id)
+            else:
+                tot["tiles"] += 1
+                ref = dets
+
+    out = []
+    for name, hist in hists.items():
+        tot = totals[name]
+        per = float(max(n, 1))
+        out.append({
+            "config": name,
+            "frames": n,
+            "inputs_per_frame": tot["tiles"] / per,
+            "ms_mean": hist.mean(),
+            "ms_p50": hist.percentile(50.0),
+            "ms_p95": hist.percentile(95.0),
+            "fps": 1000.0 / hist.mean() if hist.count and hist.mean() > 0 else 0.0,
+            "dets_per_frame": tot["dets"] / per,
+            "small_per_frame": tot["small"] / per,
+            "extra_vs_full_per_frame": tot["extra"] / per,
+        })
+    return out
+
+
+def read_frames(source: str, max_frames: int) -> Iterable[Frame]:
+    """Every frame of *source* in order (no pacing, no drops), up to *max_frames*."""
+    from ..adapters.camera_replay import ReplayCamera
+    from ..core.clock import FastForwardClock
+
+    cam = ReplayCamera(source, clock=FastForwardClock(), max_frames=max_frames, live=False)
+    cam.open()
+    try:
+        while True:
+            frame = cam.read()
+            if frame is None:
+                break
+            yield frame
+    finally:
+        cam.close()
+
+
+def _print_report(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'config':<14}{'inputs':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'fps':>8}"
+          f"{'dets':>8}{'small':>8}{'extra':>8}")
+    for r in rows:
+        print(
+            f"{r['config']:<14}{r['inputs_per_frame']:>8.1f}{r['ms_mean']:>9.1f}{r['ms_p50']:>9.1f}"
+            f"{r['ms_p95']:>9.1f}{r['fps']:>8.1f}{r['dets_per_frame']:>8.2f}"
+            f"{r['small_per_frame']:>8.2f}{r['extra_vs_full_per_frame']:>8.2f}"
+        )
+    print("(latency in ms per frame; dets / small / extra are per frame)")
+
+
+def main() -> int:
+    cfg = Config()
+    parser = argparse.ArgumentParser(description="Benchmark tiled vs full-frame inference on one clip.")
+    parser.add_argument("--source", required=True, help="Video file (or 'synthetic').")
+    parser.add_argument("--frames", type=int, default=200, help="Frames to evaluate.")
+    parser.add_argument("--engine", default=cfg.engine, help="Model for DETECTOR_BACKEND (default YOLO_ENGINE).")
+    parser.add_argument("--imgsz", type=int, default=cfg.img_size)
+    parser.add_argument("--conf", type=float, default=cfg.conf_thresh)
+    parser.add_argument("--tiles", default="640", help="Comma-separated tile sizes to compare.")
+    parser.add_argument("--overlap", type=float, default=cfg.tile_overlap)
+    parser.add_argument("--regions", default=cfg.tile_regions, help="Only tile these regions (TILE_REGIONS syntax).")
+    parser.add_argument("--no-full-frame", action="store_true", help="Tiles only, no full-frame pass.")
+    parser.add_argument("--small-px", type=int, default=32, help="Box height counted as small.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    from ..adapters.detector_factory import build_detector
+    from ..app.run import resolve_path
+
+    det = build_detector(
+        cfg.detector_backend, resolve_path(args.engine), conf=args.conf, imgsz=args.imgsz,
+        max_batch=cfg.detect_batch, threads=cfg.detector_threads, iou=cfg.detect_iou,
+    )
+    rows = run_tiling_benchmark(
+        det,
+        read_frames(args.source, args.frames),
+        tile_sizes=[int(s) for s in args.tiles.split(",") if s.strip()],
+        overlap=args.overlap,
+        regions=parse_regions(args.regions),
+        full_frame=not args.no_full_frame,
+        merge_thresh=cfg.tile_merge_thresh,
+        small_px=args.small_px,
+    )
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_report(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
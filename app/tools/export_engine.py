@@ -4,12 +4,14 @@ from ultralytics import YOLO
 # Choose model via env; default is yolov8n
 MODEL = os.getenv("YOLO_MODEL", "yolov8n.pt")
 ENGINE = os.getenv("YOLO_ENGINE", "yolov8n.engine")
+# Batch baked into the engine; must match DETECT_BATCH used by the detector
+BATCH = int(os.getenv("DETECT_BATCH", "1"))
 
 def main():
     print(f"[export] loading {MODEL}")
     m = YOLO(MODEL)
-    print(f"[export] exporting TensorRT engine -> {ENGINE} (FP16, 640)")
-    m.export(format="engine", half=True, device=0, imgsz=640, dynamic=False)
+    print(f"[export] exporting TensorRT engine -> {ENGINE} (FP16, 640, batch={BATCH})")
+    m.export(format="engine", half=True, device=0, imgsz=640, dynamic=False, batch=BATCH)
     # Move/rename to shared volume so alert/preview can find it
     import os, shutil
     os.makedirs("/workspace/work", exist_ok=True)
@@ -0,0 +1,111 @@
+"""Tests for the closed-loop AdaptiveRatePolicy and its pipeline wiring."""
+import numpy as np
+
+from app.core.clock import FastForwardClock
+from app.core.pipeline import Ctx, DetectStep, RateStep
+from app.core.ports import Frame
+from app.core.rate_policy import AdaptiveRatePolicy, RatePolicy, RateTarget
+from app.core.state import PresenceState
+
+
+class RecordingTel:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+    def incr(self, name, value=1, **tags):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, name, value, **tags):
+        self.gauges[name] = value
+    def time_ms(self, *a, **k): pass
+
+
+class FixedPolicy:
+    def __init__(self, fps, stride=1):
+        self.target = RateTarget(fps, stride)
+    def decide(self, state, now):
+        return self.target
+
+
+def _adaptive(fps=20.0, stride=1, **kw):
+    return AdaptiveRatePolicy(base=FixedPolicy(fps, stride), **kw)
+
+
+def test_passes_base_target_through_until_measured():
+    pol = _adaptive(fps=20.0)
+    assert pol.decide(PresenceState(), 0.0) == RateTarget(20.0, 1)
+
+
+def test_caps_fps_to_target_utilization():
+    tel = RecordingTel()
+    pol = _adaptive(fps=20.0, target_util=0.5, telemetry=tel)
+    pol.observe_detect(100.0)  # 10 detections/s max, 5/s at 50 %
+    assert pol.decide(PresenceState(), 0.0) == RateTarget(5.0, 1)
+    assert tel.counters["rate_throttled"] == 1
+    assert tel.gauges["rate_detect_cap"] == 5.0
+
+
+def test_uncapped_base_and_stride_count_toward_the_cap():
+    assert _adaptive(fps=0.0, target_util=0.5).decide(PresenceState(), 0.0).fps == 0.0
+    pol = _adaptive(fps=0.0, target_util=0.5)
+    pol.observe_detect(50.0)
+    assert pol.decide(PresenceState(), 0.0) == RateTarget(10.0, 1)
+    pol = _adaptive(fps=30.0, stride=2, target_util=0.5)
+    pol.observe_detect(50.0)  # 10 detections/s -> 20 fps at stride 2
+    assert pol.decide(PresenceState(), 0.0) == RateTarget(20.0, 2)
+
+
+def test_no_throttle_when_detector_keeps_up():
+    pol = _adaptive(fps=2.0, target_util=0.7)
+    pol.observe_detect(30.0)
+    assert pol.decide(PresenceState(), 0.0) == RateTarget(2.0, 1)
+
+
+def test_raises_stride_below_min_fps():
+    pol = _adaptive(fps=2.0, target_util=0.5, min_fps=1.0)
+    pol.observe_detect(1000.0)  # 0.5 detections/s
+    assert pol.decide(PresenceState(), 0.0) == RateTarget(1.0, 2)
+
+
+def test_detect_ema_smooths_spikes():
+    pol = _adaptive(alpha=0.2)
+    pol.observe_detect(20.0)
+    pol.observe_detect(120.0)
+    assert pol.detect_ema_ms == 40.0
+
+
+def test_latency_budget_and_load_tighten_the_cap():
+    pol = _adaptive(fps=30.0, target_util=1.0, latency_budget_ms=100.0)
+    pol.observe_detect(50.0)  # 20/s
+    pol.observe_loop(200.0)   # twice the budget
+    assert pol.decide(PresenceState(), 0.0).fps == 10.0
+
+    calls = []
+    def probe():
+        calls.append(1)
+        return 1.0
+    pol = _adaptive(fps=30.0, target_util=1.0, max_load=0.5, load_probe=probe, load_interval_sec=5.0)
+    pol.observe_detect(50.0)
+    assert pol.decide(PresenceState(), 0.0).fps == 10.0
+    pol.decide(PresenceState(), 1.0)
+    assert len(calls) == 1
+    pol.decide(PresenceState(), 6.0)
+    assert len(calls) == 2
+
+
+def test_steps_feed_the_policy():
+    pol = AdaptiveRatePolicy(base=RatePolicy(2.0, 0.0, 3, 2.0, 5.0, 1))
+    clock = FastForwardClock(start=0.0)
+    rate_step = RateStep(clock=clock, rate=pol, telemetry=RecordingTel())
+
+    class EmptyDetector:
+        def detect(self, frame):
+            return []
+
+    det_step = DetectStep(det=EmptyDetector(), tracker=None, conf_thresh=0.5,
+                          telemetry=RecordingTel(), on_latency=pol.observe_detect)
+    frame = Frame(image=np.zeros((4, 4, 3), np.uint8), t=0.0, index=1, w=4, h=4)
+    ctx = rate_step.run(Ctx())
+    det_step.run(Ctx(frame=frame))
+    rate_step.run(ctx)
+    assert pol.detect_ema_ms > 0.0
+    assert pol.loop_ema_ms > 0.0
@@ -0,0 +1,101 @@
+"""Tests for SCHEDULER_MODE=arrival (ArrivalRateStep) and the frame_age_ms metric."""
+import math
+
+import numpy as np
+import pytest
+
+from app.core.clock import FastForwardClock
+from app.core.latency import LatencyTrace
+from app.core.pipeline import ArrivalRateStep, Ctx, DetectStep, RateStep
+from app.core.ports import Frame
+from app.core.rate_policy import RateTarget
+
+
+class RecordingTel:
+    def __init__(self):
+        self.timings = {}
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, name, value, **k):
+        self.timings.setdefault(name, []).append(value)
+
+
+class FixedPolicy:
+    def __init__(self, fps):
+        self.target = RateTarget(fps, 1)
+    def decide(self, state, now):
+        return self.target
+
+
+class ArrivingCamera:
+    """Latest-frame camera on a virtual clock: frame n arrives at n * interval."""
+
+    def __init__(self, clock, interval):
+        self.clock, self.interval = clock, interval
+
+    @property
+    def seq(self):
+        return int(math.floor(self.clock.now() / self.interval + 1e-9))
+
+    def wait_for(self, after, timeout=None):
+        if self.seq > after:
+            return self.seq, None
+        wait = (after + 1) * self.interval - self.clock.now()
+        if wait > timeout:
+            self.clock.advance(timeout)
+            return after, None
+        self.clock.advance(wait)
+        return after + 1, None
+
+    def read(self):
+        seq = self.seq
+        return Frame(image=None, t=self.clock.now(), index=seq, w=0, h=0, capture_t=seq * self.interval)
+
+
+def _run(step, cam, clock, n=40):
+    ctx, reads = Ctx(now=clock.now()), []
+    for _ in range(n):
+        ctx = step.run(ctx)
+        frame = cam.read()
+        reads.append((clock.now(), clock.now() - frame.capture_t))
+        ctx.now = frame.t
+        clock.advance(0.004)  # detection + side effects
+    return reads
+
+
+@pytest.mark.parametrize("interval", [0.03, 1 / 25])
+def test_arrival_mode_reads_fresh_frames_at_the_target_rate(interval):
+    clock = FastForwardClock(start=0.0)
+    cam = ArrivingCamera(clock, interval)
+    step = ArrivalRateStep(clock=clock, rate=FixedPolicy(20.0), telemetry=RecordingTel(), cam=cam)
+    reads = _run(step, cam, clock)[5:]
+    fps = (len(reads) - 1) / (reads[-1][0] - reads[0][0])
+    assert fps == pytest.approx(20.0, rel=0.1)
+    assert max(age for _, age in reads) < 1e-6  # read the moment it arrived
+
+    clock = FastForwardClock(start=0.0)
+    cam = ArrivingCamera(clock, interval)
+    sleeping = RateStep(clock=clock, rate=FixedPolicy(20.0), telemetry=RecordingTel())
+    ages = [age for _, age in _run(sleeping, cam, clock)[5:]]
+    assert np.mean(ages) > 0.005  # sleep-based pacing reads frames that have been waiting
+
+
+def test_arrival_mode_gives_up_on_a_stalled_camera():
+    clock = FastForwardClock(start=0.0)
+    cam = ArrivingCamera(clock, interval=10.0)
+    step = ArrivalRateStep(clock=clock, rate=FixedPolicy(10.0), telemetry=RecordingTel(), cam=cam)
+    step.run(Ctx(now=0.0))
+    assert clock.now() == pytest.approx(0.1)
+
+
+def test_detect_reports_frame_age():
+    class EmptyDetector:
+        def detect(self, frame):
+            return []
+
+    tel = RecordingTel()
+    step = DetectStep(det=EmptyDetector(), tracker=None, conf_thresh=0.5, telemetry=tel)
+    frame = Frame(image=np.zeros((4, 4, 3), np.uint8), t=0.0, index=1, w=4, h=4)
+    trace = LatencyTrace(capture_t=100.0, read_t=100.05)
+    step.run(Ctx(frame=frame, trace=trace))
+    assert len(tel.timings["frame_age_ms"]) == 1 and tel.timings["frame_age_ms"][0] > 0
@@ -0,0 +1,118 @@
+"""Tests for the replay/benchmark harness: fast-forward clock, replay camera and detector."""
+import time
+
+from app.adapters.camera_replay import ReplayCamera
+from app.adapters.detector_replay import (
+    RecordingDetector,
+    ReplayDetector,
+    load_detection_script,
+    synthetic_script,
+)
+from app.core.alert_policy import AlertPolicy
+from app.core.clock import FastForwardClock
+from app.core.config import Config
+from app.core.ports import Detection, Frame
+from app.tools.bench_pipeline import run_benchmark
+
+
+def test_fast_forward_clock_sleep_costs_no_wall_time():
+    clock = FastForwardClock(start=100.0)
+    t0 = time.perf_counter()
+    clock.sleep(3600.0)
+    assert time.perf_counter() - t0 < 0.1
+    assert clock.now() == 3700.0
+    clock.sleep(-1.0)
+    assert clock.now() == 3700.0
+
+
+def test_replay_camera_paces_frames_on_clock():
+    clock = FastForwardClock(start=0.0)
+    cam = ReplayCamera(clock=clock, fps=10.0, max_frames=3, width=64, height=48)
+    cam.open()
+    frames = [cam.read() for _ in range(3)]
+    assert [f.index for f in frames] == [0, 1, 2]
+    assert [round(f.t, 3) for f in frames] == [0.0, 0.1, 0.2]
+    assert frames[0].image.shape == (48, 64, 3)
+    assert cam.read() is None and cam.exhausted
+
+
+def test_live_replay_camera_drops_frames_when_reader_is_slow():
+    clock = FastForwardClock(start=0.0)
+    cam = ReplayCamera(clock=clock, fps=10.0, width=32, height=32)
+    cam.open()
+    cam.read()
+    clock.sleep(0.55)  # a slow consumer: frames 1..4 are stale by now
+    f = cam.read()
+    assert f.index == 5
+    assert cam.dropped == 4
+
+
+def test_replay_detector_advances_clock_by_latency():
+    clock = FastForwardClock(start=0.0)
+    det = ReplayDetector({3: [Detection((0, 0, 5, 5), 0.9, 0, 7)]}, latency_ms=20.0, clock=clock)
+    img = None
+    assert det.detect(Frame(image=img, t=0.0, index=1, w=0, h=0)) == []
+    dets = det.detect(Frame(image=img, t=0.0, index=3, w=0, h=0))
+    assert dets[0].track_id == 7
+    assert abs(clock.now() - 0.040) < 1e-9
+    det.detect_batch([Frame(image=img, t=0.0, index=i, w=0, h=0) for i in range(4)])
+    assert abs(clock.now() - 0.120) < 1e-9
+
+
+def test_recording_round_trips_through_loader(tmp_path):
+    path = str(tmp_path / "dets.jsonl")
+    inner = ReplayDetector(synthetic_script(period_frames=4, present_frames=2), labels=["person", "car"])
+    rec = RecordingDetector(inner, path)
+    frames = [Frame(image=None, t=0.0, index=i, w=0, h=0) for i in range(4)]
+    expected = [rec.detect(f) for f in frames]
+    rec.close()
+    script, labels = load_detection_script(path)
+    assert labels == ["person", "car"]
+    assert [script[i] for i in range(4)] == [list(d) for d in expected]
+    assert script[0] and not script[3]
+
+
+def test_alert_policy_uses_injected_wall_clock():
+    clock = FastForwardClock(start=0.0)
+    pol = AlertPolicy(window_sec=5.0, cooldown_sec=60.0, wall_clock=clock.now)
+    pol.add([1], 0.9, now=0.0, rearm_sec=0.0)
+    assert not pol.due(0.0)
+    clock.sleep(61.0)
+    assert pol.due(61.0)
+
+
+def test_benchmark_replays_an_hour_quickly():
+    cfg = Config()
+    t0 = time.perf_counter()
+    report = run_benchmark(cfg, duration_sec=3600.0, latency_ms=15.0, width=160, height=120)
+    assert time.perf_counter() - t0 < 30.0
+    assert report["sim_sec"] >= 3600.0
+    assert report["frames_processed"] > 0
+    assert report["alerts"] > 0
+    assert report["steps"]["pipeline_loop_ms"]["count"] > 0
+    assert "p99" in report["steps"]["detect_ms"]
+
+
+def test_recording_replaces_a_previous_session(tmp_path):
+    path = str(tmp_path / "dets.jsonl")
+    for n in (3, 2):  # two sessions, frame indices restart
+        rec = RecordingDetector(ReplayDetector(synthetic_script(), labels=["person"]), path)
+        for i in range(n):
+            rec.detect(Frame(image=None, t=0.0, index=i, w=0, h=0))
+        rec.close()
+    script, labels = load_detection_script(path)
+    assert labels == ["person"] and sorted(script) == [0, 1]
+    with open(path, encoding="utf-8") as fh:
+        assert sum('"labels"' in line for line in fh) == 1
+
+
+def test_simulated_latency_shows_up_in_step_timings():
+    clock = FastForwardClock(start=0.0)
+    t0 = clock.perf_counter()
+    clock.sleep(0.25)
+    assert clock.perf_counter() - t0 >= 0.25
+
+    report = run_benchmark(Config(), duration_sec=60.0, latency_ms=40.0, width=160, height=120)
+    detect = report["steps"]["detect_ms"]
+    assert 40.0 <= detect["p50"] < 60.0 and detect["p99"] < 80.0
+    assert report["steps"]["pipeline_loop_ms"]["p50"] >= 40.0
@@ -139,3 +139,51 @@ def test_threaded_camera_close_stops_thread():
     cam.close()
     assert not cam._running
     assert not cam._thread.is_alive()
+
+
+def test_threaded_camera_read_blocks_until_a_new_frame():
+    inner = StubCv2Camera()
+    gate = threading.Event()
+    real_read = inner.cap.read
+
+    def gated_read():
+        gate.wait()
+        gate.clear()
+        return real_read()
+
+    inner.cap.read = gated_read
+    cam = ThreadedCamera(inner, timeout=0.05)
+    cam.open()
+    try:
+        assert cam.read() is None  # nothing decoded within the timeout
+
+        gate.set()
+        f1 = cam.read()
+        assert f1 is not None and f1.index == 1
+
+        waiter = {}
+        t = threading.Thread(target=lambda: waiter.update(frame=cam.wait_for(1, timeout=2.0)))
+        t.start()
+        time.sleep(0.02)
+        assert t.is_alive()  # blocked on the condition, not polling a stale frame
+        gate.set()
+        t.join(timeout=2.0)
+        assert waiter["frame"][0] == 2
+    finally:
+        cam._running = False
+        gate.set()
+        cam.close()
+
+
+def test_threaded_camera_counts_dropped_frames():
+    inner = StubCv2Camera()
+    cam = ThreadedCamera(inner)
+    cam.open()
+    try:
+        first = cam.read()
+        time.sleep(0.05)
+        second = cam.read()
+        assert second.index > first.index
+        assert cam.dropped == second.index - first.index - 1
+    finally:
+        cam.close()
@@ -0,0 +1,158 @@
+"""Tests for the shared-memory frame ring and the camera reading from it (in-process writer)."""
+import os
+
+import numpy as np
+import pytest
+
+from app.adapters.camera_shm import ShmCamera, shm_name_for
+from app.adapters.shm_ring import ShmFrameRing
+
+
+@pytest.fixture
+def ring_name(request):
+    return f"yolo_test_{os.getpid()}_{request.node.name[-20:]}"
+
+
+def _img(value, w=32, h=24):
+    return np.full((h, w, 3), value, dtype=np.uint8)
+
+
+def test_ring_handoff_to_several_readers_without_copies(ring_name):
+    writer = ShmFrameRing.create(ring_name, 32, 24, slots=3)
+    try:
+        a, b = ShmFrameRing.attach(ring_name), ShmFrameRing.attach(ring_name)
+        assert (a.width, a.height, a.slots) == (32, 24, 3) and a.latest == -1
+
+        assert writer.write(_img(7), t=1.0, capture_t=0.9) == 0
+        for reader in (a, b):
+            view, t, cap_t = reader.read(reader.latest)
+            assert int(view[0, 0, 0]) == 7 and (t, cap_t) == (1.0, 0.9)
+            assert not view.flags.writeable and not view.flags.owndata
+
+        writer.write(_img(8), t=2.0)
+        assert a.read(1)[2] is None  # capture time unknown
+        for v in range(9, 12):
+            writer.write(_img(v), t=float(v))
+        assert a.read(0) is None  # lapped: slot now holds a newer frame
+        assert int(a.read(a.latest)[0][0, 0, 0]) == 11
+        a.close()
+        b.close()
+    finally:
+        writer.close()
+    with pytest.raises(FileNotFoundError):
+        ShmFrameRing.attach(ring_name)
+
+
+def test_create_refuses_a_live_writer(ring_name):
+    writer = ShmFrameRing.create(ring_name, 8, 8)
+    try:
+        with pytest.raises(RuntimeError):
+            ShmFrameRing.create(ring_name, 8, 8)
+    finally:
+        writer.close()
+
+
+def test_camera_reads_newest_frame_and_counts_dropped(ring_name):
+    writer = ShmFrameRing.create(ring_name, 32, 24, slots=4)
+    cam = ShmCamera("shm://" + ring_name, timeout=0.05)
+    try:
+        cam.open()
+        assert cam.shape() == (24, 32)
+        writer.write(_img(1), t=1.0, capture_t=0.5)
+        f = cam.read()
+        assert int(f.image[0, 0, 0]) == 1 and f.index == 1 and f.capture_t == 0.5
+        assert (f.w, f.h) == (32, 24)
+
+        for v in (2, 3, 4):
+            writer.write(_img(v), t=float(v))
+        f = cam.read()
+        assert int(f.image[0, 0, 0]) == 4 and cam.dropped == 2
+
+        assert cam.read() is None  # nothing new within the timeout
+    finally:
+        cam.close()
+        writer.close()
+
+
+def test_open_without_decoder_fails(ring_name):
+    cam = ShmCamera(ring_name, open_timeout=0.1)
+    with pytest.raises(RuntimeError):
+        cam.open()
+
+
+def test_shm_name_is_stable_per_source():
+    assert shm_name_for("rtsp://a/1") == shm_name_for("rtsp://a/1") != shm_name_for("rtsp://a/2")
+
+
+def test_frames_outlive_the_ring_slots(ring_name):
+    from app.core.frame_pool import FramePool
+
+    writer = ShmFrameRing.create(ring_name, 32, 24, slots=2)
+    cam = ShmCamera("shm://" + ring_name, timeout=0.05, pool=FramePool(8))
+    try:
+        cam.open()
+        kept = []
+        for v in range(1, 6):  # keep every frame across more writes than the ring has slots
+            writer.write(_img(v), t=float(v))
+            kept.append(cam.read())
+        assert [int(f.image[0, 0, 0]) for f in kept] == [1, 2, 3, 4, 5]
+        assert all(f.image.flags.owndata for f in kept) and cam.pool.high_water == 5
+
+        del kept
+        writer.write(_img(6), t=6.0)
+        assert int(cam.read().image[0, 0, 0]) == 6 and cam.pool.hits == 1  # released buffers come back
+    finally:
+        cam.close()
+        writer.close()
+
+
+def test_copy_torn_by_the_writer_is_retried(ring_name):
+    writer = ShmFrameRing.create(ring_name, 32, 24, slots=2)
+    cam = ShmCamera("shm://" + ring_name, timeout=0.05)
+    try:
+        cam.open()
+        writer.write(_img(1), t=1.0)
+        copy = cam._copy
+
+        def lapped(view):  # the decoder publishes two frames while we copy
+            out = copy(view)
+            for v in (2, 3):
+                writer.write(_img(v), t=float(v))
+            cam._copy = copy
+            return out
+
+        cam._copy = lapped
+        f = cam.read()
+        assert int(f.image[0, 0, 0]) == 3 and f.index == 3
+    finally:
+        cam.close()
+        writer.close()
+
+
+def test_checksum_rejects_pixels_seen_before_or_after_their_seq(ring_name, monkeypatch):
+    from app.adapters import shm_ring
+
+    monkeypatch.setattr(shm_ring, "CHECKSUM", True)
+    writer = ShmFrameRing.create(ring_name, 32, 24, slots=2)
+    reader = ShmFrameRing.attach(ring_name)
+    try:
+        for v in (1, 2, 3):
+            writer.write(_img(v), t=float(v), capture_t=0.5 if v == 3 else None)
+        view, t, cap_t = reader.read(2)
+        assert reader.verify(2, view.copy(), t, cap_t)
+        assert not reader.verify(2, _img(1), t, cap_t)  # seq 2 published, slot still shows frame 0
+        assert not reader.verify(2, view.copy(), t + 1.0, cap_t)
+        view, t, cap_t = reader.read(1)
+        assert cap_t is None and reader.verify(1, view.copy(), t, cap_t)
+
+        cam = ShmCamera("shm://" + ring_name, timeout=0.05)
+        cam.open()
+        writer.write(_img(4), t=4.0)
+        writer._crc[writer.latest % 2] ^= 1  # as if the pixels were seen before the checksum
+        assert cam.read() is None
+        writer.write(_img(5), t=5.0)
+        assert int(cam.read().image[0, 0, 0]) == 5
+        cam.close()
+    finally:
+        reader.close()
+        writer.close()
@@ -0,0 +1,106 @@
+"""Tests for the CPU detector backends' shared decode path, the factory and the bench."""
+import numpy as np
+import pytest
+
+from app.adapters.detector_factory import build_detector
+from app.adapters.yolo_io import ArrayYoloDetector, decode_yolo, parse_labels
+from app.core.ports import Detection, DetectionBatch, Frame
+from app.tools.bench_detectors import run_detector_benchmark
+
+
+def _raw(rows, nc=3):
+    """(4 + nc, N) YOLOv8 output from (cx, cy, w, h, cls, score) rows."""
+    out = np.zeros((4 + nc, len(rows)), dtype=np.float32)
+    for j, (cx, cy, w, h, k, s) in enumerate(rows):
+        out[:4, j] = (cx, cy, w, h)
+        out[4 + k, j] = s
+    return out
+
+
+def test_decode_filters_and_suppresses_per_class():
+    pred = _raw([
+        (50, 50, 20, 40, 0, 0.9),
+        (52, 50, 20, 40, 0, 0.8),   # same person, lower score -> suppressed
+        (50, 50, 20, 40, 2, 0.7),   # same box, other class -> kept
+        (200, 200, 10, 10, 0, 0.1),  # below threshold
+    ])
+    xyxy, conf, cls = decode_yolo(pred, conf_thresh=0.5)
+    np.testing.assert_allclose(xyxy, [[40, 30, 60, 70], [40, 30, 60, 70]])
+    np.testing.assert_allclose(conf, [0.9, 0.7])
+    assert cls.tolist() == [0, 2]
+    assert len(decode_yolo(_raw([]), conf_thresh=0.5)[0]) == 0
+
+
+def test_parse_labels_from_model_metadata():
+    assert parse_labels("{0: 'person', 1: 'bicycle'}") == {0: "person", 1: "bicycle"}
+    assert parse_labels(["person", "car"]) == {0: "person", 1: "car"}
+    assert parse_labels("not a dict {") is None and parse_labels(None) is None
+
+
+class FakeNet(ArrayYoloDetector):
+    """Always sees one person centred in the letterboxed input."""
+
+    imgsz = 64
+
+    def __init__(self, **kw):
+        super().__init__(conf=0.5, **kw)
+        self.batches = []
+
+    def _forward(self, batch):
+        self.batches.append(batch.shape[0])
+        return np.stack([_raw([(32, 32, 16, 32, 0, 0.9)]) for _ in range(batch.shape[0])])
+
+
+def test_array_detector_maps_boxes_to_frame_pixels():
+    det = FakeNet(max_batch=2)
+    frame = Frame(image=np.zeros((64, 128, 3), np.uint8), t=0.0, index=1, w=128, h=64)
+    dets = det.detect(frame)
+    assert isinstance(dets, DetectionBatch)
+    # r = 0.5, top pad 16: (24, 16, 40, 48) in the letterbox -> (48, 0, 80, 64)
+    assert dets == [Detection((48, 0, 80, 64), pytest.approx(0.9), 0)]
+    assert det.labels[0] == "person"
+
+    det.detect_batch([frame] * 3)
+    assert det.batches == [1, 2, 1]
+
+
+def test_fixed_batch_models_always_get_a_full_batch():
+    det = FakeNet()
+    det.model_batch = 4
+    det.max_batch = 4
+    out = det.detect_batch([Frame(image=np.zeros((64, 64, 3), np.uint8), t=0.0, index=1, w=64, h=64)])
+    assert det.batches == [4] and len(out) == 1
+
+
+def test_factory_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        build_detector("tensorflow", "m.onnx", conf=0.5, imgsz=640)
+
+
+def test_detector_benchmark_reports_agreement():
+    class Boxes:
+        def __init__(self, boxes):
+            self.boxes = boxes
+        def detect(self, frame):
+            return [Detection(b, 0.9, 0) for b in self.boxes]
+
+    frames = [Frame(image=np.zeros((8, 8, 3), np.uint8), t=0.0, index=i, w=8, h=8) for i in range(4)]
+    rows = run_detector_benchmark(
+        {
+            "ref": lambda: Boxes([(0, 0, 10, 10)]),
+            "extra": lambda: Boxes([(0, 0, 10, 10), (50, 50, 60, 60)]),
+        },
+        lambda: iter(frames),
+        warmup=1,
+    )
+    assert [r["config"] for r in rows] == ["ref", "extra"]
+    assert rows[0]["frames"] == 3 and rows[0]["agreement"] == 1.0
+    assert rows[1]["dets_per_frame"] == 2.0 and rows[1]["agreement"] == 0.5
+
+
+def test_array_detector_without_forward_fails_at_construction():
+    class NoForward(ArrayYoloDetector):
+        pass
+
+    with pytest.raises(TypeError):
+        NoForward(conf=0.5)
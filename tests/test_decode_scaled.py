@@ -0,0 +1,70 @@
+"""Tests for reduced-resolution decoding (DECODE_WIDTH) and dual output (DECODE_DUAL)."""
+import cv2
+import numpy as np
+
+from app.adapters.camera_cv2 import Cv2Camera, _gst_rtsp_pipeline, i420_to_bgr
+from app.core.frame_pool import FramePool
+from app.core.pipeline import _save_snapshot
+from app.core.ports import Detection, Frame
+
+
+def _i420(w=320, h=180):
+    bgr = np.zeros((h, w, 3), np.uint8)
+    bgr[:, : w // 2] = (255, 0, 0)
+    bgr[:, w // 2:] = (0, 200, 0)
+    return bgr, cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420)
+
+
+class I420Cap:
+    def __init__(self, yuv):
+        self.yuv = yuv
+    def read(self, image=None):
+        if image is not None and image.shape == self.yuv.shape:
+            np.copyto(image, self.yuv)
+            return True, image
+        return True, self.yuv.copy()
+    def get(self, prop):
+        return 0.0
+    def release(self):
+        pass
+
+
+def test_pipelines_scale_before_color_conversion():
+    scaled = _gst_rtsp_pipeline("rtsp://cam/1", 200, width=640)
+    assert scaled.index("videoscale") < scaled.index("videoconvert")
+    assert "width=640" in scaled
+    dual = _gst_rtsp_pipeline("rtsp://cam/1", 200, width=640, i420=True)
+    assert "format=I420" in dual and "videoscale" not in dual
+
+
+def test_i420_scaled_conversion_matches_full_conversion():
+    bgr, yuv = _i420()
+    small = i420_to_bgr(yuv, 160)
+    assert small.shape == (90, 160, 3)
+    ref = cv2.resize(cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420), (160, 90), interpolation=cv2.INTER_AREA)
+    assert np.abs(small.astype(int) - ref.astype(int)).max() <= 8
+    assert i420_to_bgr(yuv).shape == (180, 320, 3)
+
+
+def test_dual_camera_delivers_scaled_frame_and_full_resolution_on_demand():
+    bgr, yuv = _i420()
+    cam = Cv2Camera("rtsp://cam/1", pool=FramePool(4), decode_width=160, dual=True)
+    cam.cap, cam._i420 = I420Cap(yuv), True  # as opened through GStreamer
+    frames = [cam.read() for _ in range(3)]
+    f = frames[-1]
+    assert f.image.shape == (90, 160, 3) and (f.w, f.h) == (160, 90)
+    full = f.full_image()
+    assert full.shape == (180, 320, 3)
+    assert np.abs(full.astype(int) - bgr.astype(int)).max() <= 8
+    assert frames[0].image.ctypes.data != f.image.ctypes.data  # frames still referenced keep their buffers
+
+
+def test_snapshot_is_drawn_at_full_resolution(tmp_path):
+    bgr, yuv = _i420()
+    small = i420_to_bgr(yuv, 160)
+    frame = Frame(image=small, t=0.0, index=1, w=160, h=90, full=lambda: cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420))
+    path = str(tmp_path / "snap.jpg")
+    _save_snapshot(path, frame, [Detection((10, 10, 50, 50), 0.9, 0)], draw_ids={0}, conf=0.5)
+    saved = cv2.imread(path)
+    assert saved.shape == (180, 320, 3)
+    assert np.array_equal(small, i420_to_bgr(yuv, 160))  # the pipeline frame is not drawn on
@@ -0,0 +1,244 @@
+"""Tests for batched detection: letterbox buffer, vectorized conversion and fallbacks."""
+import threading
+
+import numpy as np
+
+from app.core.ports import Detection, Detector, Frame, detect_frames
+from app.core.config import Config
+from app.core.clock import SystemClock
+from app.core.presence_policy import PresencePolicy
+from app.core.rate_policy import RatePolicy
+from app.core.alert_policy import AlertPolicy
+from app.core.pipeline import Ctx, Pipeline
+from app.core.multi_camera import MultiCameraHost
+from app.adapters.yolo_io import LetterboxBatch, to_detections
+
+
+def _frame(w, h, i=0):
+    return Frame(image=np.zeros((h, w, 3), dtype=np.uint8), t=float(i), index=i, w=w, h=h)
+
+
+# ---------------------------------------------------------------------------
+# LetterboxBatch
+# ---------------------------------------------------------------------------
+
+def test_letterbox_reuses_preallocated_buffer():
+    lb = LetterboxBatch(64, max_batch=2)
+    a = lb.fill([np.zeros((48, 64, 3), np.uint8), np.zeros((64, 32, 3), np.uint8)])
+    b = lb.fill([np.zeros((48, 64, 3), np.uint8)])
+    assert a.shape == (2, 3, 64, 64) and a.dtype == np.float32
+    assert b.shape == (1, 3, 64, 64)
+    assert np.shares_memory(a, b)
+
+
+def test_letterbox_pads_and_converts_bgr_to_rgb():
+    img = np.zeros((32, 64, 3), np.uint8)
+    img[..., 0] = 255  # pure blue in BGR
+    lb = LetterboxBatch(64)
+    out = lb.fill([img])[0]
+    # content band: rows 16..48, blue ends up in the last (B) channel of RGB
+    assert out[2, 32, 32] == 1.0 and out[0, 32, 32] == 0.0
+    # padding rows use the YOLO grey
+    assert np.isclose(out[0, 0, 0], 114 / 255.0)
+    assert tuple(lb.pads[0]) == (0, 16)
+
+
+def test_unscale_maps_boxes_back_to_source_pixels():
+    lb = LetterboxBatch(64)
+    lb.fill([np.zeros((32, 128, 3), np.uint8)])  # r = 0.5, top pad = 24
+    boxes = np.array([[0, 24, 32, 40], [60, 0, 80, 70]], dtype=np.float32)
+    out = lb.unscale(0, boxes)
+    np.testing.assert_allclose(out[0], [0, 0, 64, 32])
+    assert out[1, 2] == 128 and out[1, 1] == 0  # clipped to frame
+
+
+def test_to_detections_vectorized_conversion():
+    dets = to_detections(
+        np.array([[1.7, 2.2, 10.9, 20.0]]), np.array([0.5]), np.array([2.0]), np.array([7.0])
+    )
+    assert dets == [Detection((1, 2, 10, 20), 0.5, 2, track_id=7)]
+    assert isinstance(dets[0].conf, float) and isinstance(dets[0].cls_id, int)
+    assert to_detections(np.zeros((0, 4)), np.zeros(0), np.zeros(0)) == []
+
+
+# ---------------------------------------------------------------------------
+# Fallbacks for single-frame detectors
+# ---------------------------------------------------------------------------
+
+class SingleFrameDetector(Detector):
+    def detect(self, frame):
+        return [Detection((0, 0, 1, 1), 0.9, frame.index)]
+
+
+class DuckDetector:
+    def detect(self, frame):
+        return [Detection((0, 0, 1, 1), 0.5, frame.index)]
+
+
+def test_protocol_default_detect_batch_loops():
+    frames = [_frame(8, 8, i) for i in range(3)]
+    out = SingleFrameDetector().detect_batch(frames)
+    assert [d[0].cls_id for d in out] == [0, 1, 2]
+
+
+def test_detect_frames_falls_back_for_duck_typed_detectors():
+    frames = [_frame(8, 8, i) for i in range(2)]
+    assert [d[0].cls_id for d in detect_frames(DuckDetector(), frames)] == [0, 1]
+
+
+# ---------------------------------------------------------------------------
+# Multi-camera host batches ready cameras
+# ---------------------------------------------------------------------------
+
+class FakeCamera:
+    def open(self): pass
+    def grab(self): return True
+    def read(self): return _frame(64, 48)
+    def close(self): pass
+
+
+class NullSink:
+    def send(self, text, image_path=None): pass
+
+
+class NullTel:
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+def _pipe(tmp_path, det, **overrides):
+    cfg = Config()
+    cfg.save_dir = str(tmp_path / "alerts")
+    cfg.alert_db_path = str(tmp_path / "alert_history.db")
+    cfg.draw = False
+    for k, v in overrides.items():
+        setattr(cfg, k, v)
+    return Pipeline(
+        cfg=cfg,
+        clock=SystemClock(),
+        camera=FakeCamera(),
+        detector=det,
+        tracker=None,
+        presence=PresencePolicy(min_frames=3, min_persist_sec=0.5),
+        rate=RatePolicy(base_fps=0, high_fps=0, boost_arm_frames=3,
+                        boost_min_sec=0.5, cooldown_sec=3, base_stride=1),
+        alerts=AlertPolicy(window_sec=1.0),
+        sink=NullSink(),
+        telemetry=NullTel(),
+    )
+
+
+def test_multi_camera_host_batches_ready_cameras(tmp_path):
+    class BatchDetector:
+        labels = ["person"]
+        def __init__(self):
+            self.batches = []
+        def detect(self, frame):
+            raise AssertionError("single-frame path should not be used")
+        def detect_batch(self, frames):
+            self.batches.append(len(frames))
+            return [[Detection((1, 1, 5, 5), 0.9, 0)] for _ in frames]
+
+    det = BatchDetector()
+    pipes = {n: _pipe(tmp_path, det) for n in ("a", "b")}
+    host = MultiCameraHost(pipelines=pipes, telemetry=NullTel(), batch_size=2)
+    stop = threading.Event()
+    for slot in host._slots:
+        slot.queue.put(Ctx(frame=_frame(64, 48), now=1.0), stop)
+    picked = host._pick_many(2)
+    results = host._detect(picked)
+    assert det.batches == [2]
+    assert [len(ctx.dets) for _, ctx in results] == [1, 1]
+
+
+def test_multi_camera_host_batches_tiles_of_tiled_cameras(tmp_path):
+    class BatchDetector:
+        labels = ["person"]
+        def __init__(self):
+            self.batches = []
+        def detect(self, frame):
+            raise AssertionError("single-frame path should not be used")
+        def detect_batch(self, frames):
+            self.batches.append([(f.w, f.h) for f in frames])
+            return [[Detection((1, 1, 5, 5), 0.9, 0)] for _ in frames]
+
+    det = BatchDetector()
+    pipes = {
+        "a": _pipe(tmp_path, det),
+        "b": _pipe(tmp_path, det, tile_size=64, tile_overlap=0.0, tile_full_frame=False),
+    }
+    host = MultiCameraHost(pipelines=pipes, telemetry=NullTel(), batch_size=2)
+    stop = threading.Event()
+    for slot in host._slots:
+        slot.queue.put(Ctx(frame=_frame(128, 64), now=1.0), stop)
+    results = host._detect(host._pick_many(2))
+    # camera a: one full frame; camera b: two 64x64 tiles, all in one call
+    assert det.batches == [[(128, 64), (64, 64), (64, 64)]]
+    # b's two tile hits land at different offsets and are not merged
+    assert [len(ctx.dets) for _, ctx in results] == [1, 2]
+
+
+# ---------------------------------------------------------------------------
+# Static-batch engines see a full batch on every call
+# ---------------------------------------------------------------------------
+
+def _ultralytics_detector(monkeypatch, **kw):
+    import sys
+    import types
+
+    calls = []
+
+    class FakeResult:
+        boxes = None
+
+    class FakeYOLO:
+        names = {0: "person"}
+        def __init__(self, *a, **k): pass
+        def predict(self, source, **k):
+            calls.append(tuple(source.shape))
+            assert source.shape[0] == 4, "static engine batch"
+            return [FakeResult() for _ in range(source.shape[0])]
+
+    monkeypatch.setitem(sys.modules, "ultralytics", types.SimpleNamespace(YOLO=FakeYOLO))
+    monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(from_numpy=lambda a: a))
+    import app.adapters
+
+    monkeypatch.delitem(sys.modules, "app.adapters.detector_ultra", raising=False)
+    from app.adapters.detector_ultra import UltralyticsDetector
+
+    del sys.modules["app.adapters.detector_ultra"], app.adapters.detector_ultra  # built against the fakes
+    return UltralyticsDetector("x.engine", conf=0.5, imgsz=32, max_batch=4, **kw), calls
+
+
+def test_ultralytics_pads_partial_chunks_to_the_engine_batch(monkeypatch):
+    det, calls = _ultralytics_detector(monkeypatch)
+    out = det.detect_batch([_frame(64, 48, i) for i in range(6)])
+    assert len(out) == 6 and calls == [(4, 3, 32, 32), (4, 3, 32, 32)]
+    assert det.detect(_frame(64, 48)) == [] and calls[-1] == (4, 3, 32, 32)
+
+
+def test_ultralytics_tracker_needs_a_batch_one_engine(monkeypatch):
+    import pytest
+
+    with pytest.raises(ValueError):
+        _ultralytics_detector(monkeypatch, tracker_cfg="bytetrack.yaml")
+
+
+def test_array_detector_pads_partial_chunks_to_model_batch():
+    from app.adapters.yolo_io import ArrayYoloDetector
+
+    class FixedBatch(ArrayYoloDetector):
+        imgsz = 32
+        model_batch = 3
+        def __init__(self):
+            super().__init__(conf=0.5)
+            self.shapes = []
+        def _forward(self, batch):
+            self.shapes.append(batch.shape[0])
+            return np.zeros((batch.shape[0], 84, 0), np.float32)
+
+    det = FixedBatch()
+    assert len(det.detect_batch([_frame(64, 48, i) for i in range(4)])) == 4
+    det.detect(_frame(64, 48))
+    assert det.shapes == [3, 3, 3]
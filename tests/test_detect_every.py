@@ -0,0 +1,90 @@
+"""Tests for detect-every-k: tracker interpolation between detector passes and box flow."""
+import numpy as np
+
+from app.adapters.tracker_sort import SortTracker
+from app.core.flow import BoxFlow
+from app.core.pipeline import Ctx, DetectStep
+from app.core.ports import Detection, DetectionBatch, Frame
+
+
+class NullTel:
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+class MovingPerson:
+    """One 40x100 person moving *dx* px per frame; counts detector calls."""
+
+    def __init__(self, dx=2, present=True):
+        self.dx = dx
+        self.present = present
+        self.calls = []
+
+    def detect(self, frame):
+        self.calls.append(frame.index)
+        if not self.present:
+            return []
+        x = 100 + self.dx * frame.index
+        return [Detection((x, 100, x + 40, 200), 0.9, 0)]
+
+
+def _run(step, n):
+    out = []
+    for i in range(n):
+        ctx = Ctx()
+        ctx.frame = Frame(image=np.zeros((480, 640, 3), np.uint8), t=i * 0.1, index=i, w=640, h=480)
+        out.append(step.run(ctx).dets)
+    return out
+
+
+def _step(det, every=3, max_shift=0.0, min_hits=1):
+    return DetectStep(
+        det=det, tracker=SortTracker(min_hits=min_hits), conf_thresh=0.5,
+        telemetry=NullTel(), every=every, max_shift=max_shift,
+    )
+
+
+def test_detector_runs_every_k_frames_and_tracks_fill_the_gaps():
+    det = MovingPerson()
+    out = _run(_step(det, every=3), 9)
+    assert det.calls == [0, 1, 2, 5, 8]  # full rate until the velocity settles
+    assert all(len(d) == 1 for d in out)
+    assert len({int(d.track_id[0]) for d in out}) == 1
+    # the interpolated boxes keep moving right
+    assert out[4].xyxy[0, 0] > out[3].xyxy[0, 0] > out[2].xyxy[0, 0]
+
+
+def test_no_tracks_means_detector_on_every_frame():
+    det = MovingPerson(present=False)
+    _run(_step(det, every=4), 4)
+    assert det.calls == [0, 1, 2, 3]
+    det = MovingPerson()
+    _run(_step(det, every=4, min_hits=3), 4)
+    assert det.calls[:3] == [0, 1, 2]  # tentative tracks are not interpolated
+
+
+def test_k_shrinks_for_fast_objects():
+    slow = _step(MovingPerson(dx=1), every=4, max_shift=0.2)
+    fast = _step(MovingPerson(dx=10), every=4, max_shift=0.2)  # a quarter box width per frame
+    _run(slow, 20)
+    _run(fast, 20)
+    assert slow._k == 4
+    assert fast._k == 1
+
+
+def test_box_flow_follows_texture_the_prediction_misses():
+    rng = np.random.default_rng(0)
+    patch = rng.integers(0, 255, (100, 40, 3), dtype=np.uint8)
+
+    def frame(x):
+        img = np.zeros((240, 320, 3), np.uint8)
+        img[80:180, x:x + 40] = patch
+        return Frame(image=img, t=0.0, index=0, w=320, h=240)
+
+    flow = BoxFlow(width=320)
+    flow.observe(frame(100), DetectionBatch([(100, 80, 140, 180)], [0.9], [0], [7]))
+    stale = DetectionBatch([(100, 80, 140, 180)], [0.9], [0], [7])  # prediction: did not move
+    moved = flow.refine(frame(112), stale)
+    assert abs(int(moved.xyxy[0, 0]) - 112) <= 1
+    assert moved.track_id.tolist() == [7]
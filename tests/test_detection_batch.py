@@ -0,0 +1,93 @@
+"""Tests for the structure-of-arrays DetectionBatch and the steps consuming it."""
+import numpy as np
+import pytest
+
+from app.core.detection_log import DetectionLog, read_detections
+from app.core.frame_store import FrameStore
+from app.core.pipeline import Ctx, TriggerFilterStep
+from app.core.ports import (
+    Detection,
+    DetectionBatch,
+    Frame,
+    best_conf,
+    class_ids,
+    filter_classes,
+    track_ids,
+)
+from app.core.zones import ZoneMask
+
+
+class NullTel:
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+DETS = [
+    Detection((0, 0, 10, 10), 0.5, 0, None),
+    Detection((100, 0, 120, 40), 0.75, 2, 4),
+    Detection((50, 10, 80, 90), 0.25, 0, 9),
+]
+
+
+def _batch():
+    return DetectionBatch.from_detections(DETS)
+
+
+def test_behaves_like_a_sequence_of_detections():
+    b = _batch()
+    assert len(b) == 3 and bool(b) and not DetectionBatch.empty()
+    assert list(b) == DETS
+    assert b == DETS and DETS == b
+    assert b[1] == DETS[1] and b[-1] == DETS[2]
+    assert isinstance(b[0].conf, float) and isinstance(b[0].xyxy[0], int)
+    assert b[1:] == DETS[1:]
+    assert DETS[0] in b
+    with pytest.raises(IndexError):
+        b[3]
+    assert DetectionBatch.from_detections(b) is b
+
+
+def test_column_operations():
+    b = _batch()
+    assert b.with_classes({0}) == [DETS[0], DETS[2]]
+    assert b.with_classes({0}, min_conf=0.3) == [DETS[0]]
+    assert b.select(b.conf > 0.6) == [DETS[1]]
+    assert b.best_conf() == 0.75 and DetectionBatch.empty().best_conf() == 0.0
+    assert b.class_ids() == {0, 2}
+    assert b.track_ids() == [4, 9]
+
+
+@pytest.mark.parametrize("dets", [DETS, _batch()], ids=["list", "batch"])
+def test_helpers_agree_for_lists_and_batches(dets):
+    assert list(filter_classes(dets, {2})) == [DETS[1]]
+    assert list(filter_classes(dets, None, min_conf=0.5)) == [DETS[0], DETS[1]]
+    assert best_conf(dets) == 0.75
+    assert class_ids(dets) == {0, 2}
+    assert track_ids(dets) == [4, 9]
+
+
+def test_trigger_filter_and_zones_keep_batches():
+    frame = Frame(image=None, t=0.0, index=1, w=200, h=100)
+    step = TriggerFilterStep(
+        trigger_ids={0}, telemetry=NullTel(), zones=ZoneMask.from_spec(include="0,0;0.5,0;0.5,1;0,1")
+    )
+    ctx = step.run(Ctx(frame=frame, dets=_batch()))
+    assert isinstance(ctx.trigger_dets, DetectionBatch)
+    assert ctx.trigger_dets == [DETS[0], DETS[2]]
+
+
+def test_frame_store_and_detection_log_accept_batches(tmp_path):
+    store = FrameStore(str(tmp_path / "frames"))
+    store.save_frame(np.zeros((8, 8, 3), np.uint8), ts=1_700_000_000.0, detections=_batch(),
+                     class_names_by_id={0: "person", 2: "car"})
+    rec = store.query_range("2000-01-01T00:00:00", "2100-01-01T00:00:00")[0]
+    assert rec.detection_classes == ("car", "person")
+    assert rec.detection_count == 3 and rec.best_conf == 0.75
+
+    log = DetectionLog(str(tmp_path / "dets"), buffer_records=2)
+    log.append(1_700_000_000.0, 5, _batch())
+    log.close()
+    recs = read_detections(str(tmp_path / "dets"))
+    assert recs["track_id"].tolist() == [-1, 4, 9]
+    assert recs["x1"].tolist() == [0, 100, 50]
@@ -0,0 +1,166 @@
+"""Tests for the fixed-width binary detection log."""
+import os
+
+import numpy as np
+
+from app.core.detection_log import (
+    RECORD_DTYPE,
+    DetectionLog,
+    log_files,
+    open_log,
+    read_detections,
+    to_script,
+)
+from app.core.pipeline import Ctx, DetectionLogStep
+from app.core.ports import Detection, Frame
+
+H = 3600.0
+T0 = 1_700_000_000.0 - (1_700_000_000.0 % H)  # start of a UTC hour
+
+
+class RecordingTel:
+    def __init__(self):
+        self.counters = {}
+    def incr(self, name, value=1, **tags):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+def _det(x, conf=0.9, cls_id=0, tid=None):
+    return Detection(xyxy=(x, 10, x + 20, 50), conf=conf, cls_id=cls_id, track_id=tid)
+
+
+def test_record_is_compact():
+    assert RECORD_DTYPE.itemsize == 30
+
+
+def test_round_trip_and_rotation(tmp_path):
+    log = DetectionLog(str(tmp_path))
+    log.append(T0 + 1.0, 1, [_det(5, tid=3), _det(100, conf=0.5, cls_id=2)])
+    log.append(T0 + 2.0, 2, [])
+    log.append(T0 + H + 1.0, 90, [_det(7)])
+    log.close()
+
+    files = log_files(str(tmp_path))
+    assert len(files) == 2
+    first = open_log(files[0])
+    assert isinstance(first, np.memmap)
+    assert list(first["frame"]) == [1, 1]
+    assert list(first["track_id"]) == [3, -1]
+    assert first["conf"][1] == np.float32(0.5)
+
+    recs = read_detections(str(tmp_path))
+    assert list(recs["frame"]) == [1, 1, 90]
+    script = to_script(recs)
+    assert script[1][0] == _det(5, conf=float(np.float32(0.9)), tid=3)
+    assert script[90][0].track_id is None
+
+
+def test_time_range_filters_files_and_records(tmp_path):
+    log = DetectionLog(str(tmp_path))
+    for i in range(4):
+        log.append(T0 + i * H + 10.0, i, [_det(i)])
+    log.close()
+    recs = read_detections(str(tmp_path), start=T0 + H, end=T0 + 2 * H + 11.0)
+    assert list(recs["frame"]) == [1, 2]
+    assert len(log_files(str(tmp_path), start=T0 + H, end=T0 + 2 * H)) == 1
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    log = DetectionLog(str(tmp_path))
+    log.append(T0, 1, [_det(1), _det(2)])
+    log.close()
+    path = log_files(str(tmp_path))[0]
+    with open(path, "ab") as fh:
+        fh.write(b"\x00" * 7)
+    assert len(open_log(path)) == 2
+
+
+def test_sources_are_kept_apart(tmp_path):
+    for src in ("door", "door-2", ""):
+        log = DetectionLog(str(tmp_path), source=src)
+        log.append(T0, 1, [_det(1)])
+        log.close()
+    assert len(read_detections(str(tmp_path), source="door")) == 1
+    assert len(read_detections(str(tmp_path))) == 1
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_buffer_flushes_when_full(tmp_path):
+    log = DetectionLog(str(tmp_path), buffer_records=2, flush_sec=1e9)
+    log.append(T0, 1, [_det(1), _det(2), _det(3)])
+    assert len(read_detections(str(tmp_path))) == 2
+    log.close()
+    assert len(read_detections(str(tmp_path))) == 3
+
+
+def test_step_logs_each_frame_once(tmp_path):
+    log = DetectionLog(str(tmp_path))
+    step = DetectionLogStep(log=log, telemetry=RecordingTel())
+    frame = Frame(image=None, t=T0 + 5.0, index=7, w=640, h=480)
+    ctx = Ctx(frame=frame, dets=[_det(1)], detected=True)
+    step.run(ctx)
+    step.run(ctx)  # same frame again (e.g. failed read keeps the old frame)
+    step.run(Ctx())
+    log.close()
+    recs = read_detections(str(tmp_path))
+    assert list(recs["frame"]) == [7]
+    assert recs["t"][0] == T0 + 5.0
+
+
+def test_torn_tail_is_cut_before_appending(tmp_path):
+    log = DetectionLog(str(tmp_path))
+    log.append(T0 + 1.0, 1, [_det(5)])
+    log.close()
+    path = log_files(str(tmp_path))[0]
+    with open(path, "ab") as fh:
+        fh.write(b"\x01" * 11)  # crash mid-write
+
+    log = DetectionLog(str(tmp_path))  # next process, same hour
+    log.append(T0 + 2.0, 2, [_det(6), _det(7)])
+    log.close()
+    assert os.path.getsize(path) == 3 * RECORD_DTYPE.itemsize
+    assert list(open_log(path)["frame"]) == [1, 2, 2]
+
+
+def test_retention_prunes_old_hours_on_rotation(tmp_path):
+    old = DetectionLog(str(tmp_path))
+    for h in range(3):
+        old.append(T0 + h * H, h, [_det(5)])
+    old.close()
+    other = DetectionLog(str(tmp_path), source="door")
+    other.append(T0, 0, [_det(5)])
+    other.close()
+
+    log = DetectionLog(str(tmp_path), retention_days=1)
+    log.append(T0 + 86400 + 1.5 * H, 9, [_det(5)])  # a day after the second hour started: the first is over
+    log.close()
+    assert list(read_detections(str(tmp_path))["frame"]) == [1, 2, 9]
+    assert len(log_files(str(tmp_path), "door")) == 1  # other sources are left alone
+
+
+def test_quiet_period_still_flushes_buffered_records(tmp_path):
+    log = DetectionLog(str(tmp_path), flush_sec=5.0)
+    log.append(T0 + 1.0, 1, [_det(5)])
+    log.append(T0 + 2.0, 2, [])
+    assert not log_files(str(tmp_path))  # still buffered
+    log.append(T0 + 7.0, 3, [])  # no detections, but flush_sec passed
+    assert list(read_detections(str(tmp_path))["frame"]) == [1]
+
+
+def test_step_skips_reused_and_interpolated_boxes(tmp_path):
+    from app.core.pipeline import DetectStep
+
+    class OneBox:
+        def detect(self, frame):
+            return [_det(frame.index)]
+
+    log = DetectionLog(str(tmp_path))
+    detect = DetectStep(det=OneBox(), tracker=None, conf_thresh=0.5, telemetry=RecordingTel())
+    step = DetectionLogStep(log=log, telemetry=RecordingTel())
+    for i, gated in enumerate((False, True, False), start=1):
+        frame = Frame(image=None, t=T0 + i, index=i, w=640, h=480)
+        step.run(detect.run(Ctx(frame=frame, skip_detect=gated)))
+    log.close()
+    assert list(read_detections(str(tmp_path))["frame"]) == [1, 3]  # frame 2 reused frame 1's box
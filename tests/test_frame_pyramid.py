@@ -0,0 +1,58 @@
+"""Tests for the per-frame pyramid (Frame.scaled) and the letterbox reusing it."""
+import cv2
+import numpy as np
+
+from app.adapters.yolo_io import LetterboxBatch
+from app.core.ports import Frame
+from app.core.pyramid import scaled_size
+
+
+def _frame(w=640, h=480):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+    return Frame(image=img, t=0.0, index=1, w=w, h=h)
+
+
+def test_levels_are_computed_once_and_never_upscaled():
+    f = _frame()
+    small = f.scaled(320)
+    assert small.shape == (240, 320, 3) and f.scaled(320) is small
+    gray = f.scaled(320, gray=True)
+    assert gray.shape == (240, 320) and f.scaled(320, gray=True) is gray
+    assert len(f._pyramid) == 2  # gray derived from the color level
+    assert f.scaled(640) is f.image and f.scaled(4000) is f.image
+    assert f.scaled(4000, gray=True).shape == (480, 640)
+
+
+def test_new_level_cascades_from_the_smallest_wider_one():
+    f = _frame()
+    mid = f.scaled(320)
+    tiny = f.scaled(80)
+    expected = cv2.resize(mid, scaled_size(640, 480, 80), interpolation=cv2.INTER_AREA)
+    assert np.array_equal(tiny, expected)
+    assert tiny.shape[:2] == (60, 80)
+
+
+def test_letterbox_reuses_the_frame_level():
+    f = _frame(1280, 720)
+    batch = LetterboxBatch(imgsz=640, max_batch=2)
+    out = batch.fill([f]).copy()
+    assert len(f._pyramid) == 1 and f.scaled(640).shape == (360, 640, 3)
+
+    arrays = LetterboxBatch(imgsz=640, max_batch=2).fill([f.image])
+    assert out.shape == arrays.shape
+    assert np.abs(out - arrays).mean() < 0.05  # INTER_AREA level vs INTER_LINEAR resize
+    assert batch.ratios[0] == 0.5 and tuple(batch.pads[0]) == (0, 140)
+
+
+def test_preroll_resizes_into_its_slot_unless_the_level_exists():
+    from app.core.frame_ring import FrameRing
+
+    ring = FrameRing(seconds=2, fps=1, width=320)
+    f = _frame()
+    assert ring.push(f) and len(f._pyramid) == 0  # no level allocated just for the ring
+    g = _frame()
+    g.t = 5.0
+    level = g.scaled(320)
+    assert ring.push(g) and np.array_equal(ring._images[1], level)
+    assert np.array_equal(ring._images[0], level)  # same pixels either way
@@ -0,0 +1,116 @@
+"""Tests for the pre-roll frame ring and FrameCaptureStep saving it when an event starts."""
+import numpy as np
+import pytest
+
+from app.core.frame_ring import FrameRing
+from app.core.pipeline import Ctx, FrameCaptureStep
+from app.core.ports import Detection, Frame
+
+
+def _frame(t, w=1280, h=720, value=None):
+    img = np.full((h, w, 3), int(t * 10) % 256 if value is None else value, dtype=np.uint8)
+    return Frame(image=img, t=t, index=int(t * 10), w=w, h=h)
+
+
+class RecordingFrameStore:
+    def __init__(self):
+        self.saved = []
+
+    def save_frame(self, image, ts, detections=None, class_names_by_id=None, jpeg_quality=80, source=""):
+        self.saved.append((ts, image.shape, bool(detections)))
+        return "/tmp/fake.jpg"
+
+
+class CountingTel:
+    def __init__(self):
+        self.counters, self.gauges = {}, {}
+    def incr(self, name, value=1, **k):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, name, value, **k):
+        self.gauges[name] = value
+    def time_ms(self, *a, **k): pass
+
+
+def test_ring_keeps_the_last_seconds_at_its_own_rate_in_reused_slots():
+    ring = FrameRing(seconds=2.0, fps=2.0, width=320)
+    assert ring.capacity == 4
+    stored = [ring.push(_frame(i * 0.1)) for i in range(40)]  # 10 fps camera for 4 s
+    assert sum(stored) == 8
+    slots = ring._images
+    assert slots.shape == (4, 180, 320, 3)
+    assert ring.nbytes == 4 * 180 * 320 * 3
+    ring.push(_frame(4.5))
+    assert ring._images is slots  # no reallocation per frame
+
+    frames = ring.drain()
+    assert [t for t, _ in frames] == pytest.approx([2.5, 3.0, 3.5, 4.5])
+    assert frames[0][1].shape == (180, 320, 3) and len(ring) == 0
+
+
+def test_ring_drain_before_and_jpeg_slots():
+    ring = FrameRing(seconds=1.0, fps=4.0, jpeg_quality=80)
+    for i in range(6):
+        ring.push(_frame(i * 0.25, w=64, h=48, value=50 * i))
+    out = ring.drain(before=1.25)
+    assert [t for t, _ in out] == pytest.approx([0.5, 0.75, 1.0])
+    assert out[-1][1].shape == (48, 64, 3)
+    assert abs(int(out[-1][1].mean()) - 200) <= 2
+    assert 0 < ring.nbytes < 4 * 64 * 48 * 3
+
+
+def test_frame_capture_saves_preroll_once_per_event():
+    ring = FrameRing(seconds=2.0, fps=2.0, width=320)
+    store, tel = RecordingFrameStore(), CountingTel()
+    step = FrameCaptureStep(
+        frame_store=store, class_names_by_id={0: "person"}, active_fps=100,
+        cooldown_sec=5, telemetry=tel, preroll=ring,
+    )
+    person = (Detection((10, 10, 50, 50), 0.9, 0),)
+
+    def tick(t, dets=()):
+        frame = _frame(t)
+        ring.push(frame)  # the camera does this on every decoded frame
+        ctx = Ctx()
+        ctx.frame, ctx.now, ctx.trigger_dets = frame, t, dets
+        step.run(ctx)
+
+    for i in range(30):
+        tick(10 + i * 0.1)
+    assert store.saved == []
+    tick(13.0, person)
+    pre = [(ts, shape) for ts, shape, has_det in store.saved if not has_det]
+    assert [ts for ts, _ in pre] == pytest.approx([11.5, 12.0, 12.5])
+    assert all(shape == (180, 320, 3) for _, shape in pre)
+    assert store.saved[-1] == (13.0, (720, 1280, 3), True)
+    assert tel.counters["preroll_saved"] == 3 and tel.gauges["preroll_bytes"] > 0
+
+    n = len(store.saved)
+    tick(14.0, person)  # same event: no second pre-roll
+    assert len(store.saved) == n + 1
+
+
+def test_preroll_is_snapshotted_on_the_loop_and_written_by_the_executor():
+    class DeferredExecutor:
+        def __init__(self):
+            self.tasks = []
+        def submit(self, key, fn, *args, block=True):
+            self.tasks.append((fn, args))
+            return True
+
+    ring = FrameRing(seconds=2.0, fps=2.0, width=320, jpeg_quality=80)
+    store, pool = RecordingFrameStore(), DeferredExecutor()
+    step = FrameCaptureStep(
+        frame_store=store, class_names_by_id={0: "person"}, active_fps=100,
+        cooldown_sec=5, telemetry=CountingTel(), preroll=ring, executor=pool,
+    )
+    for i in range(10):
+        ring.push(_frame(10 + i * 0.5))
+    ctx = Ctx()
+    ctx.frame, ctx.now, ctx.trigger_dets = _frame(15.0), 15.0, (Detection((10, 10, 50, 50), 0.9, 0),)
+    step.run(ctx)
+    assert store.saved == [(15.0, (720, 1280, 3), True)] and len(ring) == 0
+    fn, args = pool.tasks.pop()
+    assert all(data.ndim == 1 for _, data in args[0])  # still JPEG bytes
+    fn(*args)
+    assert [ts for ts, _, _ in store.saved[1:]] == pytest.approx([13.0, 13.5, 14.0, 14.5])
+    assert all(shape == (180, 320, 3) for _, shape, _ in store.saved[1:])
@@ -168,3 +168,29 @@ def test_query_from_different_thread(tmp_path):
 
     assert not errors, f"Cross-thread query failed: {errors[0]}"
     assert len(results) == 1
+
+
+# ---------------------------------------------------------------------------
+# Duplicate repeat counts
+# ---------------------------------------------------------------------------
+
+def test_repeat_count_migrates_old_index(tmp_path):
+    """An index created before repeat_count existed gains the column on open."""
+    frames_dir = tmp_path / "frames"
+    frames_dir.mkdir()
+    conn = sqlite3.connect(str(frames_dir / "frame_index.db"))
+    conn.execute(
+        "CREATE TABLE frames (ts TEXT NOT NULL, path TEXT NOT NULL, "
+        "has_detection INTEGER NOT NULL DEFAULT 0, detection_classes TEXT NOT NULL DEFAULT '[]', "
+        "detection_count INTEGER NOT NULL DEFAULT 0, best_conf REAL NOT NULL DEFAULT 0.0)"
+    )
+    conn.execute("INSERT INTO frames(ts, path) VALUES('2026-04-14T10:00:00', '/old.jpg')")
+    conn.commit()
+    conn.close()
+
+    store = FrameStore(str(frames_dir))
+    ts = 1_776_160_800.0  # 2026-04-14T10:00:00Z
+    store.add_repeats("/old.jpg", ts, 4)
+    store.add_repeats("/old.jpg", ts, 0)
+    [rec] = store.query_range("2026-04-14T00:00:00", "2026-04-15T00:00:00")
+    assert rec.repeat_count == 4
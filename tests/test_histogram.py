@@ -0,0 +1,104 @@
+"""Tests for in-process latency histograms and the HistogramTelemetry wrapper."""
+import numpy as np
+
+from app.adapters.telemetry_histogram import HistogramTelemetry, find_histograms
+from app.core.histogram import HistogramRegistry, LatencyHistogram
+
+
+class RecordingTel:
+    def __init__(self):
+        self.timings = []
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, name, value, **tags):
+        self.timings.append((name, value, tags))
+
+
+# ---------------------------------------------------------------------------
+# LatencyHistogram
+# ---------------------------------------------------------------------------
+
+def test_percentiles_within_bucket_resolution():
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(mean=3.0, sigma=0.5, size=20_000)
+    h = LatencyHistogram()
+    for v in samples:
+        h.record(v)
+    for p in (50, 95, 99):
+        exact = float(np.percentile(samples, p))
+        assert abs(h.percentile(p) - exact) / exact < 0.13
+    assert h.count == len(samples)
+    assert h.max == samples.max()
+
+
+def test_tail_is_visible():
+    h = LatencyHistogram()
+    for _ in range(990):
+        h.record(10.0)
+    for _ in range(10):
+        h.record(500.0)
+    assert h.percentile(50) < 12.0
+    assert h.percentile(99) < 12.0
+    assert h.percentile(99.9) >= 450.0
+
+
+def test_empty_and_out_of_range():
+    h = LatencyHistogram(min_ms=1.0, max_ms=100.0)
+    assert h.percentile(99) == 0.0
+    h.record(0.0)
+    h.record(1e6)
+    assert h.count == 2
+    assert h.percentile(50) == 1.0            # clamped into the first bucket
+    assert abs(h.percentile(100) - 100.0) < 1e-6  # overflow reports the top edge
+
+
+def test_reset_clears_counts():
+    h = LatencyHistogram()
+    h.record(5.0)
+    h.reset()
+    assert h.count == 0 and h.percentile(50) == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Registry / telemetry wrapper
+# ---------------------------------------------------------------------------
+
+def test_registry_snapshot_and_summary():
+    reg = HistogramRegistry()
+    for v in (1.0, 2.0, 3.0):
+        reg.record("detect_ms", v)
+    snap = reg.snapshot()
+    assert snap["detect_ms"]["count"] == 3
+    assert set(snap["detect_ms"]) >= {"p50", "p95", "p99", "mean", "max"}
+    assert reg.summary().startswith("detect_ms n=3 p50/p95/p99=")
+    assert reg.percentiles("missing") == {50.0: 0.0, 95.0: 0.0, 99.0: 0.0}
+
+
+def test_wrapper_forwards_and_keys_by_tags():
+    inner = RecordingTel()
+    tel = HistogramTelemetry(inner, summary_sec=0)
+    tel.time_ms("detect_ms", 12.0)
+    tel.time_ms("detect_ms", 14.0, camera="door")
+    assert len(inner.timings) == 2
+    snap = tel.totals.snapshot()
+    assert snap["detect_ms"]["count"] == 1
+    assert snap["detect_ms{camera=door}"]["count"] == 1
+    assert find_histograms(tel) is tel.totals
+
+
+def test_summary_resets_window_but_not_totals():
+    tel = HistogramTelemetry(None, summary_sec=0)
+    tel.time_ms("pipeline_loop_ms", 40.0)
+    line = tel.emit_summary()
+    assert "pipeline_loop_ms n=1" in line
+    assert tel.emit_summary() == ""
+    assert tel.totals.snapshot()["pipeline_loop_ms"]["count"] == 1
+
+
+def test_find_histograms_through_wrappers():
+    class Wrapper:
+        def __init__(self, inner):
+            self._inner = inner
+    tel = HistogramTelemetry(None, summary_sec=0)
+    assert find_histograms(Wrapper(tel)) is tel.totals
+    assert find_histograms(RecordingTel()) is None
@@ -0,0 +1,93 @@
+"""Tests for keyframe-only idle decoding (IDLE_DECODE=keyframe)."""
+from app.adapters.camera_cv2 import Cv2Camera, _gst_rtsp_pipeline
+from app.core.pipeline import Ctx, DecodeModeStep
+from app.core.rate_policy import RateTarget
+
+
+class CountingTel:
+    def __init__(self):
+        self.counters, self.gauges = {}, {}
+    def incr(self, name, value=1, **k):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, name, value, **k):
+        self.gauges[name] = value
+    def time_ms(self, *a, **k): pass
+
+
+class ModeCamera:
+    def __init__(self, supported=True):
+        self.decode_mode = "full"
+        self.supported = supported
+        self.switches = []
+
+    def set_decode_mode(self, mode):
+        if not self.supported or mode == self.decode_mode:
+            return False
+        self.decode_mode = mode
+        self.switches.append(mode)
+        return True
+
+
+def _tick(step, t, present=False, stride=6):
+    ctx = Ctx(now=t, target=RateTarget(2.0, stride))
+    ctx.state.present = present
+    return step.run(ctx)
+
+
+def test_keyframes_after_idle_period_and_full_as_soon_as_presence_arms():
+    cam, tel = ModeCamera(), CountingTel()
+    step = DecodeModeStep(cam=cam, telemetry=tel, idle_after_sec=30.0)
+    assert _tick(step, 0.0).target.vid_stride == 6
+    _tick(step, 29.0)
+    assert cam.switches == []
+    ctx = _tick(step, 30.0)
+    assert cam.switches == ["keyframe"] and ctx.target.vid_stride == 1
+    assert tel.gauges["decode_keyframe_only"] == 1.0
+
+    _tick(step, 40.0, present=True)
+    assert cam.switches == ["keyframe", "full"]
+    _tick(step, 50.0)  # presence just ended: stays full for another idle period
+    _tick(step, 69.0)
+    assert cam.switches == ["keyframe", "full"]
+    _tick(step, 70.0)
+    assert cam.switches == ["keyframe", "full", "keyframe"]
+    assert tel.counters["decode_mode_switches"] == 3
+
+
+def test_unsupported_backend_stays_on_full_decode():
+    cam, tel = ModeCamera(supported=False), CountingTel()
+    step = DecodeModeStep(cam=cam, telemetry=tel, idle_after_sec=1.0)
+    _tick(step, 0.0)
+    assert _tick(step, 5.0).target.vid_stride == 6
+    assert step._unsupported and "decode_mode_switches" not in tel.counters
+
+
+def test_keyframe_pipeline_drops_delta_units_before_decoding():
+    full = _gst_rtsp_pipeline("rtsp://cam/1", 200)
+    keyframes = _gst_rtsp_pipeline("rtsp://cam/1", 200, keyframes_only=True)
+    assert "drop-buffer-flags=delta-unit" not in full
+    assert keyframes.index("drop-buffer-flags=delta-unit") < keyframes.index("avdec_h264")
+    # the FFmpeg backend (and files, USB cameras) cannot switch
+    assert Cv2Camera("0").set_decode_mode("keyframe") is False
+
+
+def test_failed_reconnect_falls_back_to_full_decode():
+    class FlakyCamera(ModeCamera):
+        def set_decode_mode(self, mode):
+            if mode == "keyframe" and not self.switches:
+                self.decode_mode = mode  # like Cv2Camera: mode set, then the reopen fails
+                self.switches.append("failed")
+                raise RuntimeError("Failed to open camera source")
+            return super().set_decode_mode(mode)
+
+    cam, tel = FlakyCamera(), CountingTel()
+    step = DecodeModeStep(cam=cam, telemetry=tel, idle_after_sec=30.0)
+    _tick(step, 0.0)
+    ctx = _tick(step, 30.0)
+    assert cam.decode_mode == "full" and ctx.target.vid_stride == 6
+    assert cam.switches == ["failed", "full"] and tel.counters["decode_mode_errors"] == 1
+    assert tel.gauges["decode_keyframe_only"] == 0.0
+    _tick(step, 59.0)
+    assert cam.switches == ["failed", "full"]  # next attempt only after another idle period
+    _tick(step, 60.0)
+    assert cam.decode_mode == "keyframe"
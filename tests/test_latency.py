@@ -0,0 +1,97 @@
+"""Tests for glass-to-alert latency traces and PTS capture times."""
+import numpy as np
+
+from app.core.alert_policy import AlertPolicy
+from app.core.events import AlertIssued
+from app.core.latency import LatencyTrace, PtsClock, record_trace
+from app.core.pipeline import AlertStep, Ctx, DetectStep, ReadStep
+from app.core.ports import Detection, Frame
+
+
+class RecordingTel:
+    def __init__(self):
+        self.timings = {}
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, name, value, **tags):
+        self.timings.setdefault(name, []).append(value)
+
+
+class ListBus:
+    def __init__(self):
+        self.events = []
+    def publish(self, topic, event):
+        self.events.append((topic, event))
+
+
+class NullSink:
+    def send(self, text, image_path=None):
+        pass
+
+
+class StampedCamera:
+    def read(self):
+        img = np.zeros((48, 64, 3), dtype=np.uint8)
+        return Frame(image=img, t=100.0, index=1, w=64, h=48, capture_t=50.0)
+    def grab(self):
+        return True
+
+
+class PersonDetector:
+    def detect(self, frame):
+        return [Detection((1, 1, 20, 20), 0.9, 0, track_id=1)]
+
+
+def test_pts_clock_anchors_on_least_delayed_frame():
+    pts = PtsClock(drift=0.0)
+    assert pts.capture_time(None, 10.0) == 10.0
+    assert pts.capture_time(0.0, 10.0) == 10.0
+    assert pts.capture_time(1000.0, 10.5) == 10.5   # first frame: anchor 9.5
+    assert pts.capture_time(1100.0, 10.9) == 10.6   # arrived 0.3 s late
+    assert pts.capture_time(1200.0, 10.65) == 10.65  # faster frame moves the anchor
+    assert pts.capture_time(100.0, 20.0) == 20.0    # PTS went backwards: re-anchor
+
+
+def test_trace_stages_skip_missing_marks():
+    trace = LatencyTrace(capture_t=10.0, read_t=10.1)
+    trace.mark("detect", 10.15)
+    trace.mark("armed", 10.2)
+    trace.mark("flush", 11.2)
+    trace.mark("sent", 11.7)
+    stages = [(s, round(ms, 3)) for s, ms in trace.stages_ms()]
+    assert stages == [("read", 100.0), ("detect", 50.0), ("armed", 50.0), ("flush", 1000.0), ("sent", 500.0)]
+    tel = RecordingTel()
+    record_trace(tel, trace)
+    assert round(tel.timings["latency_glass_to_alert_ms"][0], 3) == 1700.0
+    assert "latency_history_ms" not in tel.timings
+    # a capture stamp after the read time (clock skew) is clamped to the read
+    assert LatencyTrace(capture_t=12.0, read_t=11.0).stamps["capture"] == 11.0
+
+
+def test_alert_carries_the_trace_of_its_arming_frame(tmp_path):
+    tel = RecordingTel()
+    bus = ListBus()
+    read = ReadStep(cam=StampedCamera(), telemetry=tel)
+    detect = DetectStep(det=PersonDetector(), tracker=None, conf_thresh=0.5, telemetry=tel)
+    alert = AlertStep(
+        alert=AlertPolicy(window_sec=0.0, _wall_last_sent=1.0),
+        sink=NullSink(),
+        event_bus=bus,
+        rearm_sec=10,
+        save_dir=str(tmp_path / "alerts"),
+        draw_ids={0},
+        conf_thresh=0.5,
+        draw=False,
+        class_names_by_id={0: "person"},
+        telemetry=tel,
+    )
+    ctx = detect.run(read.run(Ctx()))
+    ctx.trigger_dets = ctx.dets
+    alert.run(ctx)
+
+    [(_, issued)] = [e for e in bus.events if isinstance(e[1], AlertIssued)]
+    assert issued.timings["capture"] == 50.0
+    assert list(issued.timings) == ["capture", "read", "detect", "armed", "flush", "sent"]
+    for name in ("latency_read_ms", "latency_detect_ms", "latency_flush_ms", "latency_sent_ms"):
+        assert len(tel.timings[name]) == 1
+    assert tel.timings["latency_glass_to_alert_ms"][0] >= tel.timings["latency_read_ms"][0] > 0
@@ -0,0 +1,89 @@
+"""Tests for MotionGateStep and DetectStep reusing detections on gated frames."""
+import numpy as np
+
+from app.core.pipeline import Ctx, DetectStep, MotionGateStep
+from app.core.ports import Detection, Frame
+
+
+class RecordingTel:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+    def incr(self, name, value=1, **tags):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, name, value, **tags):
+        self.gauges[name] = value
+    def time_ms(self, *a, **k): pass
+
+
+class CountingDetector:
+    def __init__(self):
+        self.calls = 0
+    def detect(self, frame):
+        self.calls += 1
+        return [Detection(xyxy=(0, 0, 10, 10), conf=0.9, cls_id=0, track_id=self.calls)]
+
+
+def _frame(img, t, i=1):
+    return Frame(image=img, t=t, index=i, w=img.shape[1], h=img.shape[0])
+
+
+def _static():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8)
+
+
+def _gate(tel, **kw):
+    return MotionGateStep(telemetry=tel, **kw)
+
+
+def test_static_scene_is_skipped_after_first_frame():
+    tel = RecordingTel()
+    gate = _gate(tel, force_sec=0)
+    img = _static()
+    results = [gate.run(Ctx(frame=_frame(img, t), now=t)).skip_detect for t in (0.0, 0.5, 1.0)]
+    assert results == [False, True, True]
+    assert tel.counters == {"motion_gate_passed": 1, "motion_gate_skipped": 2}
+    assert tel.gauges["motion_score"] == 0.0
+    assert 0.0 < tel.gauges["motion_skip_rate"] < 1.0
+
+
+def test_motion_passes_frame_to_detector():
+    gate = _gate(RecordingTel(), force_sec=0)
+    img = _static()
+    gate.run(Ctx(frame=_frame(img, 0.0), now=0.0))
+    moved = img.copy()
+    moved[100:300, 200:400] = 255 - moved[100:300, 200:400]
+    assert not gate.run(Ctx(frame=_frame(moved, 0.5), now=0.5)).skip_detect
+
+
+def test_slow_drift_accumulates_against_last_detected_frame():
+    gate = _gate(RecordingTel(), force_sec=0, pixel_delta=15, threshold=0.01)
+    base = np.full((240, 320, 3), 100, dtype=np.uint8)
+    gate.run(Ctx(frame=_frame(base, 0.0), now=0.0))
+    skipped = []
+    for step in range(1, 6):
+        img = base.copy()
+        img[:, : 80] = 100 + 8 * step  # brightens a little more every frame
+        skipped.append(gate.run(Ctx(frame=_frame(img, step), now=float(step))).skip_detect)
+    assert skipped[0] is True
+    assert False in skipped  # eventually exceeds pixel_delta vs the reference
+
+
+def test_forced_detection_after_force_sec():
+    gate = _gate(RecordingTel(), force_sec=2.0)
+    img = _static()
+    flags = [gate.run(Ctx(frame=_frame(img, t), now=t)).skip_detect for t in (0.0, 1.0, 2.0, 3.0)]
+    assert flags == [False, True, False, True]
+
+
+def test_detect_step_reuses_last_detections_when_gated():
+    det = CountingDetector()
+    step = DetectStep(det=det, tracker=None, conf_thresh=0.5, telemetry=RecordingTel())
+    img = _static()
+    first = step.run(Ctx(frame=_frame(img, 0.0)))
+    gated = step.run(Ctx(frame=_frame(img, 0.5, 2), skip_detect=True))
+    assert det.calls == 1
+    assert gated.dets == first.dets
+    step.run(Ctx(frame=_frame(img, 1.0, 3)))
+    assert det.calls == 2
@@ -0,0 +1,191 @@
+"""Tests for the multi-camera host: per-camera configs and shared-detector scheduling."""
+import threading
+
+import numpy as np
+import pytest
+
+from app.core.ports import Detection, Frame
+from app.core.config import Config, camera_configs
+from app.core.clock import SystemClock
+from app.core.presence_policy import PresencePolicy
+from app.core.rate_policy import RatePolicy
+from app.core.alert_policy import AlertPolicy
+from app.core.pipeline import Ctx, Pipeline
+from app.core.multi_camera import MultiCameraHost, CameraTelemetry
+
+
+class FakeCamera:
+    def __init__(self):
+        self.t = 0.0
+        self.i = 0
+    def open(self): pass
+    def grab(self): return True
+    def read(self):
+        self.t += 0.1; self.i += 1
+        img = np.zeros((48, 64, 3), dtype=np.uint8)
+        return Frame(image=img, t=self.t, index=self.i, w=64, h=48)
+    def close(self): pass
+
+
+class SharedDetector:
+    """Records which thread calls detect() to prove single-threaded use."""
+    labels = ["person"]
+    def __init__(self):
+        self.threads = set()
+        self.calls = 0
+    def detect(self, frame):
+        self.threads.add(threading.get_ident())
+        self.calls += 1
+        return []
+
+
+class NullSink:
+    def send(self, text, image_path=None): pass
+
+
+class NullTel:
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+def _pipe(tmp_path, name, det, conf_thresh=None):
+    cfg = Config()
+    if conf_thresh is not None:
+        cfg.conf_thresh = conf_thresh
+    cfg.save_dir = str(tmp_path / "alerts" / name)
+    cfg.raw_frames_dir = str(tmp_path / "raw")
+    cfg.alert_db_path = str(tmp_path / "alert_history.db")
+    cfg.draw = False
+    return Pipeline(
+        cfg=cfg,
+        clock=SystemClock(),
+        camera=FakeCamera(),
+        detector=det,
+        tracker=None,
+        presence=PresencePolicy(min_frames=3, min_persist_sec=0.5),
+        rate=RatePolicy(base_fps=0, high_fps=0, boost_arm_frames=3,
+                        boost_min_sec=0.5, cooldown_sec=3, base_stride=1),
+        alerts=AlertPolicy(window_sec=1.0),
+        sink=NullSink(),
+        telemetry=NullTel(),
+        camera_name=name,
+    )
+
+
+# ---------------------------------------------------------------------------
+# camera_configs
+# ---------------------------------------------------------------------------
+
+def test_camera_configs_named_and_plain_sources(monkeypatch):
+    cfg = Config()
+    cfg.save_dir = "/tmp/alerts"
+    cfg.srcs = "driveway=rtsp://a/stream?x=1, rtsp://b/stream"
+    monkeypatch.setenv("CAM_DRIVEWAY_BASE_FPS", "1.5")
+    monkeypatch.setenv("CAM_DRIVEWAY_TRIGGER_CLASSES", "person,dog")
+    cams = camera_configs(cfg)
+    assert list(cams) == ["driveway", "cam1"]
+    assert cams["driveway"].src == "rtsp://a/stream?x=1"
+    assert cams["cam1"].src == "rtsp://b/stream"
+    assert cams["driveway"].save_dir == "/tmp/alerts/driveway"
+    assert cams["driveway"].base_fps == 1.5
+    assert cams["driveway"].trigger_classes == {"person", "dog"}
+    assert cams["cam1"].base_fps == cfg.base_fps
+    assert cams["cam1"].trigger_classes is not cfg.trigger_classes
+
+
+def test_camera_configs_falls_back_to_src():
+    cfg = Config()
+    cfg.srcs = ""
+    cfg.src = "0"
+    assert list(camera_configs(cfg)) == ["cam0"]
+
+
+def test_camera_configs_ignore_shared_detector_fields(monkeypatch, caplog):
+    cfg = Config()
+    cfg.srcs = "door=rtsp://a/1"
+    monkeypatch.setenv("CAM_DOOR_IMG_SIZE", "1280")
+    monkeypatch.setenv("CAM_DOOR_CONF_THRESH", "0.9")
+    cams = camera_configs(cfg)
+    assert cams["door"].img_size == cfg.img_size and cams["door"].conf_thresh == 0.9
+    assert "CAM_DOOR_IMG_SIZE" in caplog.text
+
+
+def test_camera_telemetry_adds_tag():
+    seen = []
+
+    class Tel(NullTel):
+        def incr(self, name, value=1, **tags):
+            seen.append((name, tags))
+
+    CameraTelemetry(Tel(), "door").incr("frames")
+    assert seen == [("frames", {"camera": "door"})]
+
+
+# ---------------------------------------------------------------------------
+# MultiCameraHost
+# ---------------------------------------------------------------------------
+
+def test_round_robin_serves_every_camera_from_one_thread(tmp_path):
+    det = SharedDetector()
+    pipes = {n: _pipe(tmp_path, n, det) for n in ("a", "b", "c")}
+    host = MultiCameraHost(pipelines=pipes, telemetry=NullTel())
+    served = []
+    for name, ctx in host.iter_frames():
+        assert ctx.frame is not None
+        served.append(name)
+        if len(served) >= 30:
+            break
+    assert set(served) == {"a", "b", "c"}
+    assert len(det.threads) == 1
+
+
+def test_round_robin_rotates_over_ready_cameras(tmp_path):
+    det = SharedDetector()
+    pipes = {n: _pipe(tmp_path, n, det) for n in ("a", "b", "c")}
+    host = MultiCameraHost(pipelines=pipes, telemetry=NullTel())
+    stop = threading.Event()
+    for slot in host._slots:
+        slot.queue.put(f"ctx-{slot.name}", stop)
+    assert [host._pick()[0].name for _ in range(3)] == ["a", "b", "c"]
+    host._slots[0].queue.put("ctx-a2", stop)
+    host._slots[1].queue.put("ctx-b2", stop)
+    assert host._pick()[1] == "ctx-a2"
+    assert host._pick()[1] == "ctx-b2"
+
+
+def test_priority_serves_present_cameras_first(tmp_path):
+    det = SharedDetector()
+    pipes = {n: _pipe(tmp_path, n, det) for n in ("a", "b")}
+    host = MultiCameraHost(pipelines=pipes, telemetry=NullTel(), schedule="priority")
+    slot_a, slot_b = host._slots
+    slot_b.state.present = True
+    stop = threading.Event()
+    slot_a.queue.put("ctx-a", stop)
+    slot_b.queue.put("ctx-b", stop)
+    slot, ctx = host._pick()
+    assert (slot.name, ctx) == ("b", "ctx-b")
+    slot, ctx = host._pick()
+    assert (slot.name, ctx) == ("a", "ctx-a")
+    assert host._pick() is None
+
+
+def test_unknown_schedule_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        MultiCameraHost(pipelines={}, telemetry=NullTel(), schedule="fifo")
+
+
+def test_each_camera_applies_its_own_conf_thresh(tmp_path):
+    class MixedDetector:
+        labels = ["person"]
+        def detect(self, frame):
+            return [Detection((1, 1, 5, 5), 0.6, 0), Detection((10, 10, 20, 20), 0.95, 0)]
+
+    det = MixedDetector()
+    pipes = {"low": _pipe(tmp_path, "low", det, 0.5), "high": _pipe(tmp_path, "high", det, 0.9)}
+    host = MultiCameraHost(pipelines=pipes, telemetry=NullTel(), batch_size=2)
+    stop = threading.Event()
+    for slot in host._slots:
+        slot.queue.put(Ctx(frame=FakeCamera().read(), now=1.0), stop)
+    results = {slot.name: [d.conf for d in ctx.dets] for slot, ctx in host._detect(host._pick_many(2))}
+    assert results == {"low": [0.6, 0.95], "high": [0.95]}
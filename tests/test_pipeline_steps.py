@@ -53,7 +53,7 @@ class RecordingFrameStore:
     def __init__(self):
         self.saved = []
 
-    def save_frame(self, image, ts, detections=None, class_names_by_id=None, jpeg_quality=80):
+    def save_frame(self, image, ts, detections=None, class_names_by_id=None, jpeg_quality=80, source=""):
         self.saved.append({
             "ts": ts,
             "detections": list(detections) if detections else [],
@@ -231,3 +231,44 @@ def test_frame_capture_respects_active_fps():
     ctx3.trigger_dets = trigger
     step.run(ctx3)
     assert len(store.saved) == 2  # saved
+
+
+# ---------------------------------------------------------------------------
+# FrameCaptureStep near-duplicate suppression
+# ---------------------------------------------------------------------------
+
+def test_frame_capture_dedup_counts_repeats(tmp_path):
+    """Unchanged frames with unchanged detections are folded into the last saved frame."""
+    from app.core.frame_store import FrameStore
+
+    store = FrameStore(str(tmp_path / "frames"))
+    step = FrameCaptureStep(
+        frame_store=store,
+        class_names_by_id={0: "person", 2: "car"},
+        active_fps=2.0,
+        cooldown_sec=10,
+        dedup=True,
+    )
+    rng = np.random.default_rng(3)
+    parked = rng.integers(0, 255, size=(120, 160, 3), dtype=np.uint8)
+    car = (Detection((10, 10, 50, 50), 0.9, 2),)
+
+    def run(t, img, dets):
+        ctx = Ctx()
+        ctx.frame = Frame(image=img, t=t, index=int(t * 10), w=160, h=120)
+        ctx.now = t
+        ctx.trigger_dets = dets
+        step.run(ctx)
+
+    base = 1_700_000_000.0
+    for i in range(4):
+        run(base + i, parked, car)
+    # a person walks in: same scene, different detections -> saved
+    run(base + 4, parked, car + (Detection((60, 20, 90, 110), 0.8, 0),))
+    # the scene itself changes -> saved
+    run(base + 5, 255 - parked, car)
+    step.flush()
+
+    recs = store.query_range("2000-01-01T00:00:00", "2100-01-01T00:00:00")
+    assert [r.repeat_count for r in recs] == [3, 0, 0]
+    assert sum(1 + r.repeat_count for r in recs) == 6
@@ -0,0 +1,138 @@
+"""Tests for non-blocking alert side effects: keyed worker pool and async AlertStep."""
+import os
+import threading
+import time
+
+import numpy as np
+
+from app.core.alert_policy import AlertPolicy
+from app.core.pipeline import AlertStep, Ctx
+from app.core.ports import Detection, Frame
+from app.core.side_effects import InlineExecutor, KeyedWorkerPool, build_executor
+
+
+class RecordingTel:
+    def __init__(self):
+        self.counters = {}
+    def incr(self, name, value=1, **tags):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+# ---------------------------------------------------------------------------
+# KeyedWorkerPool
+# ---------------------------------------------------------------------------
+
+def test_same_key_runs_in_submission_order():
+    pool = KeyedWorkerPool(workers=3, queue_size=100, telemetry=RecordingTel())
+    out = []
+    for i in range(50):
+        pool.submit("k", out.append, i)
+    pool.close()
+    assert out == list(range(50))
+
+
+def test_non_blocking_submit_drops_when_full():
+    tel = RecordingTel()
+    pool = KeyedWorkerPool(workers=1, queue_size=1, telemetry=tel)
+    gate = threading.Event()
+    pool.submit("k", gate.wait)            # occupies the worker
+    time.sleep(0.05)
+    assert pool.submit("k", lambda: None, block=False)       # fills the queue
+    assert not pool.submit("k", lambda: None, block=False)   # dropped
+    assert tel.counters["side_effect_dropped"] == 1
+    gate.set()
+    pool.close()
+
+
+def test_task_errors_are_counted_not_raised():
+    tel = RecordingTel()
+    pool = KeyedWorkerPool(workers=1, queue_size=4, telemetry=tel)
+    pool.submit("k", lambda: 1 / 0)
+    pool.close()
+    assert tel.counters["side_effect_errors"] == 1
+
+
+def test_build_executor_zero_workers_is_inline():
+    assert isinstance(build_executor(0, 8, RecordingTel(), "alert"), InlineExecutor)
+
+
+# ---------------------------------------------------------------------------
+# AlertStep with a worker pool
+# ---------------------------------------------------------------------------
+
+class SlowSink:
+    def __init__(self, delay):
+        self.delay = delay
+        self.sent = []
+    def send(self, text, image_path=None):
+        time.sleep(self.delay)
+        self.sent.append((text, image_path, image_path and os.path.exists(image_path)))
+
+
+def _alert_step(tmp_path, sink, executor):
+    return AlertStep(
+        alert=AlertPolicy(window_sec=0.0, _wall_last_sent=1.0),
+        sink=sink,
+        event_bus=None,
+        rearm_sec=10,
+        save_dir=str(tmp_path / "alerts"),
+        draw_ids={0},
+        conf_thresh=0.5,
+        draw=True,
+        class_names_by_id={0: "person"},
+        telemetry=RecordingTel(),
+        executor=executor,
+    )
+
+
+def _trigger_ctx(t):
+    img = np.zeros((48, 64, 3), dtype=np.uint8)
+    det = Detection((1, 1, 20, 20), 0.9, 0, track_id=1)
+    ctx = Ctx(frame=Frame(image=img, t=t, index=1, w=64, h=48), now=t)
+    ctx.dets = ctx.trigger_dets = (det,)
+    return ctx
+
+
+def test_slow_sink_does_not_block_alert_step(tmp_path):
+    sink = SlowSink(delay=0.5)
+    pool = KeyedWorkerPool(workers=2, queue_size=8, telemetry=RecordingTel())
+    step = _alert_step(tmp_path, sink, pool)
+    t0 = time.perf_counter()
+    ctx = step.run(_trigger_ctx(100.0))
+    assert time.perf_counter() - t0 < 0.25
+    assert ctx.alert_count == 1 and ctx.snapshot_path
+    assert sink.sent == []
+    pool.close()
+    # the snapshot for this window was written before the send that references it
+    assert len(sink.sent) == 1
+    text, path, existed = sink.sent[0]
+    assert path == ctx.snapshot_path and existed
+
+
+def test_inline_alert_step_still_synchronous(tmp_path):
+    sink = SlowSink(delay=0.0)
+    step = _alert_step(tmp_path, sink, None)
+    step.run(_trigger_ctx(100.0))
+    assert len(sink.sent) == 1 and sink.sent[0][2]
+
+
+def test_failed_async_snapshot_is_not_referenced(tmp_path, monkeypatch):
+    import app.core.pipeline as pipeline
+
+    def broken(*a, **k):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pipeline, "_save_snapshot", broken)
+    sink = SlowSink(delay=0.0)
+    pool = KeyedWorkerPool(workers=2, queue_size=8, telemetry=RecordingTel())
+    step = _alert_step(tmp_path, sink, pool)
+    step.run(_trigger_ctx(100.0))
+    pool.close()
+    assert len(sink.sent) == 1 and sink.sent[0][1] is None  # sent text-only, no dangling path
+
+
+def test_inline_executor_reports_failed_tasks():
+    ex = InlineExecutor()
+    assert ex.submit("k", lambda: None) and not ex.submit("k", lambda: False)
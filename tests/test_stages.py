@@ -0,0 +1,146 @@
+"""Tests for staged pipeline mode: bounded queue policies and threaded execution."""
+import threading
+
+import numpy as np
+import pytest
+
+from app.core.ports import Detection, Frame
+from app.core.config import Config
+from app.core.clock import SystemClock
+from app.core.presence_policy import PresencePolicy
+from app.core.rate_policy import RatePolicy
+from app.core.alert_policy import AlertPolicy
+from app.core.pipeline import Pipeline
+from app.core.stages import StageQueue, DROP_OLDEST, BLOCK
+
+
+class RecordingTel:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {}
+    def incr(self, name, value=1, **tags):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, name, value, **tags):
+        self.gauges[name] = value
+    def time_ms(self, name, value, **tags):
+        self.timings.setdefault(name, []).append(value)
+
+
+class FakeCamera:
+    def __init__(self):
+        self.t = 0.0
+        self.i = 0
+    def open(self): pass
+    def grab(self):
+        self.t += 0.1
+        return True
+    def read(self):
+        self.t += 0.1; self.i += 1
+        img = np.zeros((48, 64, 3), dtype=np.uint8)
+        return Frame(image=img, t=self.t, index=self.i, w=64, h=48)
+    def close(self): pass
+
+
+class FakeDetector:
+    labels = ["person"]
+    def detect(self, frame):
+        return [Detection((1, 1, 10, 10), 0.9, 0, track_id=1)]
+
+
+class NullSink:
+    def send(self, text, image_path=None): pass
+
+
+# ---------------------------------------------------------------------------
+# StageQueue
+# ---------------------------------------------------------------------------
+
+def test_drop_oldest_keeps_newest_items():
+    tel = RecordingTel()
+    q = StageQueue("detect", 2, DROP_OLDEST, tel)
+    stop = threading.Event()
+    for i in range(5):
+        assert q.put(i, stop)
+    assert q.get(timeout=0.01) == 3
+    assert q.get(timeout=0.01) == 4
+    assert q.dropped == 3
+    assert tel.counters["stage_queue_dropped"] == 3
+    assert "stage_queue_depth_detect" in tel.gauges
+
+
+def test_block_policy_returns_false_when_stopped():
+    q = StageQueue("effects", 1, BLOCK, RecordingTel())
+    stop = threading.Event()
+    assert q.put("a", stop)
+    stop.set()
+    assert q.put("b", stop) is False
+    assert q.get(timeout=0.01) == "a"
+    assert q.get(timeout=0.01) is None
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        StageQueue("x", 1, "drop_newest", RecordingTel())
+
+
+# ---------------------------------------------------------------------------
+# Pipeline in staged mode
+# ---------------------------------------------------------------------------
+
+def _make_pipe(tmp_path, tel):
+    cfg = Config()
+    cfg.save_dir = str(tmp_path / "alerts")
+    cfg.raw_frames_dir = str(tmp_path / "raw")
+    cfg.alert_db_path = str(tmp_path / "alert_history.db")
+    cfg.draw = False
+    cfg.pipeline_mode = "staged"
+    return Pipeline(
+        cfg=cfg,
+        clock=SystemClock(),
+        camera=FakeCamera(),
+        detector=FakeDetector(),
+        tracker=None,
+        presence=PresencePolicy(min_frames=2, min_persist_sec=0.0),
+        rate=RatePolicy(base_fps=0, high_fps=0, boost_arm_frames=3,
+                        boost_min_sec=0.5, cooldown_sec=3, base_stride=1),
+        alerts=AlertPolicy(window_sec=1.0),
+        sink=NullSink(),
+        telemetry=tel,
+    )
+
+
+def test_stage_groups_cover_all_steps(tmp_path):
+    pipe = _make_pipe(tmp_path, RecordingTel())
+    staged = pipe.capture_steps + pipe.detect_steps + pipe.effect_steps
+    assert sorted(map(id, staged)) == sorted(map(id, pipe.steps))
+
+
+def test_staged_mode_yields_detected_frames(tmp_path):
+    tel = RecordingTel()
+    pipe = _make_pipe(tmp_path, tel)
+    seen = []
+    for ctx in pipe.iter_frames():
+        seen.append(ctx)
+        if len(seen) >= 5:
+            break
+    assert all(c.frame is not None for c in seen)
+    assert all(c.trigger_dets for c in seen)
+    assert seen[-1].state.present
+    # each context carries its own presence snapshot
+    assert len({id(c.state) for c in seen}) == len(seen)
+    assert "stage_detect_ms" in tel.timings
+    assert "stage_effects_ms" in tel.timings
+
+
+def test_staged_mode_surfaces_stage_errors(tmp_path):
+    pipe = _make_pipe(tmp_path, RecordingTel())
+
+    class ExplodingStep:
+        def run(self, ctx):
+            raise RuntimeError("boom")
+
+    pipe.effect_steps = [ExplodingStep()]
+    with pytest.raises(RuntimeError, match="boom"):
+        for _ in pipe.iter_frames():
+            pass
@@ -0,0 +1,147 @@
+"""Tests for tiled inference: tile layout, cross-tile merging and the benchmark."""
+import cv2
+import numpy as np
+import pytest
+
+from app.core.ports import Detection, DetectionBatch, Frame
+from app.core.boxes import IOS, nms
+from app.core.tiling import TiledDetector, parse_regions, tile_windows
+from app.tools.bench_tiling import run_tiling_benchmark
+
+
+class BlobDetector:
+    """Finds white blobs, but like a letterboxed model misses ones smaller than 1/20 of the input."""
+
+    labels = {0: "person"}
+
+    def __init__(self):
+        self.batch_calls = 0
+        self.inputs = 0
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames):
+        self.batch_calls += 1
+        self.inputs += len(frames)
+        out = []
+        for f in frames:
+            mask = np.ascontiguousarray(f.image[:, :, 0] > 0).astype(np.uint8)
+            n, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+            dets = []
+            for x, y, w, h, _ in stats[1:n]:
+                if h >= f.h / 20:
+                    dets.append(Detection((int(x), int(y), int(x + w), int(y + h)), 0.9, 0))
+            out.append(dets)
+        return out
+
+
+def _frame(w=1280, h=720, blobs=()):
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    for x1, y1, x2, y2 in blobs:
+        img[y1:y2, x1:x2] = 255
+    return Frame(image=img, t=0.0, index=1, w=w, h=h)
+
+
+def test_tile_windows_cover_the_frame_with_overlap():
+    wins = tile_windows(1280, 720, 640, overlap=0.2)
+    xs = sorted({(x1, x2) for x1, _, x2, _ in wins})
+    ys = sorted({(y1, y2) for _, y1, _, y2 in wins})
+    assert xs == [(0, 640), (320, 960), (640, 1280)]
+    assert ys == [(0, 640), (80, 720)]
+    assert all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in wins)
+
+
+def test_tile_regions_limit_the_windows():
+    # top strip only (the far end of the yard), normalized
+    wins = tile_windows(3840, 2160, 640, overlap=0.25, regions=parse_regions("0,0,1,0.25"))
+    assert {(y1, y2) for _, y1, _, y2 in wins} == {(0, 640)}
+    assert wins[0][0] == 0 and wins[-1][2] == 3840
+    with pytest.raises(ValueError):
+        parse_regions("0,0,1")
+
+
+def test_nms_groups_per_class_by_confidence():
+    xyxy = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]])
+    groups = nms(xyxy, np.array([0.5, 0.9, 0.8, 0.7]), np.array([0, 0, 1, 0]), 0.5)
+    assert [g.tolist() for g in groups] == [[1, 0], [2], [3]]
+    # a half box inside a whole one: low IoU but IoS of 1
+    half = np.array([[0, 0, 10, 20], [0, 0, 10, 10]])
+    assert len(nms(half, np.array([0.9, 0.8]), np.zeros(2), 0.6)) == 2
+    assert len(nms(half, np.array([0.9, 0.8]), np.zeros(2), 0.6, metric=IOS)) == 1
+
+
+def test_tiles_find_small_objects_and_merge_across_tile_edges():
+    det = BlobDetector()
+    # a 30 px tall person far away, and a 200 px one straddling the x=640 tile edge
+    frame = _frame(blobs=[(100, 100, 110, 130), (600, 300, 700, 500)])
+    assert [d.xyxy for d in det.detect(frame)] == [(600, 300, 700, 500)]
+
+    tiled = TiledDetector(det, tile_size=320, overlap=0.2)
+    det.batch_calls = 0
+    dets = tiled.detect(frame)
+    assert isinstance(dets, DetectionBatch)
+    assert sorted(d.xyxy for d in dets) == [(100, 100, 110, 130), (600, 300, 700, 500)]
+    assert det.batch_calls == 1
+    assert tiled.labels == det.labels
+
+
+def test_detect_batch_runs_all_tiles_of_all_frames_in_one_call():
+    det = BlobDetector()
+    tiled = TiledDetector(det, tile_size=640, overlap=0.2, full_frame=False)
+    frames = [_frame(blobs=[(100, 100, 110, 140)]), _frame()]
+    results = tiled.detect_batch(frames)
+    assert det.batch_calls == 1 and det.inputs == 12
+    assert [len(r) for r in results] == [1, 0]
+
+
+def test_small_frame_is_not_tiled_twice():
+    tiled = TiledDetector(BlobDetector(), tile_size=640)
+    assert len(tiled.split(_frame(w=640, h=480))) == 1
+
+
+def test_benchmark_reports_extra_detections_from_tiling():
+    frames = [_frame(blobs=[(100, 100, 110, 130), (600, 300, 700, 500)]) for _ in range(3)]
+    rows = run_tiling_benchmark(BlobDetector(), frames, tile_sizes=[320])
+    full, tiled = rows
+    assert full["config"] == "full_frame" and tiled["config"] == "tile_320"
+    assert full["frames"] == tiled["frames"] == 3
+    assert full["dets_per_frame"] == 1.0 and tiled["dets_per_frame"] == 2.0
+    assert tiled["extra_vs_full_per_frame"] == 1.0 and tiled["small_per_frame"] == 1.0
+    assert tiled["inputs_per_frame"] > full["inputs_per_frame"] == 1.0
+
+
+def test_recording_wraps_the_tiles_and_writes_one_record_per_frame(tmp_path):
+    from app.adapters.detector_replay import RecordingDetector, load_detection_script
+    from app.core.alert_policy import AlertPolicy
+    from app.core.clock import SystemClock
+    from app.core.config import Config
+    from app.core.pipeline import Pipeline
+    from app.core.presence_policy import PresencePolicy
+    from app.core.rate_policy import RatePolicy
+
+    class NullTel:
+        def incr(self, *a, **k): pass
+        def gauge(self, *a, **k): pass
+        def time_ms(self, *a, **k): pass
+
+    cfg = Config()
+    cfg.tile_size, cfg.tile_regions = 640, ""
+    cfg.save_dir = str(tmp_path / "alerts")
+    cfg.raw_frames_dir = str(tmp_path / "raw")
+    cfg.alert_db_path = str(tmp_path / "alerts.db")
+    path = str(tmp_path / "dets.jsonl")
+    rec = RecordingDetector(BlobDetector(), path)
+    pipe = Pipeline(
+        cfg=cfg, clock=SystemClock(), camera=None, detector=rec, tracker=None,
+        presence=PresencePolicy(min_frames=3, min_persist_sec=0.5),
+        rate=RatePolicy(base_fps=0, high_fps=0, boost_arm_frames=3, boost_min_sec=0.5, cooldown_sec=3, base_stride=1),
+        alerts=AlertPolicy(window_sec=1.0),
+        sink=None, telemetry=NullTel(),
+    )
+    det = pipe.detect_step.det
+    assert isinstance(det, RecordingDetector) and isinstance(det._inner, TiledDetector)
+    merged = det.detect(_frame(blobs=[(600, 300, 700, 340)]))  # across several tile edges
+    rec.close()
+    script, _ = load_detection_script(path)
+    assert list(script) == [1] and len(script[1]) == len(merged) == 1
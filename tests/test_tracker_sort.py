@@ -0,0 +1,138 @@
+"""Tests for the native SORT tracker and its wiring into DetectStep."""
+import numpy as np
+import pytest
+
+from app.adapters.detector_factory import build_tracker
+from app.adapters.tracker_sort import SortTracker, greedy_match
+from app.core.boxes import iou_matrix
+from app.core.pipeline import Ctx, DetectStep
+from app.core.ports import Detection, DetectionBatch, Frame
+
+FRAME = Frame(image=np.zeros((480, 640, 3), np.uint8), t=0.0, index=1, w=640, h=480)
+
+
+class NullTel:
+    def incr(self, *a, **k): pass
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+def _person(x, y=100, conf=0.9, cls=0):
+    return Detection((x, y, x + 40, y + 100), conf, cls)
+
+
+def test_iou_matrix_and_greedy_match():
+    a = np.array([[0, 0, 10, 10], [20, 20, 30, 30]])
+    b = np.array([[20, 20, 30, 30], [0, 0, 10, 5], [100, 100, 110, 110]])
+    m = iou_matrix(a, b)
+    assert m.shape == (2, 3)
+    np.testing.assert_allclose(m[:, 0], [0.0, 1.0])
+    assert m[0, 1] == pytest.approx(0.5)
+    assert greedy_match(m, 0.3) == [(1, 0), (0, 1)]
+    assert greedy_match(m, 0.9) == [(1, 0)]
+
+
+def test_ids_are_stable_for_moving_objects_and_reported_after_min_hits():
+    trk = SortTracker(min_hits=3)
+    ids = []
+    for i in range(8):
+        out = trk.update(FRAME, [_person(100 + 8 * i), _person(400 - 8 * i)])
+        assert isinstance(out, DetectionBatch)
+        ids.append(out.track_id.tolist())
+    assert ids[0] == ids[1] == [-1, -1]  # tentative
+    assert len(set(ids[2])) == 2 and -1 not in ids[2]
+    assert all(i == ids[2] for i in ids[2:])
+
+
+def test_classes_do_not_share_tracks():
+    trk = SortTracker(min_hits=1)
+    first = trk.update(FRAME, [_person(100, cls=0)])
+    second = trk.update(FRAME, [_person(100, cls=2)])
+    assert first.track_id[0] != second.track_id[0]
+
+
+def test_lost_tracks_expire_after_max_age():
+    trk = SortTracker(min_hits=1, max_age=2)
+    tid = trk.update(FRAME, [_person(100)]).track_id[0]
+    trk.update(FRAME, [])
+    trk.update(FRAME, [])
+    assert trk.update(FRAME, [_person(100)]).track_id[0] == tid  # within max_age
+    for _ in range(3):
+        trk.update(FRAME, [])
+    assert len(trk) == 0
+    assert trk.update(FRAME, [_person(100)]).track_id[0] != tid
+
+
+def test_low_confidence_detections_continue_but_never_start_tracks():
+    trk = SortTracker(min_hits=1, high_conf=0.6)
+    tid = trk.update(FRAME, [_person(100)]).track_id[0]
+    assert trk.update(FRAME, [_person(104, conf=0.3)]).track_id[0] == tid
+    out = trk.update(FRAME, [_person(108, conf=0.3), _person(500, conf=0.3)])
+    assert out.track_id.tolist() == [tid, -1]
+    assert len(trk) == 1
+
+
+def test_predict_extrapolates_confirmed_tracks():
+    trk = SortTracker(min_hits=2)
+    for i in range(6):
+        trk.update(FRAME, [_person(100 + 10 * i)])
+    pred = trk.predict(FRAME)
+    assert len(pred) == 1 and pred.track_id[0] > 0
+    assert pred.xyxy[0, 0] > 150  # kept moving right
+    assert SortTracker().predict(FRAME) == []
+
+
+def test_detect_step_assigns_track_ids():
+    class Fixed:
+        def detect(self, frame):
+            return [_person(100)]
+
+    step = DetectStep(det=Fixed(), tracker=build_tracker("sort", min_hits=1), conf_thresh=0.5, telemetry=NullTel())
+    ctx = Ctx()
+    ctx.frame = FRAME
+    step.run(ctx)
+    assert ctx.dets.track_ids() == [1]
+    assert build_tracker("ultralytics") is None
+    with pytest.raises(ValueError):
+        build_tracker("deepsort")
+
+
+def test_detect_step_applies_conf_thresh_to_tracker_output():
+    class Mixed:
+        def detect(self, frame):
+            return [_person(100, conf=0.7), _person(400)]
+
+    seen = []
+
+    class Spy(SortTracker):
+        def update(self, frame, dets):
+            seen.append([d.conf for d in dets])
+            return super().update(frame, dets)
+
+    step = DetectStep(det=Mixed(), tracker=Spy(min_hits=1), conf_thresh=0.8, telemetry=NullTel())
+    ctx = Ctx()
+    ctx.frame = FRAME
+    step.run(ctx)
+    assert seen == [[0.7, 0.9]]  # the tracker gets the detector's output as is
+    assert [round(d.conf, 2) for d in ctx.dets] == [0.9]
+
+
+def test_second_pass_keeps_ids_through_low_confidence_frames():
+    confs = iter([0.9, 0.3, 0.9, 0.05])
+
+    class Fading:
+        x = 100
+
+        def detect(self, frame):
+            self.x += 4
+            return [_person(self.x, conf=next(confs))]
+
+    trk = SortTracker(min_hits=1, high_conf=0.5, low_conf=0.1)
+    step = DetectStep(det=Fading(), tracker=trk, conf_thresh=0.8, telemetry=NullTel())
+    ctx = Ctx()
+    ctx.frame = FRAME
+    first = step.run(ctx).dets.track_ids()
+    assert len(step.run(ctx).dets) == 0  # continued below CONF_THRESH, not reported
+    assert step.run(ctx).dets.track_ids() == first
+    step.run(ctx)
+    assert trk._misses.tolist() == [1]  # below low_conf: not even the second pass
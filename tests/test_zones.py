@@ -0,0 +1,86 @@
+"""Tests for zone polygons and zone-aware TriggerFilterStep."""
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.core.config import Config, camera_configs
+from app.core.pipeline import Ctx, TriggerFilterStep
+from app.core.ports import Detection, Frame
+from app.core.zones import ZoneMask, parse_polygons
+
+
+class RecordingTel:
+    def __init__(self):
+        self.counters = {}
+    def incr(self, name, value=1, **tags):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def gauge(self, *a, **k): pass
+    def time_ms(self, *a, **k): pass
+
+
+def _det(x1, y1, x2, y2, cls_id=0):
+    return Detection(xyxy=(x1, y1, x2, y2), conf=0.9, cls_id=cls_id, track_id=None)
+
+
+def test_parse_polygons():
+    polys = parse_polygons("0,0;10,0;10,10 | 0.1,0.1;0.5,0.1;0.5,0.5")
+    assert len(polys) == 2
+    assert polys[0].shape == (3, 2)
+    assert parse_polygons("") == []
+    with pytest.raises(ValueError):
+        parse_polygons("0,0;1,1")
+    with pytest.raises(ValueError):
+        parse_polygons("0,0;a,1;2,2")
+
+
+def test_include_zone_uses_bottom_center_anchor():
+    # left half of a 200x100 frame, in pixels
+    zones = ZoneMask.from_spec(include="0,0;99,0;99,99;0,99")
+    dets = [_det(10, 10, 50, 90), _det(120, 10, 180, 90), _det(80, 0, 140, 50)]
+    assert zones.inside(dets, 200, 100).tolist() == [True, False, False]
+    # the bottom-center of this box is (60, 50); its center (60, 25) is also inside
+    assert ZoneMask.from_spec(include="0,0;99,0;99,99;0,99", anchor="center").inside(
+        [_det(40, 0, 80, 50)], 200, 100
+    ).tolist() == [True]
+
+
+def test_exclude_zone_normalized_and_mask_is_cached():
+    # exclude the bottom strip (sidewalk) in normalized coordinates
+    zones = ZoneMask.from_spec(exclude="0,0.8;1,0.8;1,1;0,1")
+    dets = [_det(10, 10, 50, 60), _det(10, 10, 50, 95)]
+    assert zones.inside(dets, 200, 100).tolist() == [True, False]
+    assert zones.mask(200, 100) is zones.mask(200, 100)
+    assert zones.mask(400, 200).shape == (200, 400)
+
+
+def test_anchor_outside_frame_is_clipped():
+    zones = ZoneMask.from_spec(include="0,0;1,0;1,1;0,1")
+    assert zones.inside([_det(-50, -50, 500, 500)], 200, 100).tolist() == [True]
+    assert zones.inside([], 200, 100).size == 0
+
+
+def test_trigger_filter_applies_zones():
+    tel = RecordingTel()
+    step = TriggerFilterStep(
+        trigger_ids={0},
+        telemetry=tel,
+        zones=ZoneMask.from_spec(include="0,0;0.5,0;0.5,1;0,1"),
+    )
+    frame = Frame(image=np.zeros((100, 200, 3), np.uint8), t=0.0, index=1, w=200, h=100)
+    ctx = Ctx(frame=frame, dets=[_det(10, 10, 40, 90), _det(150, 10, 190, 90), _det(10, 10, 40, 90, cls_id=2)])
+    ctx = step.run(ctx)
+    assert [d.xyxy for d in ctx.trigger_dets] == [(10, 10, 40, 90)]
+    assert tel.counters["zone_filtered"] == 1
+
+
+def test_per_camera_zone_override():
+    env = {
+        "SRCS": "door=rtsp://a,street=rtsp://b",
+        "CAM_STREET_ZONE_EXCLUDE": "0,0.8;1,0.8;1,1;0,1",
+    }
+    with patch.dict(os.environ, env):
+        cams = camera_configs(Config(srcs=env["SRCS"]))
+    assert cams["door"].zone_exclude == ""
+    assert cams["street"].zone_exclude == env["CAM_STREET_ZONE_EXCLUDE"]